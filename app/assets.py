@@ -0,0 +1,55 @@
+"""
+Static Asset Manifest
+Content-hashed URLs for static files so they can be cached forever
+"""
+from pathlib import Path
+from typing import Optional
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+static_path = Path(__file__).parent / "static"
+
+# Generated sibling files are never referenced directly
+SKIP_SUFFIXES = {".gz", ".br"}
+
+# Served for fingerprinted URLs - the content behind them never changes
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class AssetManifest:
+    """Maps logical asset paths (css/style.css) to fingerprinted ones (css/style.3f2a9c01de.css)"""
+
+    def __init__(self, root: Path, url_prefix: str = "/static"):
+        self.root = Path(root)
+        self.url_prefix = url_prefix
+        self.hashed: dict[str, str] = {}
+        self.logical: dict[str, str] = {}
+        self.build()
+
+    def build(self):
+        """Hash every static file (called once at startup)"""
+        hashed, logical = {}, {}
+        for source in sorted(self.root.rglob("*")):
+            if not source.is_file() or source.suffix in SKIP_SUFFIXES:
+                continue
+            digest = hashlib.sha256(source.read_bytes()).hexdigest()[:10]
+            name = source.relative_to(self.root).as_posix()
+            fingerprinted = source.with_name(f"{source.stem}.{digest}{source.suffix}").relative_to(self.root).as_posix()
+            hashed[name] = fingerprinted
+            logical[fingerprinted] = name
+        self.hashed, self.logical = hashed, logical
+        logger.info("Asset manifest built for %d static files", len(hashed))
+
+    def url(self, name: str) -> str:
+        """Fingerprinted URL for a logical asset path (template helper)"""
+        return f"{self.url_prefix}/{self.hashed.get(name, name)}"
+
+    def resolve(self, path: str) -> Optional[str]:
+        """Logical path for a fingerprinted path, or None if it is not one"""
+        return self.logical.get(path)
+
+
+# Singleton instance
+asset_manifest = AssetManifest(static_path)
@@ -0,0 +1,71 @@
+"""
+Response Compression Helpers
+gzip/brotli encoding and Accept-Encoding negotiation
+brotli is optional - without it only gzip variants are produced
+"""
+import gzip
+from typing import Iterable, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Preferred order when the client accepts several encodings equally
+ENCODING_PREFERENCE = ("br", "gzip")
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Encodings this process can produce"""
+    return ENCODING_PREFERENCE if brotli else ("gzip",)
+
+
+def compress(body: bytes, encoding: str, fast: bool = False) -> bytes:
+    """
+    Compress a body with the given encoding
+    `fast` trades ratio for speed (per-request compression); the default
+    maximum settings are for content compressed once and reused.
+    """
+    if encoding == "gzip":
+        # mtime=0 keeps output (and therefore ETags) deterministic
+        return gzip.compress(body, compresslevel=6 if fast else 9, mtime=0)
+    if encoding == "br" and brotli:
+        return brotli.compress(body, quality=5 if fast else 11)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def compress_variants(body: bytes) -> dict[str, bytes]:
+    """All encoded variants of a body worth keeping (smaller than the original)"""
+    variants = {}
+    for encoding in available_encodings():
+        encoded = compress(body, encoding)
+        if len(encoded) < len(body):
+            variants[encoding] = encoded
+    return variants
+
+
+def negotiate(accept_encoding: Optional[str], available: Iterable[str]) -> Optional[str]:
+    """Pick the best encoding from `available` for an Accept-Encoding header, or None for identity"""
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in ENCODING_PREFERENCE:
+        if encoding not in available:
+            continue
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
@@ -14,6 +14,7 @@ class Settings(BaseSettings):
     droplet_name: str = "Dashboard"
     version: str = "1.0.0"
     port: int = 8002
+    debug: bool = False  # dev mode: template auto-reload
 
     # External Services
     registry_url: str = "http://198.54.123.234:8000"
@@ -27,9 +28,75 @@ class Settings(BaseSettings):
     status_poll_interval: int = 30  # seconds
     cache_ttl: int = 25  # seconds (slightly less than poll interval)
 
+    # Compression
+    compression_min_size: int = 500  # bytes; smaller responses are sent as-is
+
+    # Templates
+    template_cache_dir: Optional[str] = None  # Jinja bytecode cache (default: per-user 0700 dir in system temp)
+    fragment_cache_size: int = 256  # rendered {% fragment %} blocks kept (0 disables)
+
+    # Member progress storage (write-behind buffer)
+    progress_flush_interval: float = 2.0  # seconds between coalesced writes
+    progress_compress_threshold: int = 2048  # bytes; larger blobs are zlib-compressed
+    progress_idle_eviction: int = 600  # seconds before clean entries leave memory
+
+    # AI assistant (command center chat)
+    anthropic_api_key: Optional[str] = None  # rule-based answers only when unset
+    anthropic_base_url: Optional[str] = None  # override the API endpoint (e.g. a local stub)
+    ai_model: str = "claude-3-5-sonnet-20241022"
+    ai_max_tokens: int = 1024
+    ai_timeout: float = 30.0  # seconds per chat request, including time queued for a slot
+    ai_max_concurrency: int = 4  # model calls in flight at once
+    ai_queue_timeout: float = 5.0  # seconds to wait for a slot before answering from the rules
+    system_context_ttl: float = 10.0  # seconds the assistant's member/deploy snapshot is reused
+    answer_cache_size: int = 512  # cached chat answers (0 disables)
+    answer_cache_ttl: float = 300.0  # seconds; answers also miss as soon as the stats they used change
+
+    # Graceful reload (gunicorn with uvicorn workers, see gunicorn.conf.py)
+    # Keep at 1: progress write-behind, deploy jobs, rate-limit buckets and the model-call cap are per process
+    web_concurrency: int = 1  # gunicorn worker processes
+    warmup_timeout: float = 10.0  # seconds per cache warm-up step before a worker reports ready anyway
+    drain_timeout: float = 30.0  # seconds a retiring worker waits for in-flight requests and streams
+    ready_dir: Optional[str] = None  # per-worker ready markers for app.reload (unset: no markers)
+    pid_file: str = "/tmp/fpai-dashboard.pid"  # gunicorn master pid, signalled by app.reload
+
+    # Deploy webhook
+    deploy_dir: str = "/app"  # git checkout pulled by /deploy
+    deploy_timeout: float = 30.0  # seconds before a git pull is killed
+    deploy_history: int = 20  # finished deploy jobs kept with their output
+    last_deploy_file: str = "/tmp/fpai-dashboard-last-deploy"  # read by workers started after the deploy
+
+    # Coordination session index (treasury dashboard)
+    session_sweep_interval: float = 5.0  # seconds between stat sweeps when no file watcher runs
+
+    # Tracing (/debug/traces)
+    tracing_enabled: bool = True
+    trace_sample_rate: float = 0.01  # fraction of requests kept regardless of duration
+    trace_slow_ms: float = 500.0  # requests at least this slow are always kept
+    trace_buffer_size: int = 200  # traces kept in memory
+
+    # Logging (queued; written to stderr by a background thread)
+    log_level: str = "INFO"
+    log_format: str = "text"  # text, or json: one object per line with request/trace IDs
+    log_queue_size: int = 10000  # records waiting to be written; overflow is dropped and counted
+    log_rate_limit: int = 60  # records per log call site per minute (0 disables)
+
     # Security
     allowed_origins: list[str] = ["*"]  # Allow all for public site
-    rate_limit_per_minute: int = 100
+    rate_limit_enabled: bool = True
+    rate_limit_per_minute: int = 100  # default for routes without their own class (0 disables, as for each class)
+    rate_limit_auth_per_minute: int = 10  # POST /login, /signup
+    rate_limit_chat_per_minute: int = 20  # /api/command-center/chat
+    rate_limit_deploy_per_minute: int = 5  # /deploy only; job status and logs use the default
+    rate_limit_admin_per_minute: int = 30  # /admin
+    rate_limit_shards: int = 16
+    trust_forwarded_for: bool = False  # use X-Forwarded-For when behind a proxy
+
+    # Load shedding (expensive routes return 503 past these thresholds)
+    shed_max_inflight: int = 200
+    shed_max_loop_lag_ms: int = 250
+    shed_retry_after: int = 5  # seconds
+    admin_secret: Optional[str] = None  # Admin endpoints are disabled until set
 
     class Config:
         env_file = ".env"
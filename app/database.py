@@ -3,19 +3,56 @@ Database setup and models for Full Potential Membership
 Simple SQLite database for user management
 """
 import sqlite3
-from datetime import datetime
+from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Sequence
 import hashlib
+import os
 import secrets
 
-# Database path
-DB_PATH = Path(__file__).parent.parent / "membership.db"
+from app.diagnostics.memory import caches
+from app.diagnostics.tracing import tracer
+
+# Database path (override with MEMBERSHIP_DB_PATH, e.g. for tests)
+DB_PATH = Path(os.getenv("MEMBERSHIP_DB_PATH", Path(__file__).parent.parent / "membership.db"))
+
+# Rows per executemany() batch / transaction for bulk import and export
+BULK_BATCH_SIZE = 1000
+
+MEMBERSHIP_TIERS = ('seeker', 'builder', 'master')
+
+ACTIVITY_KINDS = ('signup', 'login', 'tool_use', 'reflection')
+
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor recording a span per statement while a request is traced"""
+
+    def execute(self, sql, parameters=()):
+        with tracer.span("sql", "db", statement=" ".join(sql.split())[:200]):
+            return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        with tracer.span("sql", "db", statement=" ".join(sql.split())[:200], many=True):
+            return super().executemany(sql, seq_of_parameters)
+
+
+class TracedConnection(sqlite3.Connection):
+    """Connection whose cursors and conn.execute/executemany shortcuts are traced"""
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    # The C shortcuts build a plain cursor and never call TracedCursor.execute
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
 
 
 def get_db():
     """Get database connection"""
-    conn = sqlite3.connect(str(DB_PATH))
+    conn = sqlite3.connect(str(DB_PATH), factory=TracedConnection)
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -65,6 +102,40 @@ def init_db():
         )
     ''')
 
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_progress_user ON user_progress (user_id)')
+
+    # Activity log (append-only, one row per event)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_activity (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            day TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+    # Covering indexes: per-user lookups by kind/day, and day-range rollups
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_activity_user_kind_day ON user_activity (user_id, kind, day)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_activity_day_user ON user_activity (day, user_id)')
+
+    # Streaks, maintained incrementally as activity is recorded
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_streaks (
+            user_id INTEGER PRIMARY KEY,
+            current_streak INTEGER NOT NULL DEFAULT 0,
+            longest_streak INTEGER NOT NULL DEFAULT 0,
+            last_active_day TEXT,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_streaks_last_active ON user_streaks (last_active_day)')
+
+    # Columns added after the original schema
+    progress_columns = {row['name'] for row in cursor.execute('PRAGMA table_info(user_progress)')}
+    if 'revision' not in progress_columns:
+        cursor.execute('ALTER TABLE user_progress ADD COLUMN revision INTEGER NOT NULL DEFAULT 0')
+
     conn.commit()
     conn.close()
 
@@ -198,5 +269,292 @@ def delete_session(token: str):
     conn.close()
 
 
+def count_sessions() -> Dict[str, int]:
+    """Session rows, and how many of them have expired (nothing deletes those yet)"""
+    conn = get_db()
+    cursor = conn.cursor()
+    cursor.execute(
+        'SELECT COUNT(*), COALESCE(SUM(expires_at <= ?), 0) FROM sessions',
+        (datetime.utcnow().isoformat(),)
+    )
+    rows, expired = cursor.fetchone()
+    conn.close()
+
+    return {"rows": rows, "expired": expired}
+
+
+def get_progress(user_id: int) -> Optional[Dict[str, Any]]:
+    """Get the raw progress row for a user"""
+    conn = get_db()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        SELECT goal_data, reflection_data, strengths_data, revision, last_updated
+        FROM user_progress WHERE user_id = ?
+    ''', (user_id,))
+    row = cursor.fetchone()
+    conn.close()
+
+    if row:
+        return dict(row)
+    return None
+
+
+def save_progress_columns(updates: Sequence[tuple]) -> List[int]:
+    """
+    Write changed progress blobs in one transaction, each only over the revision it was based on.
+    updates is [(user_id, base_revision, revision, last_updated, {column: blob}), ...]
+    Returns the user IDs whose row had moved on (written elsewhere); those are left untouched.
+    """
+    conflicts = []
+    conn = get_db()
+    try:
+        with conn:
+            for user_id, base_revision, revision, last_updated, blobs in updates:
+                for column in blobs:
+                    if column not in ('goal_data', 'reflection_data', 'strengths_data'):
+                        raise ValueError(f"Unknown progress column: {column}")
+                assignments = ", ".join(f"{column} = ?" for column in blobs)
+                cursor = conn.execute(f'''
+                    UPDATE user_progress
+                    SET {assignments}, revision = ?, last_updated = ?
+                    WHERE user_id = ? AND revision = ?
+                ''', (*blobs.values(), revision, last_updated, user_id, base_revision))
+                if cursor.rowcount == 0:
+                    conflicts.append(user_id)
+    finally:
+        conn.close()
+
+    return conflicts
+
+
+def record_activity(user_id: int, kind: str, once_per_day: bool = False) -> bool:
+    """
+    Append an activity event and update the user's streak in O(1)
+    With once_per_day, the event is skipped if one of the same kind exists today.
+    Returns True if an event was recorded.
+    """
+    if kind not in ACTIVITY_KINDS:
+        raise ValueError(f"Unknown activity kind: {kind}")
+
+    now = datetime.utcnow()
+    today = now.date()
+    params = {
+        'user_id': user_id,
+        'kind': kind,
+        'day': today.isoformat(),
+        'yesterday': (today - timedelta(days=1)).isoformat(),
+        'created_at': now.isoformat()
+    }
+
+    conn = get_db()
+    try:
+        with conn:
+            if once_per_day:
+                cursor = conn.execute('''
+                    INSERT INTO user_activity (user_id, kind, day, created_at)
+                    SELECT :user_id, :kind, :day, :created_at
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM user_activity
+                        WHERE user_id = :user_id AND kind = :kind AND day = :day
+                    )
+                ''', params)
+            else:
+                cursor = conn.execute('''
+                    INSERT INTO user_activity (user_id, kind, day, created_at)
+                    VALUES (:user_id, :kind, :day, :created_at)
+                ''', params)
+
+            if cursor.rowcount == 0:
+                return False
+
+            # Same day: unchanged. Consecutive day: extend. Gap: restart at 1.
+            conn.execute('''
+                INSERT INTO user_streaks (user_id, current_streak, longest_streak, last_active_day)
+                VALUES (:user_id, 1, 1, :day)
+                ON CONFLICT (user_id) DO UPDATE SET
+                    current_streak = CASE
+                        WHEN last_active_day >= :day THEN current_streak
+                        WHEN last_active_day = :yesterday THEN current_streak + 1
+                        ELSE 1
+                    END,
+                    longest_streak = MAX(longest_streak, CASE
+                        WHEN last_active_day >= :day THEN current_streak
+                        WHEN last_active_day = :yesterday THEN current_streak + 1
+                        ELSE 1
+                    END),
+                    last_active_day = MAX(last_active_day, :day)
+            ''', params)
+    finally:
+        conn.close()
+
+    return True
+
+
+def get_streak(user_id: int) -> Dict[str, Any]:
+    """Get a user's streak; a streak not extended since yesterday counts as 0"""
+    conn = get_db()
+    cursor = conn.cursor()
+
+    cursor.execute(
+        'SELECT current_streak, longest_streak, last_active_day FROM user_streaks WHERE user_id = ?',
+        (user_id,)
+    )
+    row = cursor.fetchone()
+    conn.close()
+
+    if not row:
+        return {'current_streak': 0, 'longest_streak': 0, 'last_active_day': None}
+
+    streak = dict(row)
+    yesterday = (datetime.utcnow().date() - timedelta(days=1)).isoformat()
+    if streak['last_active_day'] < yesterday:
+        streak['current_streak'] = 0
+    return streak
+
+
+def count_active_streaks() -> int:
+    """Number of users whose streak is still alive (active today or yesterday)"""
+    conn = get_db()
+    cursor = conn.cursor()
+
+    yesterday = (datetime.utcnow().date() - timedelta(days=1)).isoformat()
+    cursor.execute('SELECT COUNT(*) FROM user_streaks WHERE last_active_day >= ?', (yesterday,))
+    count = cursor.fetchone()[0]
+    conn.close()
+
+    return count
+
+
+def count_activity(user_id: int, kind: str) -> int:
+    """Number of events of one kind for a user"""
+    conn = get_db()
+    cursor = conn.cursor()
+
+    cursor.execute('SELECT COUNT(*) FROM user_activity WHERE user_id = ? AND kind = ?', (user_id, kind))
+    count = cursor.fetchone()[0]
+    conn.close()
+
+    return count
+
+
+def active_user_rollup(start: date, end: date, period: str = 'day') -> List[Dict[str, Any]]:
+    """Distinct active users per day or per week (weeks start Monday) in [start, end]"""
+    if period == 'day':
+        bucket = 'day'
+    elif period == 'week':
+        bucket = "date(day, '-6 days', 'weekday 1')"
+    else:
+        raise ValueError(f"Unknown rollup period: {period}")
+
+    conn = get_db()
+    cursor = conn.cursor()
+
+    cursor.execute(f'''
+        SELECT {bucket} AS period, COUNT(DISTINCT user_id) AS active_users
+        FROM user_activity
+        WHERE day BETWEEN ? AND ?
+        GROUP BY period
+        ORDER BY period
+    ''', (start.isoformat(), end.isoformat()))
+    rows = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+
+    return rows
+
+
+USER_EXPORT_COLUMNS = (
+    'id', 'email', 'password_hash', 'full_name', 'membership_tier',
+    'created_at', 'last_login', 'is_active', 'stripe_customer_id'
+)
+PROGRESS_EXPORT_COLUMNS = ('email', 'goal_data', 'reflection_data', 'strengths_data', 'last_updated')
+
+
+def iter_query(query: str, params: Sequence = (), batch_size: int = BULK_BATCH_SIZE) -> Iterator[sqlite3.Row]:
+    """Stream rows from a cursor in fixed-size batches (constant memory)"""
+    # Streaming responses advance the generator from a threadpool, so the
+    # connection may be touched by different (never concurrent) threads
+    conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    try:
+        cursor = conn.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        conn.close()
+
+
+def iter_users_export() -> Iterator[sqlite3.Row]:
+    """Stream all users for export"""
+    return iter_query(f"SELECT {', '.join(USER_EXPORT_COLUMNS)} FROM users ORDER BY id")
+
+
+def iter_progress_export() -> Iterator[sqlite3.Row]:
+    """Stream all progress rows for export, keyed by user email"""
+    return iter_query('''
+        SELECT users.email, user_progress.goal_data, user_progress.reflection_data,
+               user_progress.strengths_data, user_progress.last_updated
+        FROM user_progress
+        JOIN users ON users.id = user_progress.user_id
+        ORDER BY user_progress.id
+    ''')
+
+
+def bulk_create_users(rows: Sequence[Dict[str, Any]]) -> int:
+    """
+    Insert a batch of pre-validated users in one transaction.
+    Existing emails are skipped. Returns the number of users inserted.
+    """
+    conn = get_db()
+    try:
+        with conn:
+            cursor = conn.executemany('''
+                INSERT OR IGNORE INTO users
+                    (email, password_hash, full_name, membership_tier, created_at,
+                     last_login, is_active, stripe_customer_id)
+                VALUES
+                    (:email, :password_hash, :full_name, :membership_tier, :created_at,
+                     :last_login, :is_active, :stripe_customer_id)
+            ''', rows)
+            inserted = cursor.rowcount
+
+            # Initialize progress tracking for the new users
+            conn.executemany('''
+                INSERT INTO user_progress (user_id, last_updated)
+                SELECT id, created_at FROM users
+                WHERE email = ?
+                  AND NOT EXISTS (SELECT 1 FROM user_progress WHERE user_id = users.id)
+            ''', [(row['email'],) for row in rows])
+    finally:
+        conn.close()
+
+    return inserted
+
+
+def bulk_update_progress(rows: Iterable[Dict[str, Any]]) -> int:
+    """Overwrite progress for a batch of users (matched by email) in one transaction"""
+    conn = get_db()
+    try:
+        with conn:
+            cursor = conn.executemany('''
+                UPDATE user_progress
+                SET goal_data = :goal_data,
+                    reflection_data = :reflection_data,
+                    strengths_data = :strengths_data,
+                    last_updated = :last_updated,
+                    revision = revision + 1
+                WHERE user_id = (SELECT id FROM users WHERE email = :email)
+            ''', rows)
+            updated = cursor.rowcount
+    finally:
+        conn.close()
+
+    return updated
+
+
 # Initialize database on import
 init_db()
+caches.register("sessions", count_sessions)
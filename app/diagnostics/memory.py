@@ -0,0 +1,176 @@
+"""
+Memory Diagnostics
+tracemalloc control (off until started), bounded snapshots and file:line diffs between them,
+plus a registry where long-lived caches and tables report their sizes on demand
+"""
+import gc
+import itertools
+import os
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+# Allocations made by tracemalloc itself and the import machinery are noise in diffs
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+class NotTracing(Exception):
+    """tracemalloc has not been started"""
+
+
+class CacheRegistry:
+    """Named size callbacks; nothing runs until sizes are asked for"""
+
+    def __init__(self):
+        self.sources: Dict[str, Callable[[], Any]] = {}
+
+    def register(self, name: str, size: Callable[[], Any]):
+        """`size` runs on a worker thread while the loop keeps mutating: copy dicts before iterating them"""
+        self.sources[name] = size
+
+    def sizes(self) -> Dict[str, Any]:
+        """Each cache's report, or its error (one failing source doesn't hide the rest)"""
+        sizes = {}
+        for name, size in sorted(self.sources.items()):
+            try:
+                sizes[name] = size()
+            except Exception as e:
+                sizes[name] = {"error": f"{type(e).__name__}: {e}"}
+        return sizes
+
+
+def rss_bytes() -> Optional[int]:
+    """Resident set size from /proc (Linux), else None"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class MemoryTracker:
+    """Starts/stops tracemalloc and keeps the last few snapshots for diffing"""
+
+    def __init__(self, max_snapshots: int = 4):
+        self.max_snapshots = max_snapshots
+        self.snapshots: "OrderedDict[int, tuple[dict, tracemalloc.Snapshot]]" = OrderedDict()
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.timer: Optional[threading.Timer] = None
+        self.stops_at: Optional[float] = None
+
+    def start(self, frames: int = 1, seconds: Optional[float] = None) -> dict:
+        """
+        Begin tracing allocations (already-tracing keeps its frame depth)
+        Tracing slows every allocation, so it stops by itself after `seconds`; snapshots survive that.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self._cancel_timer()
+        if seconds:
+            self.timer = threading.Timer(seconds, self._expire)
+            self.timer.daemon = True
+            self.timer.start()
+            self.stops_at = time.time() + seconds
+        return self.status()
+
+    def stop(self) -> dict:
+        """Stop tracing and free the trace data and snapshots"""
+        self._cancel_timer()
+        tracemalloc.stop()
+        with self.lock:
+            self.snapshots.clear()
+        return self.status()
+
+    def _expire(self):
+        self.stops_at = None
+        tracemalloc.stop()
+
+    def _cancel_timer(self):
+        if self.timer is not None:
+            self.timer.cancel()
+        self.timer = None
+        self.stops_at = None
+
+    def snapshot(self) -> dict:
+        """Take a snapshot; the oldest is dropped past `max_snapshots`"""
+        if not tracemalloc.is_tracing():
+            raise NotTracing("tracemalloc is not running; start it first")
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        info = {
+            "taken_at": time.time(),
+            "traces": len(snapshot.traces),
+            "size": sum(trace.size for trace in snapshot.traces)
+        }
+        with self.lock:
+            info = {"id": next(self.ids), **info}
+            self.snapshots[info["id"]] = (info, snapshot)
+            while len(self.snapshots) > self.max_snapshots:
+                self.snapshots.popitem(last=False)
+        return info
+
+    def get(self, snapshot_id: int) -> tracemalloc.Snapshot:
+        """Raises KeyError for unknown or evicted snapshots"""
+        with self.lock:
+            return self.snapshots[snapshot_id][1]
+
+    def latest_id(self) -> Optional[int]:
+        with self.lock:
+            return next(reversed(self.snapshots), None)
+
+    def top(self, snapshot_id: int, limit: int = 20, group_by: str = "lineno") -> List[dict]:
+        """Largest allocation sites in one snapshot"""
+        stats = self.get(snapshot_id).statistics(group_by)
+        return [
+            {"location": self._location(stat.traceback, group_by), "size": stat.size, "count": stat.count}
+            for stat in stats[:limit]
+        ]
+
+    def diff(self, old_id: int, new_id: int, limit: int = 20, group_by: str = "lineno") -> List[dict]:
+        """Allocation sites by growth from `old_id` to `new_id`, largest change first"""
+        old, new = self.get(old_id), self.get(new_id)
+        stats = new.compare_to(old, group_by)
+        return [
+            {
+                "location": self._location(stat.traceback, group_by),
+                "size_diff": stat.size_diff,
+                "size": stat.size,
+                "count_diff": stat.count_diff,
+                "count": stat.count
+            }
+            for stat in stats[:limit]
+        ]
+
+    @staticmethod
+    def _location(traceback: tracemalloc.Traceback, group_by: str) -> str:
+        frame = traceback[0]
+        return frame.filename if group_by == "filename" else f"{frame.filename}:{frame.lineno}"
+
+    def status(self) -> dict:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self.lock:
+            snapshots = [info for info, _ in self.snapshots.values()]
+        return {
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else None,
+            "stops_at": self.stops_at,
+            "traced_current": current,
+            "traced_peak": peak,
+            "tracemalloc_overhead": tracemalloc.get_tracemalloc_memory() if tracing else 0,
+            "rss": rss_bytes(),
+            "gc_objects": len(gc.get_objects()),
+            "snapshots": snapshots
+        }
+
+
+# Singleton instances
+caches = CacheRegistry()
+memory_tracker = MemoryTracker()
@@ -0,0 +1,173 @@
+"""
+Sampling Profiler
+Snapshots every thread's Python stack from sys._current_frames() at a fixed rate, off the event loop
+Samples aggregate into collapsed stacks (flamegraph.pl / speedscope input) and self/total tables
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Leaf frames of threads that are waiting rather than working: the event loop in select (or in
+# uvloop's C loop, whose innermost Python frame is asyncio.run), and idle thread-pool workers
+IDLE_FRAMES = {
+    "selectors.py:select",
+    "asyncio/runners.py:run",
+    "threading.py:wait",
+    "queue.py:get",
+    "concurrent/futures/thread.py:_worker",
+}
+
+
+class ProfilerBusy(Exception):
+    """A profile is already running"""
+
+
+def _path_prefixes() -> List[str]:
+    """sys.path entries, longest first, for shortening file names"""
+    prefixes = {os.path.abspath(p) + os.sep for p in sys.path if p}
+    return sorted(prefixes, key=len, reverse=True)
+
+
+class Profile:
+    """Aggregated samples of one profiling run"""
+
+    def __init__(self, seconds: float, hz: int):
+        self.seconds = seconds
+        self.hz = hz
+        self.ticks = 0
+        self.stacks: Counter = Counter()
+        self.threads: Counter = Counter()
+        self.idle = 0
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def collapsed(self) -> str:
+        """One "thread;outer;...;leaf count" line per distinct stack"""
+        return "\n".join(f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common())
+
+    def top(self, limit: int = 20) -> Dict[str, List[dict]]:
+        """Functions by samples where they were the leaf (self) and anywhere on the stack (total)"""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack[1:]
+            own[frames[-1]] += count
+            # Recursive functions count once per sample
+            for frame in set(frames):
+                total[frame] += count
+        samples = self.samples or 1
+
+        def rows(counter: Counter) -> List[dict]:
+            return [
+                {"function": frame, "samples": count, "percent": round(count / samples * 100, 1)}
+                for frame, count in counter.most_common(limit)
+            ]
+
+        return {"self": rows(own), "total": rows(total)}
+
+    def summary(self, limit: int = 20) -> dict:
+        return {
+            "seconds": self.seconds,
+            "hz": self.hz,
+            "ticks": self.ticks,
+            "samples": self.samples,
+            "idle_samples_dropped": self.idle,
+            "threads": dict(self.threads),
+            "top": self.top(limit)
+        }
+
+    def report(self, limit: int = 20) -> str:
+        """Plain-text self/total tables"""
+        lines = [
+            f"{self.samples} samples over {self.seconds:g}s at {self.hz} Hz "
+            f"({self.ticks} ticks, {self.idle} idle samples dropped)",
+            "threads: " + ", ".join(f"{name}={count}" for name, count in self.threads.most_common())
+        ]
+        for title, rows in self.top(limit).items():
+            lines += ["", f"{title.upper():>7}  {'%':>5}  function"]
+            lines += [f"{row['samples']:>7}  {row['percent']:>5.1f}  {row['function']}" for row in rows]
+        return "\n".join(lines)
+
+
+class SamplingProfiler:
+    """Samples all threads from the calling thread; one run at a time"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.labels: Dict[object, str] = {}
+        self.prefixes = _path_prefixes()
+
+    def label(self, code) -> str:
+        """Frame label: file path relative to its sys.path entry, then the function name"""
+        label = self.labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            for prefix in self.prefixes:
+                if filename.startswith(prefix):
+                    filename = filename[len(prefix):]
+                    break
+            label = self.labels[code] = f"{filename}:{code.co_name}"
+        return label
+
+    def stack(self, frame) -> Tuple[str, ...]:
+        """Labels from outermost to innermost frame"""
+        frames = []
+        while frame is not None:
+            frames.append(self.label(frame.f_code))
+            frame = frame.f_back
+        frames.reverse()
+        return tuple(frames)
+
+    def run(self, seconds: float, hz: int = 100, include_idle: bool = False) -> Profile:
+        """Sample for `seconds`; blocks, so call it from a worker thread"""
+        if not self.lock.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already running")
+        try:
+            return self._sample(seconds, hz, include_idle)
+        finally:
+            # Code objects are only pinned for the duration of a run
+            self.labels.clear()
+            self.lock.release()
+
+    def _sample(self, seconds: float, hz: int, include_idle: bool) -> Profile:
+        profile = Profile(seconds, hz)
+        interval = 1.0 / hz
+        own = threading.get_ident()
+        names: Dict[int, str] = {}
+        deadline = time.perf_counter() + seconds
+        next_tick = time.perf_counter()
+
+        while next_tick < deadline:
+            frames = sys._current_frames()
+            if frames.keys() - names.keys():
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident == own:
+                    continue
+                stack = self.stack(frame)
+                if not include_idle and stack and stack[-1] in IDLE_FRAMES:
+                    profile.idle += 1
+                    continue
+                thread = names.get(ident, str(ident))
+                profile.stacks[(thread,) + stack] += 1
+                profile.threads[thread] += 1
+            del frames, frame
+            profile.ticks += 1
+
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind (GIL contention); skip missed ticks rather than bursting
+                next_tick = time.perf_counter()
+        return profile
+
+
+# Singleton instance
+profiler = SamplingProfiler()
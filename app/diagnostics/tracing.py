@@ -0,0 +1,228 @@
+"""
+Request Tracing
+Lightweight in-process spans (routes, upstream HTTP, SQL, templates) linked through contextvars
+Every request is recorded; finished traces are kept in a ring buffer when sampled or slow
+"""
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+import httpx
+
+from app.config import settings
+from app.diagnostics.memory import caches
+
+
+class Span:
+    """One timed operation within a trace"""
+
+    __slots__ = ("span_id", "parent_id", "name", "kind", "start", "end", "attributes", "error")
+
+    def __init__(self, name: str, kind: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start = time.perf_counter_ns()
+        self.end: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or time.perf_counter_ns()) - self.start) / 1e6
+
+
+class Trace:
+    """Spans of one request, in start order"""
+
+    __slots__ = ("trace_id", "started_at", "origin_ns", "spans", "sampled", "dropped")
+
+    def __init__(self, sampled: bool):
+        self.trace_id = f"{random.getrandbits(128):032x}"
+        self.started_at = time.time()
+        self.origin_ns = time.perf_counter_ns()
+        self.spans: List[Span] = []
+        self.sampled = sampled
+        self.dropped = 0
+
+    @property
+    def root(self) -> Span:
+        return self.spans[0]
+
+    @property
+    def duration_ms(self) -> float:
+        return self.root.duration_ms
+
+    def to_dict(self) -> dict:
+        """JSON form; span offsets and durations in milliseconds from the trace start"""
+        return {
+            "trace_id": self.trace_id,
+            "name": self.root.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 3),
+            "sampled": self.sampled,
+            "dropped_spans": self.dropped,
+            "spans": [
+                {
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "name": span.name,
+                    "kind": span.kind,
+                    "offset_ms": round((span.start - self.origin_ns) / 1e6, 3),
+                    "duration_ms": round(span.duration_ms, 3),
+                    "attributes": span.attributes,
+                    "error": span.error
+                }
+                for span in self.spans
+            ]
+        }
+
+
+_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+_span: ContextVar[Optional[Span]] = ContextVar("span", default=None)
+
+
+class Tracer:
+    """Starts traces and spans; keeps sampled or slow traces in a bounded buffer"""
+
+    def __init__(self, enabled: bool = True, sample_rate: float = 0.01, slow_ms: float = 500.0,
+                 max_traces: int = 200, max_spans: int = 500):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.max_spans = max_spans
+        self.traces: Deque[Trace] = deque(maxlen=max_traces)
+        self.lock = threading.Lock()
+        self.started = 0
+        self.kept = 0
+
+    @contextmanager
+    def trace(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """Root span for a request; nested spans attach to it"""
+        if not self.enabled or _trace.get() is not None:
+            yield None
+            return
+
+        trace = Trace(sampled=random.random() < self.sample_rate)
+        trace_token = _trace.set(trace)
+        self.started += 1
+        try:
+            with self.span(name, "server", **attributes) as root:
+                yield root
+        finally:
+            _trace.reset(trace_token)
+            if trace.sampled or trace.duration_ms >= self.slow_ms:
+                with self.lock:
+                    self.traces.append(trace)
+                    self.kept += 1
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", **attributes) -> Iterator[Optional[Span]]:
+        """Child span of the current one; a no-op outside a trace"""
+        trace = _trace.get()
+        if trace is None:
+            yield None
+            return
+        if len(trace.spans) >= self.max_spans:
+            trace.dropped += 1
+            yield None
+            return
+
+        parent = _span.get()
+        span = Span(name, kind, parent.span_id if parent else None, attributes)
+        trace.spans.append(span)
+        span_token = _span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end = time.perf_counter_ns()
+            _span.reset(span_token)
+
+    def current_trace_id(self) -> Optional[str]:
+        trace = _trace.get()
+        return trace.trace_id if trace else None
+
+    def recent(self, min_ms: float = 0.0, limit: int = 20) -> List[Trace]:
+        """Kept traces at least `min_ms` long, newest first"""
+        with self.lock:
+            traces = list(self.traces)
+        return [t for t in reversed(traces) if t.duration_ms >= min_ms][:limit]
+
+    def get(self, trace_id: str) -> Optional[Trace]:
+        with self.lock:
+            return next((t for t in self.traces if t.trace_id == trace_id), None)
+
+    def clear(self):
+        with self.lock:
+            self.traces.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "slow_ms": self.slow_ms,
+            "traces_started": self.started,
+            "traces_kept": self.kept,
+            "buffered": len(self.traces),
+            "buffer_size": self.traces.maxlen
+        }
+
+
+class TracingTransport(httpx.AsyncHTTPTransport):
+    """httpx transport recording a span per upstream request"""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with tracer.span(f"{request.method} {request.url.host}", "client", url=str(request.url)) as span:
+            response = await super().handle_async_request(request)
+            if span:
+                span.attributes["status"] = response.status_code
+            return response
+
+
+OTLP_KINDS = {"internal": 1, "server": 2, "client": 3, "db": 3, "template": 1}
+
+
+def to_otlp(traces: List[Trace], service_name: str) -> dict:
+    """Traces as an OTLP/JSON ExportTraceServiceRequest (POST to a collector's /v1/traces)"""
+    spans = []
+    for trace in traces:
+        # perf_counter offsets anchored to the trace's wall-clock start
+        epoch_ns = int(trace.started_at * 1e9) - trace.origin_ns
+        for span in trace.spans:
+            attributes = [{"key": "kind", "value": {"stringValue": span.kind}}]
+            attributes += [{"key": k, "value": {"stringValue": str(v)}} for k, v in span.attributes.items()]
+            spans.append({
+                "traceId": trace.trace_id,
+                "spanId": span.span_id,
+                "parentSpanId": span.parent_id or "",
+                "name": span.name,
+                "kind": OTLP_KINDS.get(span.kind, 1),
+                "startTimeUnixNano": str(epoch_ns + span.start),
+                "endTimeUnixNano": str(epoch_ns + (span.end or span.start)),
+                "attributes": attributes,
+                "status": {"code": 2, "message": span.error} if span.error else {}
+            })
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{"scope": {"name": "fpai-dashboard"}, "spans": spans}]
+        }]
+    }
+
+
+# Singleton instance
+tracer = Tracer(
+    enabled=settings.tracing_enabled,
+    sample_rate=settings.trace_sample_rate,
+    slow_ms=settings.trace_slow_ms,
+    max_traces=settings.trace_buffer_size
+)
+caches.register("traces", lambda: {"traces": len(tracer.traces), "max_traces": tracer.traces.maxlen})
@@ -0,0 +1,89 @@
+"""
+Template Fragment Cache
+{% fragment "name", key... %}...{% endfragment %} renders a block once per key
+and template version, so member pages only render their per-user parts per request
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+
+
+class FragmentCache:
+    """Bounded LRU of rendered template fragments"""
+
+    def __init__(self, max_entries: int = 256):
+        # 0 disables caching (every fragment renders inline)
+        self.max_entries = max_entries
+        self.entries: OrderedDict[tuple, str] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key: tuple, render: Callable[[], str]) -> str:
+        """Cached fragment for `key`, rendering and storing it on a miss"""
+        if not self.max_entries:
+            return render()
+
+        with self.lock:
+            fragment = self.entries.get(key)
+            if fragment is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return fragment
+
+        # Rendered outside the lock; a concurrent miss just renders the same markup twice
+        fragment = render()
+        with self.lock:
+            self.misses += 1
+            self.entries[key] = fragment
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return fragment
+
+    def clear(self):
+        """Drop every cached fragment"""
+        with self.lock:
+            self.entries.clear()
+
+    def size(self) -> int:
+        """Number of cached fragments"""
+        return len(self.entries)
+
+
+class FragmentCacheExtension(Extension):
+    """
+    Jinja extension adding the {% fragment %} tag
+    Keys include a hash of the template source, so an edited template never
+    serves fragments rendered from its old version.
+    """
+
+    tags = {"fragment"}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=FragmentCache())
+        self.source_versions: dict[Optional[str], str] = {}
+
+    def preprocess(self, source: str, name: Optional[str], filename: Optional[str] = None) -> str:
+        # Runs on every compile (templates loaded from bytecode were compiled from identical source)
+        self.source_versions[name] = hashlib.sha256(source.encode()).hexdigest()[:16]
+        return source
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            args.append(parser.parse_expression())
+
+        version = f"{parser.name}:{self.source_versions.get(parser.name, '')}"
+        key = nodes.Tuple([nodes.Const(version), *args], "load")
+        body = parser.parse_statements(["name:endfragment"], drop_needle=True)
+        return nodes.CallBlock(self.call_method("_render_fragment", [key]), [], [], body).set_lineno(lineno)
+
+    def _render_fragment(self, key: tuple, caller: Callable[[], Any]) -> str:
+        return self.environment.fragment_cache.get_or_render(key, caller)
@@ -0,0 +1,188 @@
+"""
+Logging Pipeline
+Records are filtered and stamped with the request ID on the calling thread, then handed to a
+bounded queue; a background listener formats (text or JSON) and writes them to stderr
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from app.config import settings
+from app.diagnostics.memory import caches
+from app.diagnostics.tracing import tracer
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Set per request by RequestIdMiddleware
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+class RequestContextFilter(logging.Filter):
+    """Copies the request and trace IDs onto the record (contextvars don't reach the listener thread)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        record.trace_id = tracer.current_trace_id()
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Passes at most `limit` records per call site per `window` seconds
+    The first record through after a suppressed stretch carries the suppressed count.
+    """
+
+    def __init__(self, limit: int, window: float = 60.0, clock=time.monotonic):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.clock = clock
+        # (file, line) -> [window start, passed, suppressed]; bounded by the number of log calls in the code
+        self.sites: Dict[tuple, list] = {}
+        self.lock = threading.Lock()
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not self.limit:
+            return True
+        key = (record.pathname, record.lineno)
+        now = self.clock()
+        with self.lock:
+            site = self.sites.get(key)
+            if site is None or now - site[0] >= self.window:
+                if site is not None and site[2]:
+                    record.suppressed = site[2]
+                site = self.sites[key] = [now, 0, 0]
+            if site[1] >= self.limit:
+                site[2] += 1
+                self.suppressed += 1
+                return False
+            site[1] += 1
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues without waiting; when the writer falls behind, records are dropped and counted"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge args into the message now, while they still hold their values at call time"""
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class TextFormatter(logging.Formatter):
+    """The classic one-line format, noting lines the rate limit held back"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        return f"{line} ({suppressed} similar suppressed)" if suppressed else line
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for field in ("request_id", "trace_id", "suppressed"):
+            value = getattr(record, field, None)
+            if value:
+                entry[field] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        elif record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class LoggingPipeline:
+    """Owns the queue, handler and listener installed on the root logger"""
+
+    def __init__(self):
+        self.handler: Optional[NonBlockingQueueHandler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+        self.rate_limit: Optional[RateLimitFilter] = None
+
+    def configure(self, level: str = "INFO", fmt: str = "text", queue_size: int = 10000,
+                  rate_limit: int = 60, stream=None):
+        """Replace the root handlers with the queue pipeline (safe to call again)"""
+        self.shutdown()
+        log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.rate_limit = RateLimitFilter(rate_limit)
+        self.handler = NonBlockingQueueHandler(log_queue)
+        self.handler.addFilter(self.rate_limit)
+        self.handler.addFilter(RequestContextFilter())
+
+        writer = logging.StreamHandler(stream or sys.stderr)
+        writer.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter(TEXT_FORMAT))
+        self.listener = logging.handlers.QueueListener(log_queue, writer, respect_handler_level=True)
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        root.setLevel(level.upper())
+        self.listener.start()
+
+    def shutdown(self):
+        """Write out what is queued and detach (no-op when not configured)"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        if self.handler is not None:
+            logging.getLogger().removeHandler(self.handler)
+            self.handler = None
+
+    def stats(self) -> dict:
+        if self.handler is None:
+            return {"configured": False}
+        return {
+            "queued": self.handler.queue.qsize(),
+            "max_queued": self.handler.queue.maxsize,
+            "dropped": self.handler.dropped,
+            "rate_limited": self.rate_limit.suppressed
+        }
+
+
+# Singleton instance
+logging_pipeline = LoggingPipeline()
+caches.register("log_queue", logging_pipeline.stats)
+atexit.register(logging_pipeline.shutdown)
+
+
+def configure_logging():
+    """Install the pipeline from settings"""
+    logging_pipeline.configure(
+        level=settings.log_level,
+        fmt=settings.log_format,
+        queue_size=settings.log_queue_size,
+        rate_limit=settings.log_rate_limit
+    )
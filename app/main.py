@@ -4,29 +4,41 @@ Droplet #2 - Public marketing site and system visualization
 Follows FPAI architecture and UDC compliance
 """
 from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, RedirectResponse
 from contextlib import asynccontextmanager
 import asyncio
 import logging
-from pathlib import Path
 
 from app.config import settings
-from app.routers import udc, api, auth, tools, command_center, deploy, system_status, money
+from app.diagnostics.memory import caches
+from app.routers import udc, api, auth, tools, command_center, deploy, money, admin, progress, debug
 from app.routers.auth import get_current_user
 from app.services.registry_client import registry_client
+from app.services.progress_store import progress_store
+from app.services.session_index import session_index
+from app.services.system_context import system_context
+from app.services.deploy_jobs import deploy_runner
+from app.services.lifecycle import lifecycle
+from app.middleware.rate_limit import RateLimitMiddleware, load_monitor
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.tracing import TracingMiddleware
+from app.middleware.request_id import RequestIdMiddleware
+from app.logging_setup import configure_logging
+from app.static_files import PrecompressedStaticFiles
+from app.assets import asset_manifest, static_path
+from app.services.page_cache import PageCache
+from app.templating import templates, templates_path, precompile_templates
 
 # Configure logging (follows CODE_STANDARDS.md - structured logging)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
-# Background task for heartbeat
+# Background tasks for heartbeat, progress write-behind, loop-lag probing and session indexing
 heartbeat_task = None
+progress_flush_task = None
+lag_probe_task = None
+session_index_task = None
 
 
 async def send_heartbeat_loop():
@@ -40,16 +52,16 @@ async def send_heartbeat_loop():
             else:
                 logger.warning("Heartbeat failed")
         except Exception as e:
-            logger.error(f"Heartbeat loop error: {e}")
+            logger.error("Heartbeat loop error: %s", e)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifecycle management - startup and shutdown"""
-    global heartbeat_task
+    global heartbeat_task, progress_flush_task, lag_probe_task, session_index_task
 
     # Startup
-    logger.info(f"Starting {settings.droplet_name} v{settings.version}")
+    logger.info("Starting %s v%s", settings.droplet_name, settings.version)
 
     # Register with Registry
     logger.info("Registering with Registry...")
@@ -63,16 +75,41 @@ async def lifespan(app: FastAPI):
     heartbeat_task = asyncio.create_task(send_heartbeat_loop())
     logger.info("Started heartbeat task")
 
+    precompile_templates()
+    page_cache.warm()
+
+    progress_flush_task = asyncio.create_task(progress_store.run_flush_loop())
+    lag_probe_task = asyncio.create_task(load_monitor.run_lag_probe())
+    session_index_task = asyncio.create_task(session_index.run())
+
+    # Fill caches before reporting ready, so a reloaded worker starts warm
+    await lifecycle.warm({
+        "droplets": registry_client.get_droplets,
+        "system_context": lambda: asyncio.to_thread(system_context.get),
+        "git_info": deploy_runner.git_info,
+    })
+    lifecycle.mark_ready()
+
     yield
 
     # Shutdown
     logger.info("Shutting down Dashboard...")
+    lifecycle.begin_drain()
     if heartbeat_task:
         heartbeat_task.cancel()
         try:
             await heartbeat_task
         except asyncio.CancelledError:
             pass
+    for task in (progress_flush_task, lag_probe_task, session_index_task):
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    # Persist any buffered progress before exiting
+    progress_store.flush()
     logger.info("Shutdown complete")
 
 
@@ -103,87 +140,99 @@ async def add_security_headers(request: Request, call_next):
     response.headers["X-XSS-Protection"] = "1; mode=block"
     return response
 
-# Mount static files and templates
-static_path = Path(__file__).parent / "static"
-templates_path = Path(__file__).parent / "templates"
+# Rate limiting and load shedding, so rejected requests do no work
+app.add_middleware(RateLimitMiddleware)
+
+# Compression (pre-compressed and streaming responses pass through)
+app.add_middleware(CompressionMiddleware)
 
-app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
-templates = Jinja2Templates(directory=str(templates_path))
+# Tracing (so the root span covers the whole request)
+app.add_middleware(TracingMiddleware)
+
+# Request IDs (outermost, so every log line of the request carries one)
+app.add_middleware(RequestIdMiddleware)
+
+# Mount static files (fingerprinted URLs from the asset manifest are cached as immutable)
+app.mount(
+    "/static",
+    PrecompressedStaticFiles(directory=str(static_path), manifest=asset_manifest),
+    name="static"
+)
+
+# Marketing pages only depend on static values, so they are rendered once
+# (and again on template change in debug mode) and served as pre-compressed bytes
+page_cache = PageCache(templates.env, templates_path, check_interval=2.0 if settings.debug else None)
+MARKETING_PAGES = {
+    "home.html": "Full Potential AI",
+    "sacred-loop.html": "The Sacred Loop - Full Potential AI",
+    "live-system.html": "Live System - Full Potential AI",
+    "how-it-works.html": "How It Works - Full Potential AI",
+    "get-involved.html": "Get Involved - Full Potential AI",
+    "paradise-progress.html": "Paradise Progress - Full Potential AI",
+    "membership.html": "Full Potential Membership - Unlock Your Potential with AI",
+}
+for template_name, page_title in MARKETING_PAGES.items():
+    page_cache.register(template_name, title=page_title, version=settings.version)
+caches.register("page_cache", lambda: {
+    "pages": len(page_cache.pages),
+    "rendered": len(page_cache.rendered),
+    "bytes": sum(len(body) for page in list(page_cache.rendered.values()) for body in list(page.variants.values()))
+})
 
 # Include routers
 app.include_router(udc.router, tags=["UDC"])
 app.include_router(api.router, tags=["API"])
-app.include_router(system_status.router, tags=["System Status"])
 app.include_router(auth.router, tags=["Auth"])
 app.include_router(tools.router, tags=["Tools"])
 app.include_router(command_center.router, prefix="/api/command-center", tags=["Command Center"])
 app.include_router(deploy.router, tags=["Deploy"])
 app.include_router(money.router, tags=["Money"])
+app.include_router(admin.router, tags=["Admin"])
+app.include_router(progress.router, tags=["Progress"])
+app.include_router(debug.router, tags=["Debug"])
 
 
 # Web Routes
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Home page - Vision and marketing"""
-    return templates.TemplateResponse("home.html", {
-        "request": request,
-        "title": "Full Potential AI",
-        "version": settings.version
-    })
+    return page_cache.response(request, "home.html")
 
 
 @app.get("/sacred-loop", response_class=HTMLResponse)
 async def sacred_loop(request: Request):
     """Sacred Loop explanation page"""
-    return templates.TemplateResponse("sacred-loop.html", {
-        "request": request,
-        "title": "The Sacred Loop - Full Potential AI"
-    })
+    return page_cache.response(request, "sacred-loop.html")
 
 
 @app.get("/live-system", response_class=HTMLResponse)
 async def live_system(request: Request):
     """Live system status page"""
-    return templates.TemplateResponse("live-system.html", {
-        "request": request,
-        "title": "Live System - Full Potential AI"
-    })
+    return page_cache.response(request, "live-system.html")
 
 
 @app.get("/how-it-works", response_class=HTMLResponse)
 async def how_it_works(request: Request):
     """Architecture and how it works page"""
-    return templates.TemplateResponse("how-it-works.html", {
-        "request": request,
-        "title": "How It Works - Full Potential AI"
-    })
+    return page_cache.response(request, "how-it-works.html")
 
 
 @app.get("/get-involved", response_class=HTMLResponse)
 async def get_involved(request: Request):
     """Get involved page - recruitment and investment"""
-    return templates.TemplateResponse("get-involved.html", {
-        "request": request,
-        "title": "Get Involved - Full Potential AI"
-    })
+    return page_cache.response(request, "get-involved.html")
 
 
 @app.get("/paradise-progress", response_class=HTMLResponse)
 async def paradise_progress(request: Request):
     """Paradise Progress - Journey to coherence dashboard"""
-    return templates.TemplateResponse("paradise-progress.html", {
-        "request": request,
-        "title": "Paradise Progress - Full Potential AI"
-    })
+    return page_cache.response(request, "paradise-progress.html")
 
 
 @app.get("/membership", response_class=HTMLResponse)
 async def membership(request: Request):
     """Membership landing page - Full Potential personal growth subscription"""
-    return templates.TemplateResponse("membership.html", {
-        "request": request,
-        "title": "Full Potential Membership - Unlock Your Potential with AI"
-    })
+    return page_cache.response(request, "membership.html")
 
 
 @app.get("/dashboard", response_class=HTMLResponse)
@@ -0,0 +1,106 @@
+"""
+Response Compression Middleware
+Negotiates brotli or gzip for dynamic responses above a minimum size
+Skips streaming responses, already-encoded bodies and incompressible types
+"""
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Optional
+
+from app.compression import available_encodings, compress, negotiate
+from app.config import settings
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+
+
+def is_compressible(content_type: str) -> bool:
+    """True for text-like media types (server-sent events excluded)"""
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type == "text/event-stream":
+        return False
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete (Content-Length) responses"""
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"), available_encodings())
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+
+        minimum_size = self.minimum_size if self.minimum_size is not None else settings.compression_min_size
+        responder = CompressionResponder(send, encoding, minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    """Buffers one response and compresses it once the body is complete"""
+
+    def __init__(self, send: Send, encoding: str, minimum_size: int):
+        self.downstream = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+        self.chunks: list[bytes] = []
+
+    def should_compress(self, message: Message) -> bool:
+        """Decide from the response headers alone whether compression applies"""
+        if message["status"] < 200 or message["status"] in (204, 304):
+            return False
+        headers = Headers(raw=message["headers"])
+        content_length = headers.get("content-length")
+        # No Content-Length means a streaming response: pass it straight through
+        if content_length is None or int(content_length) < self.minimum_size:
+            return False
+        if "content-encoding" in headers:
+            return False
+        return is_compressible(headers.get("content-type", ""))
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            if self.should_compress(message):
+                self.start_message = message
+            else:
+                self.passthrough = True
+                await self.downstream(message)
+            return
+
+        if self.passthrough or message["type"] != "http.response.body":
+            await self.downstream(message)
+            return
+
+        self.chunks.append(message.get("body", b""))
+        if message.get("more_body", False):
+            return
+
+        body = b"".join(self.chunks)
+        headers = MutableHeaders(scope=self.start_message)
+        compressed = compress(body, self.encoding, fast=True)
+        if len(compressed) < len(body):
+            body = compressed
+            headers["Content-Encoding"] = self.encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            # The encoded body is a different representation than a strong ETag names
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+
+        await self.downstream(self.start_message)
+        await self.downstream({"type": "http.response.body", "body": body})
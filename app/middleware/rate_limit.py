@@ -0,0 +1,230 @@
+"""
+Rate Limiting and Load Shedding Middleware
+Sharded in-process token buckets keyed by client IP and route class,
+plus 503 shedding of expensive routes when the process is overloaded
+"""
+import asyncio
+import json
+import logging
+import math
+import threading
+import time
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.diagnostics.memory import caches
+
+logger = logging.getLogger(__name__)
+
+# (route class, methods or None for all, exact paths, path prefixes) - first match wins
+ROUTE_CLASSES = [
+    ("auth", ("POST",), (), ("/login", "/signup")),
+    ("chat", None, (), ("/api/command-center/chat",)),
+    # Only the pull itself; job status, log streams and /deploy-status use the default limit
+    ("deploy", None, ("/deploy",), ()),
+    ("admin", None, (), ("/admin", "/debug")),
+]
+
+# Never rate limited or shed
+EXEMPT_PREFIXES = ("/static", "/health", "/ready")
+
+# Shed first when overloaded: model calls, git, bulk data and upstream fan-out
+EXPENSIVE_CLASSES = {"chat", "deploy", "admin"}
+EXPENSIVE_PREFIXES = ("/api/system-status",)
+
+
+def route_limit(route_class: str) -> int:
+    """Requests per minute allowed for a route class"""
+    return {
+        "auth": settings.rate_limit_auth_per_minute,
+        "chat": settings.rate_limit_chat_per_minute,
+        "deploy": settings.rate_limit_deploy_per_minute,
+        "admin": settings.rate_limit_admin_per_minute,
+    }.get(route_class, settings.rate_limit_per_minute)
+
+
+def classify(method: str, path: str) -> str:
+    """Map a request to its route class"""
+    for route_class, methods, paths, prefixes in ROUTE_CLASSES:
+        if (methods is None or method in methods) and (path in paths or path.startswith(prefixes)):
+            return route_class
+    return "default"
+
+
+class BucketShard:
+    """One shard of buckets with its own lock"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> [tokens, last refill timestamp]
+        self.buckets: dict[tuple, list] = {}
+
+
+class TokenBucketLimiter:
+    """Token-bucket rate limiter sharded by key hash to keep lock hold times short"""
+
+    # Idle buckets refill to full and are dropped once a shard grows past this
+    MAX_KEYS_PER_SHARD = 10000
+
+    def __init__(self, shards: int = 16, clock=time.monotonic):
+        self.shards = [BucketShard() for _ in range(shards)]
+        self.clock = clock
+        self.limited = 0
+
+    def acquire(self, key: tuple, limit: int) -> tuple[bool, int, float, float]:
+        """
+        Take one token for `key` from a bucket of `limit` tokens refilled per minute
+        Returns (allowed, remaining tokens, seconds until the next token,
+        seconds until the bucket is full again).
+        """
+        if limit < 1:
+            raise ValueError(f"Rate limit must be at least 1 per minute, got {limit}")
+        rate = limit / 60.0
+        shard = self.shards[hash(key) % len(self.shards)]
+        now = self.clock()
+
+        with shard.lock:
+            bucket = shard.buckets.get(key)
+            if bucket is None:
+                if len(shard.buckets) >= self.MAX_KEYS_PER_SHARD:
+                    self._sweep(shard, now)
+                bucket = shard.buckets[key] = [float(limit), now]
+            else:
+                bucket[0] = min(float(limit), bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+
+            allowed = bucket[0] >= 1.0
+            if allowed:
+                bucket[0] -= 1.0
+            tokens = bucket[0]
+
+        if not allowed:
+            self.limited += 1
+        retry_after = 0.0 if allowed else (1.0 - tokens) / rate
+        return allowed, int(tokens), retry_after, (limit - tokens) / rate
+
+    def _sweep(self, shard: BucketShard, now: float):
+        """Drop buckets idle long enough to have refilled completely"""
+        for key in [key for key, (_, last) in shard.buckets.items() if now - last > 60]:
+            del shard.buckets[key]
+
+    def size(self) -> int:
+        """Number of tracked buckets"""
+        return sum(len(shard.buckets) for shard in self.shards)
+
+    def reset(self):
+        """Forget all buckets"""
+        for shard in self.shards:
+            with shard.lock:
+                shard.buckets.clear()
+
+
+class LoadMonitor:
+    """Tracks in-flight requests and event loop lag"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.lag_ms = 0.0
+        self.shed = 0
+
+    def overloaded(self) -> bool:
+        """True when in-flight work or loop lag is past its threshold"""
+        return (
+            self.in_flight > settings.shed_max_inflight
+            or self.lag_ms > settings.shed_max_loop_lag_ms
+        )
+
+    async def run_lag_probe(self, interval: float = 0.5):
+        """Background task measuring how late the event loop wakes up"""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(interval)
+            lag = (loop.time() - started - interval) * 1000
+            # Smooth out single hiccups; sustained lag still crosses the threshold quickly
+            self.lag_ms = max(0.0, 0.5 * self.lag_ms + 0.5 * lag)
+
+
+def client_ip(scope: Scope) -> str:
+    """Client address, optionally taken from X-Forwarded-For behind a trusted proxy"""
+    if settings.trust_forwarded_for:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+async def send_error(send: Send, status: int, detail: str, headers: dict):
+    """Send a small JSON error response"""
+    body = json.dumps({"detail": detail}).encode()
+    raw_headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    raw_headers += [(k.lower().encode(), str(v).encode()) for k, v in headers.items()]
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying load shedding and per-client rate limits"""
+
+    def __init__(self, app: ASGIApp, limiter: Optional[TokenBucketLimiter] = None, monitor: Optional[LoadMonitor] = None):
+        self.app = app
+        self.limiter = limiter or rate_limiter
+        self.monitor = monitor or load_monitor
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        route_class = classify(scope["method"], path)
+
+        if (route_class in EXPENSIVE_CLASSES or path.startswith(EXPENSIVE_PREFIXES)) and self.monitor.overloaded():
+            self.monitor.shed += 1
+            logger.warning("Shedding %s: %d in flight, loop lag %.0fms",
+                           path, self.monitor.in_flight, self.monitor.lag_ms)
+            await send_error(send, 503, "Server busy, please retry shortly",
+                             {"Retry-After": settings.shed_retry_after})
+            return
+
+        rate_headers = {}
+        limit = route_limit(route_class)
+        # A limit of 0 turns limiting off for that route class
+        if settings.rate_limit_enabled and limit > 0:
+            allowed, remaining, retry_after, reset = self.limiter.acquire((client_ip(scope), route_class), limit)
+            rate_headers = {
+                "X-RateLimit-Limit": limit,
+                "X-RateLimit-Remaining": remaining,
+                "X-RateLimit-Reset": math.ceil(reset),
+            }
+
+            if not allowed:
+                await send_error(send, 429, "Too many requests",
+                                 {**rate_headers, "Retry-After": math.ceil(retry_after)})
+                return
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start" and rate_headers:
+                headers = MutableHeaders(scope=message)
+                for name, value in rate_headers.items():
+                    headers[name] = str(value)
+            await send(message)
+
+        self.monitor.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            self.monitor.in_flight -= 1
+
+
+# Singleton instances
+rate_limiter = TokenBucketLimiter(shards=settings.rate_limit_shards)
+load_monitor = LoadMonitor()
+caches.register("rate_limiter", lambda: {
+    "buckets": sum(len(shard.buckets) for shard in rate_limiter.shards),
+    "max_buckets": TokenBucketLimiter.MAX_KEYS_PER_SHARD * len(rate_limiter.shards)
+})
@@ -0,0 +1,39 @@
+"""
+Request Tracing Middleware
+Opens a root span per HTTP request, named by the matched route once routing is done
+Adds the trace ID to responses so a slow request can be looked up in /debug/traces
+"""
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.diagnostics.tracing import tracer
+
+# Not traced: assets, probes and the trace viewer itself
+UNTRACED_PREFIXES = ("/static", "/health", "/ready", "/debug")
+
+
+class TracingMiddleware:
+    """ASGI middleware wrapping each request in a trace"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not tracer.enabled or scope["path"].startswith(UNTRACED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        with tracer.trace(f"{scope['method']} {scope['path']}", path=scope["path"]) as root:
+            async def send_with_trace_id(message: Message):
+                if message["type"] == "http.response.start" and root is not None:
+                    root.attributes["status"] = message["status"]
+                    MutableHeaders(scope=message).append("X-Trace-Id", tracer.current_trace_id())
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_trace_id)
+            finally:
+                # FastAPI records the matched route in the scope while routing
+                route = scope.get("route")
+                if route is not None and root is not None:
+                    root.name = f"{scope['method']} {route.path}"
@@ -3,7 +3,7 @@ Dashboard Data Models
 Follows FPAI CODE_STANDARDS.md - Type hints required
 """
 from pydantic import BaseModel, Field
-from typing import Literal, Optional
+from typing import Any, Literal, Optional
 from datetime import datetime
 
 
@@ -97,3 +97,18 @@ class RegistrationPayload(BaseModel):
     port: int
     capabilities: list[str]
     status: Literal["active", "inactive", "error"] = "active"
+
+
+class ProgressPatchOperation(BaseModel):
+    """One JSON-patch style operation on member progress (path starts with the section)"""
+    op: Literal["add", "remove", "replace", "test"]
+    path: str
+    value: Any = None
+
+
+class LedgerEntryRequest(BaseModel):
+    """A cost or revenue entry for the treasury ledger"""
+    kind: Literal["cost", "revenue"]
+    category: str = Field(min_length=1, max_length=64)
+    amount: float
+    note: Optional[str] = Field(default=None, max_length=500)
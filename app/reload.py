@@ -0,0 +1,81 @@
+"""
+Graceful Reload
+Rolls gunicorn workers one at a time: a new worker starts, warms its caches and reports ready,
+and only then is the oldest worker retired to drain its in-flight requests
+Usage: python -m app.reload [--delay SECONDS]
+"""
+import argparse
+import logging
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Set
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def ready_pids(ready_dir: Path) -> Set[int]:
+    """Workers that reported ready and are still alive (stale markers are removed)"""
+    pids = set()
+    for marker in ready_dir.glob("*"):
+        try:
+            pid = int(marker.name)
+            os.kill(pid, 0)
+        except (ValueError, ProcessLookupError):
+            marker.unlink(missing_ok=True)
+            continue
+        except PermissionError:
+            pass
+        pids.add(pid)
+    return pids
+
+
+def rolling_reload(
+    master_pid: int,
+    workers: int,
+    ready_dir: Path,
+    timeout: float,
+    send: Callable[[int, int], None] = os.kill,
+    poll_interval: float = 0.2
+) -> bool:
+    """Replace each worker once; stops (leaving the old workers serving) if a new one never gets ready"""
+    for n in range(workers):
+        before = ready_pids(ready_dir)
+        # One extra worker, loading the code as it is now
+        send(master_pid, signal.SIGTTIN)
+        deadline = time.monotonic() + timeout
+        while not ready_pids(ready_dir) - before:
+            if time.monotonic() > deadline:
+                logger.error("New worker not ready after %gs; keeping the old workers", timeout)
+                return False
+            time.sleep(poll_interval)
+        # One worker fewer: gunicorn retires the oldest, which drains and exits
+        send(master_pid, signal.SIGTTOU)
+        logger.info("Replaced worker %d/%d", n + 1, workers)
+    return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--delay", type=float, default=0, help="Seconds to wait first (lets a deploy job finish its log)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    time.sleep(args.delay)
+    pid_file = Path(settings.pid_file)
+    if not settings.ready_dir or not pid_file.exists():
+        logger.error("No gunicorn master found (%s); start the app with gunicorn -c gunicorn.conf.py", pid_file)
+        return 1
+
+    master_pid = int(pid_file.read_text().strip())
+    # Allow for registration with the Registry plus the warm-up itself
+    timeout = settings.warmup_timeout * 3
+    return 0 if rolling_reload(master_pid, settings.web_concurrency, Path(settings.ready_dir), timeout) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
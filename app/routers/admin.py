@@ -0,0 +1,309 @@
+"""
+Admin Router
+Bulk export and import of membership data (users and progress)
+"""
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+import csv
+import io
+import json
+import logging
+import secrets
+import tempfile
+import time
+
+from app.config import settings
+from app.database import (
+    BULK_BATCH_SIZE,
+    MEMBERSHIP_TIERS,
+    USER_EXPORT_COLUMNS,
+    PROGRESS_EXPORT_COLUMNS,
+    iter_users_export,
+    iter_progress_export,
+    bulk_create_users,
+    bulk_update_progress,
+    hash_password
+)
+from app.routers.auth import is_valid_email
+from app.services.progress_store import progress_store, inflate_blob
+from app.services.system_context import system_context
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/admin")
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+# Flush streamed export output in chunks of roughly this many bytes
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+# Import bodies larger than this spill from memory to a temp file
+IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+# Cap on per-row errors echoed back from an import
+MAX_REPORTED_ERRORS = 100
+
+
+def require_admin(
+    secret: Optional[str] = Query(default=None, description="Admin secret key"),
+    x_admin_secret: Optional[str] = Header(default=None)
+):
+    """Dependency that guards admin endpoints with the configured admin secret"""
+    if not settings.admin_secret:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_SECRET not set)")
+
+    provided = x_admin_secret or secret or ""
+    if not secrets.compare_digest(provided, settings.admin_secret):
+        raise HTTPException(status_code=403, detail="Invalid admin secret")
+
+
+def check_format(fmt: str) -> str:
+    """Validate an export/import format name"""
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{fmt}' (use ndjson or csv)")
+    return fmt
+
+
+def encode_rows(rows: Iterator, columns: tuple, fmt: str) -> Iterator[str]:
+    """Encode rows as NDJSON or CSV, yielding buffered chunks"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+
+    if writer:
+        writer.writerow(columns)
+
+    for row in rows:
+        if writer:
+            writer.writerow(tuple(row))
+        else:
+            buffer.write(json.dumps(dict(zip(columns, row))))
+            buffer.write("\n")
+
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_response(rows: Iterator, columns: tuple, fmt: str, name: str) -> StreamingResponse:
+    """Build a streaming download response for an export"""
+    filename = f"{name}-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.{fmt}"
+    return StreamingResponse(
+        encode_rows(rows, columns, fmt),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/export/users", dependencies=[Depends(require_admin)])
+async def export_users(format: str = Query(default="ndjson")):
+    """Stream all users as NDJSON or CSV"""
+    fmt = check_format(format)
+    return export_response(iter_users_export(), USER_EXPORT_COLUMNS, fmt, "users")
+
+
+def iter_inflated_progress() -> Iterator[tuple]:
+    """Progress rows with compressed blobs expanded to plain JSON text"""
+    for email, goal_data, reflection_data, strengths_data, last_updated in iter_progress_export():
+        yield (
+            email,
+            inflate_blob(goal_data),
+            inflate_blob(reflection_data),
+            inflate_blob(strengths_data),
+            last_updated
+        )
+
+
+@router.get("/export/progress", dependencies=[Depends(require_admin)])
+async def export_progress(format: str = Query(default="ndjson")):
+    """Stream all user progress as NDJSON or CSV (keyed by email)"""
+    fmt = check_format(format)
+    # Write buffered autosaves first so the export is current
+    await run_in_threadpool(progress_store.flush)
+    return export_response(iter_inflated_progress(), PROGRESS_EXPORT_COLUMNS, fmt, "progress")
+
+
+async def spool_body(request: Request) -> BinaryIO:
+    """Copy the request body to a spooled temp file without buffering it whole"""
+    spool = tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+def read_records(spool: BinaryIO, fmt: str) -> Iterator[tuple[int, Any]]:
+    """Yield (line number, record) pairs; record is an Exception for unparseable lines"""
+    text = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, {k: (v if v != "" else None) for k, v in record.items()}
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, ValueError(f"Invalid JSON: {e}")
+            continue
+        if not isinstance(record, dict):
+            yield line_number, ValueError("Expected a JSON object")
+            continue
+        yield line_number, record
+
+
+def parse_active(value: Any) -> int:
+    """Normalize is_active from JSON or CSV values"""
+    if value is None:
+        return 1
+    if isinstance(value, str):
+        return 0 if value.strip().lower() in ("0", "false", "no", "") else 1
+    return 1 if value else 0
+
+
+def string_field(record: Dict[str, Any], field: str) -> Optional[str]:
+    """A text field from an imported record (None when absent); other JSON types are rejected"""
+    value = record.get(field)
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f"{field} must be a string")
+    return value
+
+
+def validate_user(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate an imported user record, returning a row for bulk_create_users"""
+    email = (string_field(record, "email") or "").strip().lower()
+    if not is_valid_email(email):
+        raise ValueError("Invalid email address")
+
+    tier = string_field(record, "membership_tier") or "seeker"
+    if tier not in MEMBERSHIP_TIERS:
+        raise ValueError(f"Invalid membership tier '{tier}'")
+
+    # Exports carry password hashes; plaintext passwords are hashed here
+    password_hash = string_field(record, "password_hash")
+    password = string_field(record, "password")
+    if password_hash:
+        if "$" not in password_hash:
+            raise ValueError("Malformed password_hash")
+    elif password:
+        if len(password) < 8:
+            raise ValueError("Password must be at least 8 characters")
+        password_hash = hash_password(password)
+    else:
+        raise ValueError("password or password_hash is required")
+
+    return {
+        "email": email,
+        "password_hash": password_hash,
+        "full_name": (string_field(record, "full_name") or "").strip(),
+        "membership_tier": tier,
+        "created_at": string_field(record, "created_at") or datetime.utcnow().isoformat(),
+        "last_login": string_field(record, "last_login"),
+        "is_active": parse_active(record.get("is_active")),
+        "stripe_customer_id": string_field(record, "stripe_customer_id")
+    }
+
+
+def validate_progress(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate an imported progress record, returning a row for bulk_update_progress"""
+    email = (string_field(record, "email") or "").strip().lower()
+    if not is_valid_email(email):
+        raise ValueError("Invalid email address")
+
+    row = {"email": email, "last_updated": string_field(record, "last_updated") or datetime.utcnow().isoformat()}
+    for column in ("goal_data", "reflection_data", "strengths_data"):
+        value = record.get(column)
+        # NDJSON may carry the blobs as nested JSON rather than strings
+        row[column] = value if value is None or isinstance(value, str) else json.dumps(value)
+    return row
+
+
+def run_import(spool: BinaryIO, fmt: str, validate, write) -> Dict[str, Any]:
+    """Validate records and write them in batched transactions"""
+    started = time.perf_counter()
+    received = written = invalid = 0
+    errors = []
+    batch = []
+
+    for line_number, record in read_records(spool, fmt):
+        received += 1
+        try:
+            if isinstance(record, Exception):
+                raise record
+            batch.append(validate(record))
+        except ValueError as e:
+            invalid += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"line": line_number, "error": str(e)})
+            continue
+
+        if len(batch) >= BULK_BATCH_SIZE:
+            written += write(batch)
+            batch = []
+
+    if batch:
+        written += write(batch)
+
+    return {
+        "received": received,
+        "written": written,
+        "skipped": received - written - invalid,
+        "invalid": invalid,
+        "errors": errors,
+        "elapsed_seconds": round(time.perf_counter() - started, 3)
+    }
+
+
+@router.post("/import/users", dependencies=[Depends(require_admin)])
+async def import_users(request: Request, format: str = Query(default="ndjson")):
+    """
+    Bulk import users from an NDJSON or CSV body
+    Rows need email plus password_hash (from an export) or password.
+    Existing emails are skipped.
+    """
+    fmt = check_format(format)
+    spool = await spool_body(request)
+    try:
+        result = await run_in_threadpool(run_import, spool, fmt, validate_user, bulk_create_users)
+    finally:
+        spool.close()
+
+    if result["written"]:
+        system_context.invalidate()
+
+    logger.info("User import: %d imported, %d skipped, %d invalid in %ss",
+                result["written"], result["skipped"], result["invalid"], result["elapsed_seconds"])
+    return {"status": "success", **result}
+
+
+@router.post("/import/progress", dependencies=[Depends(require_admin)])
+async def import_progress(request: Request, format: str = Query(default="ndjson")):
+    """
+    Bulk import user progress from an NDJSON or CSV body
+    Rows are matched to existing users by email; unknown emails are skipped.
+    """
+    fmt = check_format(format)
+    spool = await spool_body(request)
+    try:
+        result = await run_in_threadpool(run_import, spool, fmt, validate_progress, bulk_update_progress)
+    finally:
+        spool.close()
+
+    # Cached progress documents are now stale
+    progress_store.invalidate()
+
+    logger.info("Progress import: %d updated, %d skipped", result["written"], result["skipped"])
+    return {"status": "success", **result}
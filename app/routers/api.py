@@ -6,7 +6,9 @@ from fastapi import APIRouter
 from app.models import SystemStatus, ServiceStatus, DropletInfo
 from app.services.registry_client import registry_client
 from app.services.orchestrator_client import orchestrator_client
+from app.diagnostics.tracing import TracingTransport
 from datetime import datetime
+import httpx
 import logging
 
 logger = logging.getLogger(__name__)
@@ -221,7 +223,7 @@ async def get_system_status_simple():
         elapsed = None
 
         try:
-            async with httpx.AsyncClient(timeout=3.0) as client:
+            async with httpx.AsyncClient(timeout=3.0, transport=TracingTransport()) as client:
                 # Try service-specific health paths first
                 health_paths = [
                     f"/{name.lower()}/health",  # e.g., /orchestrator/health
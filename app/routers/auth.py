@@ -4,8 +4,6 @@ Handles signup, login, logout for Full Potential Membership
 """
 from fastapi import APIRouter, Request, Form, Response
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
-from pathlib import Path
 import re
 
 from app.database import (
@@ -14,12 +12,14 @@ from app.database import (
     verify_password,
     create_session,
     delete_session,
-    verify_session
+    verify_session,
+    record_activity,
+    MEMBERSHIP_TIERS
 )
+from app.services.system_context import system_context
+from app.templating import templates
 
 router = APIRouter()
-templates_path = Path(__file__).parent.parent / "templates"
-templates = Jinja2Templates(directory=str(templates_path))
 
 
 def is_valid_email(email: str) -> bool:
@@ -61,7 +61,7 @@ async def signup_submit(
     if not full_name.strip():
         errors.append("Please enter your full name")
 
-    if tier not in ['seeker', 'builder', 'master']:
+    if tier not in MEMBERSHIP_TIERS:
         errors.append("Invalid membership tier")
 
     if errors:
@@ -89,6 +89,8 @@ async def signup_submit(
 
     # Create session
     token = create_session(user_id)
+    record_activity(user_id, 'signup')
+    system_context.invalidate()
 
     # Redirect to dashboard with session cookie
     response = RedirectResponse(url="/dashboard", status_code=303)
@@ -142,6 +144,7 @@ async def login_submit(
 
     # Create session
     token = create_session(user['id'])
+    record_activity(user['id'], 'login')
 
     # Redirect to dashboard
     response = RedirectResponse(url="/dashboard", status_code=303)
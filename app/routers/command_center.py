@@ -3,13 +3,19 @@ Command Center API - AI Operations Assistant
 Handles chat interactions and system commands
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
-import os
-from datetime import datetime
-import anthropic
-from ..database import get_db
+from typing import AsyncIterator, Literal, Optional, Dict, Any, Tuple
+from datetime import datetime, timedelta
+import json
+from ..database import get_db, count_active_streaks, active_user_rollup
+from ..middleware.rate_limit import client_ip
+from ..services.ai_client import ai_client, AIBusy, AIError
+from ..services.answer_cache import answer_cache, normalize_question
+from ..services.intents import intent_engine, DEFAULT_INTENT
+from ..services.lifecycle import lifecycle
+from ..services.system_context import system_context, SystemContext
 
 router = APIRouter()
 
@@ -20,31 +26,16 @@ class ChatResponse(BaseModel):
     response: str
     data: Optional[Dict[str, Any]] = None
 
-# Initialize Claude client
-anthropic_client = None
-if os.getenv("ANTHROPIC_API_KEY"):
-    anthropic_client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+# Context fields each answer path depends on (part of the answer cache key)
+PROMPT_FIELDS = ("member_count", "signups_today", "tier_counts", "deployment_status", "auto_deploy", "last_deploy")
+RULE_FIELDS = ("member_count", "signups_today", "deployment_status")
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat(msg: ChatMessage):
-    """
-    Chat with AI assistant about system operations
-    """
-    user_message = msg.message.lower()
-
-    # Get system context
-    system_context = await get_system_context()
-
-    # If Claude API is available, use it
-    if anthropic_client:
-        try:
-            response = anthropic_client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=1024,
-                system=f"""You are an AI operations assistant for Full Potential AI dashboard.
+def build_system_prompt(context: SystemContext) -> str:
+    """System prompt for the AI assistant"""
+    return f"""You are an AI operations assistant for Full Potential AI dashboard.
 
 Current system context:
-{system_context}
+{context.prompt_text()}
 
 You can answer questions about:
 - System status and health
@@ -53,29 +44,105 @@ You can answer questions about:
 - Recent activity
 - Technical operations
 
-Keep responses concise, helpful, and actionable. Use metrics from the system context when relevant.""",
-                messages=[{
-                    "role": "user",
-                    "content": user_message
-                }]
-            )
+Keep responses concise, helpful, and actionable. Use metrics from the system context when relevant."""
+
+def answer_key(user_message: str, context: SystemContext) -> tuple:
+    """Answer cache key: answer path, normalized question and the context it reads"""
+    if ai_client.available:
+        return ("ai", normalize_question(user_message), context.fingerprint(PROMPT_FIELDS))
+    return ("rules", normalize_question(user_message), context.fingerprint(RULE_FIELDS))
+
+@router.post("/chat", response_model=ChatResponse)
+async def chat(msg: ChatMessage, request: Request):
+    """
+    Chat with AI assistant about system operations
+    """
+    user_message = msg.message.lower()
+
+    # Get system context (cached for a few seconds)
+    context = system_context.get()
 
-            ai_response = response.content[0].text
+    # Repeat questions against unchanged stats are answered from cache
+    key = answer_key(user_message, context)
+    cached = answer_cache.get(key)
+    if cached:
+        return ChatResponse(**cached)
 
-        except Exception as e:
+    # If Claude API is available, use it
+    cacheable = True
+    if ai_client.available:
+        try:
+            ai_response = await ai_client.complete(build_system_prompt(context), user_message, client_ip(request.scope))
+            # Extract relevant data for dashboard updates
+            data = extract_response_data(user_message, context)
+        except AIBusy:
+            # No model slot in time: answer from the rules now rather than keep the user waiting
+            ai_response, data = answer_with_rules(user_message, context)
+            cacheable = False
+        except AIError as e:
             ai_response = f"AI service temporarily unavailable. Error: {str(e)}"
+            data = extract_response_data(user_message, context)
+            cacheable = False
     else:
         # Fallback: Rule-based responses
-        ai_response = get_rule_based_response(user_message, system_context)
+        ai_response, data = answer_with_rules(user_message, context)
 
-    # Extract relevant data for dashboard updates
-    data = extract_response_data(user_message, system_context)
+    if cacheable:
+        answer_cache.put(key, {"response": ai_response, "data": data})
 
     return ChatResponse(
         response=ai_response,
         data=data
     )
 
+def sse_event(event: str, payload: Dict[str, Any]) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+async def stream_chat(user_message: str, context: SystemContext, client: str = "anonymous") -> AsyncIterator[str]:
+    """Chat response as SSE: token events, then a done event carrying dashboard data"""
+    key = answer_key(user_message, context)
+    cached = answer_cache.get(key)
+    if cached:
+        yield sse_event("token", {"text": cached["response"]})
+        yield sse_event("done", {"data": cached["data"]})
+        return
+
+    if ai_client.available:
+        data = extract_response_data(user_message, context)
+        chunks = []
+        try:
+            async for text in ai_client.stream(build_system_prompt(context), user_message, client):
+                chunks.append(text)
+                yield sse_event("token", {"text": text})
+            answer_cache.put(key, {"response": "".join(chunks), "data": data})
+        except AIBusy:
+            # Raised before any token is sent
+            response, data = answer_with_rules(user_message, context)
+            yield sse_event("token", {"text": response})
+        except AIError as e:
+            yield sse_event("error", {"detail": f"AI service temporarily unavailable. Error: {str(e)}"})
+    else:
+        response, data = answer_with_rules(user_message, context)
+        answer_cache.put(key, {"response": response, "data": data})
+        yield sse_event("token", {"text": response})
+
+    yield sse_event("done", {"data": data})
+
+@router.post("/chat/stream")
+async def chat_stream(msg: ChatMessage, request: Request):
+    """
+    Chat with the AI assistant, streaming the answer as server-sent events
+    Events: `token` ({"text"}) as the answer is generated, `error` ({"detail"}), then `done` ({"data"})
+    """
+    user_message = msg.message.lower()
+
+    return StreamingResponse(
+        lifecycle.track(stream_chat(user_message, system_context.get(), client_ip(request.scope))),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/stats")
 async def get_stats():
     """
@@ -98,69 +165,51 @@ async def get_stats():
     return {
         "members": total_members,
         "signupsToday": signups_today,
-        "activeStreaks": 0,  # TODO: Implement streak tracking
+        "activeStreaks": count_active_streaks(),
         "deploymentStatus": "Active",
         "systemHealth": "100%",
         "uptime": "99.9%"
     }
 
-async def get_system_context() -> str:
-    """Build current system context for AI"""
-    conn = get_db()
-    cursor = conn.cursor()
-
-    # Get member count
-    cursor.execute("SELECT COUNT(*) FROM users")
-    member_count = cursor.fetchone()[0]
-
-    # Get recent signups
-    cursor.execute("SELECT COUNT(*) FROM users WHERE DATE(created_at) = DATE('now')")
-    signups_today = cursor.fetchone()[0]
-
-    # Get membership tiers
-    cursor.execute("SELECT membership_tier, COUNT(*) FROM users GROUP BY membership_tier")
-    tier_counts = cursor.fetchall()
-
-    conn.close()
-
-    context = f"""
-Total Members: {member_count}
-Signups Today: {signups_today}
-Membership Tiers: {dict(tier_counts)}
-Deployment Status: Active (Auto-deploy enabled via GitHub Actions)
-System Status: Online
-Auto-Deploy: Enabled
-Last Deploy: Recently (via GitHub Actions)
-"""
-
-    return context
-
-def get_rule_based_response(message: str, context: str) -> str:
-    """Fallback rule-based responses when AI API not available"""
-
-    # Extract stats from context
-    members_match = context.split("Total Members: ")[1].split("\n")[0] if "Total Members:" in context else "0"
-    signups_match = context.split("Signups Today: ")[1].split("\n")[0] if "Signups Today:" in context else "0"
-
-    # Deployment questions
-    if any(word in message for word in ['deploy', 'deployment', 'pushed', 'update']):
-        return f"✅ Auto-deployment is active! Every git push automatically deploys to the server via GitHub Actions. Latest deployment status: Active. System is running smoothly."
-
-    # Member questions
-    elif any(word in message for word in ['member', 'user', 'signup', 'customer']):
-        return f"👥 We currently have {members_match} total members. Today we've had {signups_match} new signups! The membership platform is live with 3 tiers: Seeker ($27), Builder ($47), and Master ($97)."
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Chat performance counters
+    Answer cache size and hit rate, model-call pool usage, queue depth and wait times, and context rebuilds
+    """
+    return {
+        "answer_cache": answer_cache.stats(),
+        "ai": ai_client.stats(),
+        "ai_queue": ai_client.scheduler.stats(),
+        "system_context": {"builds": system_context.builds, "ttl_seconds": system_context.ttl}
+    }
 
-    # System health questions
-    elif any(word in message for word in ['health', 'status', 'online', 'working']):
-        return f"🟢 All systems operational! Dashboard is online, database is connected, and auto-deploy is enabled. We have {members_match} active members and everything is running smoothly."
+@router.get("/activity")
+async def get_activity(
+    period: Literal["day", "week"] = "day",
+    days: int = Query(default=30, ge=1, le=366)
+):
+    """
+    Active-member rollups for the last N days
+    Counts distinct members with any activity (login, tool use, reflection) per day or week
+    """
+    end = datetime.utcnow().date()
+    start = end - timedelta(days=days - 1)
 
-    # What happened / activity questions
-    elif any(word in message for word in ['happen', 'activity', 'recent', 'latest']):
-        return f"📊 Recent activity: {signups_match} new signups today, auto-deploy system is active, and all services are running. The new conversion-focused homepage is live with the FREE Goal Setting Assistant."
+    return {
+        "period": period,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "series": active_user_rollup(start, end, period)
+    }
 
-    # Generic help
-    elif any(word in message for word in ['help', 'what can', 'how do']):
-        return """I can help you with:
+# Rule-based answers per intent (see app/services/intents.py for the keywords)
+RULE_RESPONSES = {
+    "deploy": lambda context: "✅ Auto-deployment is active! Every git push automatically deploys to the server via GitHub Actions. Latest deployment status: Active. System is running smoothly.",
+    "members": lambda context: f"👥 We currently have {context.member_count} total members. Today we've had {context.signups_today} new signups! The membership platform is live with 3 tiers: Seeker ($27), Builder ($47), and Master ($97).",
+    "health": lambda context: f"🟢 All systems operational! Dashboard is online, database is connected, and auto-deploy is enabled. We have {context.member_count} active members and everything is running smoothly.",
+    "activity": lambda context: f"📊 Recent activity: {context.signups_today} new signups today, auto-deploy system is active, and all services are running. The new conversion-focused homepage is live with the FREE Goal Setting Assistant.",
+    "help": lambda context: """I can help you with:
 
 🚀 Deployment status and history
 👥 Member statistics and signups
@@ -168,27 +217,27 @@ def get_rule_based_response(message: str, context: str) -> str:
 📊 Recent activity and events
 ⚡ Quick commands and operations
 
-Just ask me anything about the dashboard!"""
-
-    # Default response
-    else:
-        return f"I'm here to help! Current status: {members_match} members, {signups_match} signups today, all systems online. What would you like to know?"
+Just ask me anything about the dashboard!""",
+    DEFAULT_INTENT: lambda context: f"I'm here to help! Current status: {context.member_count} members, {context.signups_today} signups today, all systems online. What would you like to know?"
+}
 
-def extract_response_data(message: str, context: str) -> Optional[Dict[str, Any]]:
-    """Extract data for dashboard updates based on question"""
+# Dashboard fields refreshed by answers to each intent
+INTENT_DATA = {
+    "deploy": lambda context: {"deploymentStatus": context.deployment_status},
+    "members": lambda context: {"members": context.member_count, "signupsToday": context.signups_today},
+}
 
-    members_match = context.split("Total Members: ")[1].split("\n")[0] if "Total Members:" in context else "0"
-    signups_match = context.split("Signups Today: ")[1].split("\n")[0] if "Signups Today:" in context else "0"
+def answer_with_rules(message: str, context: SystemContext) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Rule-based answer and dashboard data from a single intent match"""
+    intent = intent_engine.match(message)
+    data = INTENT_DATA.get(intent)
+    return RULE_RESPONSES[intent](context), data(context) if data else None
 
-    if any(word in message for word in ['member', 'user', 'signup']):
-        return {
-            "members": int(members_match),
-            "signupsToday": int(signups_match)
-        }
-
-    if any(word in message for word in ['deploy']):
-        return {
-            "deploymentStatus": "Active"
-        }
+def get_rule_based_response(message: str, context: SystemContext) -> str:
+    """Fallback rule-based responses when AI API not available"""
+    return RULE_RESPONSES[intent_engine.match(message)](context)
 
-    return None
+def extract_response_data(message: str, context: SystemContext) -> Optional[Dict[str, Any]]:
+    """Extract data for dashboard updates based on question"""
+    data = INTENT_DATA.get(intent_engine.match(message))
+    return data(context) if data else None
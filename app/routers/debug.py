@@ -0,0 +1,172 @@
+"""
+Debug Endpoints
+In-process diagnostics for production: recent traces as waterfalls, JSON or OTLP/JSON,
+an on-demand sampling profiler, and tracemalloc snapshots with cache sizes
+Require ADMIN_SECRET, like the admin endpoints
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
+from html import escape
+from typing import List, Optional
+import asyncio
+
+from app.config import settings
+from app.diagnostics.memory import NotTracing, caches, memory_tracker
+from app.diagnostics.profiler import ProfilerBusy, profiler
+from app.diagnostics.tracing import Trace, to_otlp, tracer
+from app.routers.admin import require_admin
+
+router = APIRouter(prefix="/debug", dependencies=[Depends(require_admin)])
+
+SPAN_COLORS = {"server": "#6366f1", "client": "#f59e0b", "db": "#10b981", "template": "#ec4899"}
+
+
+def render_waterfall(trace: Trace) -> str:
+    """One trace as rows of offset/duration bars"""
+    data = trace.to_dict()
+    total = max(data["duration_ms"], 0.001)
+    depth = {}
+    rows = []
+    for span in data["spans"]:
+        depth[span["span_id"]] = depth.get(span["parent_id"], -1) + 1
+        left = span["offset_ms"] / total * 100
+        width = max(span["duration_ms"] / total * 100, 0.3)
+        detail = escape(", ".join(f"{k}={v}" for k, v in span["attributes"].items()))
+        error = f' <b style="color:#dc2626">{escape(span["error"])}</b>' if span["error"] else ""
+        rows.append(
+            f'<div class="row"><div class="label" style="padding-left:{depth[span["span_id"]] * 12}px" title="{detail}">'
+            f'{escape(span["name"])}{error}</div><div class="track"><div class="bar" style="left:{left:.2f}%;width:{width:.2f}%;'
+            f'background:{SPAN_COLORS.get(span["kind"], "#64748b")}"></div></div><div class="ms">{span["duration_ms"]:.1f} ms</div></div>'
+        )
+    dropped = f" ({data['dropped_spans']} spans dropped)" if data["dropped_spans"] else ""
+    return (
+        f'<section><h2>{escape(data["name"])} &mdash; {data["duration_ms"]:.1f} ms{dropped}</h2>'
+        f'<p class="id">{data["trace_id"]}</p>{"".join(rows)}</section>'
+    )
+
+
+def render_page(traces: List[Trace]) -> str:
+    body = "".join(render_waterfall(trace) for trace in traces) or "<p>No traces recorded yet.</p>"
+    return f"""<!DOCTYPE html>
+<html><head><title>Traces - {escape(settings.droplet_name)}</title><style>
+body {{ font: 13px system-ui, sans-serif; margin: 24px; color: #0f172a; }}
+h2 {{ font-size: 14px; margin: 24px 0 2px; }} .id {{ color: #64748b; margin: 0 0 8px; font-family: monospace; }}
+.row {{ display: flex; align-items: center; height: 20px; }}
+.label {{ width: 34%; overflow: hidden; white-space: nowrap; text-overflow: ellipsis; }}
+.track {{ position: relative; flex: 1; height: 12px; background: #f1f5f9; }}
+.bar {{ position: absolute; top: 0; bottom: 0; border-radius: 2px; }}
+.ms {{ width: 80px; text-align: right; font-family: monospace; }}
+</style></head><body><h1>Recent traces</h1>{body}</body></html>"""
+
+
+@router.get("/traces")
+async def list_traces(
+    format: str = Query(default="html", pattern="^(html|json|otlp)$"),
+    min_ms: float = Query(default=0.0, ge=0, description="Only traces at least this long"),
+    limit: int = Query(default=20, ge=1, le=500)
+):
+    """
+    Recent kept traces (sampled or slower than TRACE_SLOW_MS), newest first
+    format=html shows waterfalls; json lists spans with offsets; otlp is an OTLP/JSON export body
+    """
+    traces = tracer.recent(min_ms=min_ms, limit=limit)
+    if format == "json":
+        return {"tracer": tracer.stats(), "traces": [trace.to_dict() for trace in traces]}
+    if format == "otlp":
+        return JSONResponse(to_otlp(traces, settings.droplet_id))
+    return HTMLResponse(render_page(traces))
+
+
+@router.get("/traces/{trace_id}")
+async def get_trace(trace_id: str, format: str = Query(default="json", pattern="^(html|json)$")):
+    """One kept trace (IDs are sent in the X-Trace-Id response header)"""
+    trace = tracer.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found (not kept, or evicted)")
+    if format == "html":
+        return HTMLResponse(render_page([trace]))
+    return trace.to_dict()
+
+
+@router.get("/profile")
+async def profile(
+    seconds: float = Query(default=10.0, gt=0, le=60),
+    hz: int = Query(default=100, ge=1, le=1000, description="Samples per second"),
+    format: str = Query(default="text", pattern="^(text|collapsed|json)$"),
+    top: int = Query(default=20, ge=1, le=200),
+    idle: bool = Query(default=False, description="Keep samples of threads waiting in select/wait")
+):
+    """
+    Sample every thread's stack for `seconds` and report where time went
+    text shows top self/total tables; collapsed feeds flamegraph.pl or speedscope; json has both
+    """
+    try:
+        result = await asyncio.to_thread(profiler.run, seconds, hz, idle)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if format == "collapsed":
+        return PlainTextResponse(result.collapsed())
+    if format == "json":
+        return {**result.summary(top), "collapsed": result.collapsed()}
+    return PlainTextResponse(result.report(top))
+
+
+@router.get("/memory")
+async def memory_status():
+    """RSS, tracemalloc state, kept snapshots, and the size of every registered cache"""
+    # Off the event loop: the sessions count is a SQLite scan and gc.get_objects() walks the heap
+    status, sizes = await asyncio.gather(asyncio.to_thread(memory_tracker.status), asyncio.to_thread(caches.sizes))
+    return {**status, "caches": sizes}
+
+
+@router.post("/memory/start")
+async def start_memory_tracing(
+    frames: int = Query(default=1, ge=1, le=25, description="Stack depth per allocation"),
+    seconds: float = Query(default=900, gt=0, le=86400, description="Stop tracing automatically after this long")
+):
+    """Start tracemalloc; allocations are several times slower and use more memory until it stops"""
+    return await asyncio.to_thread(memory_tracker.start, frames, seconds)
+
+
+@router.post("/memory/stop")
+async def stop_memory_tracing():
+    """Stop tracemalloc and drop its traces and snapshots"""
+    return await asyncio.to_thread(memory_tracker.stop)
+
+
+@router.post("/memory/snapshots")
+async def take_memory_snapshot():
+    """Snapshot traced allocations; the last few are kept for diffing"""
+    try:
+        return await asyncio.to_thread(memory_tracker.snapshot)
+    except NotTracing as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/memory/snapshots/{snapshot_id}")
+async def memory_snapshot_top(
+    snapshot_id: int,
+    limit: int = Query(default=20, ge=1, le=500),
+    group_by: str = Query(default="lineno", pattern="^(lineno|filename)$")
+):
+    """Largest allocation sites in one snapshot"""
+    try:
+        return await asyncio.to_thread(memory_tracker.top, snapshot_id, limit, group_by)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Snapshot not found (never taken, or evicted)")
+
+
+@router.get("/memory/diff")
+async def memory_diff(
+    old: int = Query(..., alias="from", description="Earlier snapshot ID"),
+    new: Optional[int] = Query(default=None, alias="to", description="Later snapshot ID (default: latest)"),
+    limit: int = Query(default=20, ge=1, le=500),
+    group_by: str = Query(default="lineno", pattern="^(lineno|filename)$")
+):
+    """Allocation growth between two snapshots, grouped by file:line (or file), largest first"""
+    new = new if new is not None else memory_tracker.latest_id()
+    try:
+        stats = await asyncio.to_thread(memory_tracker.diff, old, new, limit, group_by)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Snapshot not found (never taken, or evicted)")
+    return {"from": old, "to": new, "stats": stats}
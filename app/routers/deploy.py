@@ -4,97 +4,104 @@ Just visit /deploy?secret=YOUR_SECRET to deploy
 """
 
 from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import JSONResponse
-import subprocess
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import AsyncIterator
+import json
 import os
 
+from app.services.deploy_jobs import deploy_runner, DeployJob
+from app.services.lifecycle import lifecycle
+
 router = APIRouter()
 
 # Set this in environment or use default
 DEPLOY_SECRET = os.getenv("DEPLOY_SECRET", "fpai-deploy-2025")
 
+def verify_secret(secret: str):
+    """Reject requests without the deploy secret"""
+    if secret != DEPLOY_SECRET:
+        raise HTTPException(status_code=403, detail="Invalid deploy secret")
+
+def get_job(job_id: str) -> DeployJob:
+    """Deploy job by ID, or 404 once it has left the history"""
+    job = deploy_runner.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Deploy job not found")
+    return job
+
 @router.post("/deploy")
 @router.get("/deploy")
 async def deploy_webhook(secret: str = Query(..., description="Deploy secret key")):
     """
     Webhook to deploy latest code
     Usage: curl http://your-server:8002/deploy?secret=YOUR_SECRET
+    Returns a job ID right away; follow the output at /deploy/jobs/{id}/log
     """
+    verify_secret(secret)
 
-    # Verify secret
-    if secret != DEPLOY_SECRET:
-        raise HTTPException(status_code=403, detail="Invalid deploy secret")
+    running = deploy_runner.current is not None and not deploy_runner.current.finished
+    job = deploy_runner.start()
 
-    try:
-        # Pull latest code
-        pull_result = subprocess.run(
-            ["git", "pull"],
-            cwd="/app",
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-
-        # Check if there were updates
-        pull_output = pull_result.stdout + pull_result.stderr
-        has_updates = "Already up to date" not in pull_output
-
-        if has_updates:
-            # Restart container from inside
-            # Note: This will cause a brief interruption
-            subprocess.Popen(
-                ["sh", "-c", "sleep 2 && kill -HUP 1"],
-                cwd="/app"
-            )
-
-            return JSONResponse({
-                "status": "success",
-                "message": "Deployed! Container restarting...",
-                "updates": True,
-                "output": pull_output[:500]  # First 500 chars
-            })
-        else:
-            return JSONResponse({
-                "status": "success",
-                "message": "Already up to date - no deployment needed",
-                "updates": False,
-                "output": pull_output
-            })
-
-    except subprocess.TimeoutExpired:
-        raise HTTPException(status_code=500, detail="Deploy timeout - git pull took too long")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Deploy failed: {str(e)}")
+    return JSONResponse({
+        "status": "running" if running else "started",
+        "message": "A deploy is already running" if running else "Deploy started",
+        "job_id": job.id,
+        "job_url": f"/deploy/jobs/{job.id}",
+        "log_url": f"/deploy/jobs/{job.id}/log"
+    }, status_code=202)
+
+
+@router.get("/deploy/jobs")
+async def list_deploy_jobs(secret: str = Query(..., description="Deploy secret key")):
+    """Recent deploy jobs, newest first"""
+    verify_secret(secret)
+    return {"jobs": [job.summary() for job in reversed(deploy_runner.jobs.values())]}
+
+
+@router.get("/deploy/jobs/{job_id}")
+async def get_deploy_job(job_id: str, secret: str = Query(..., description="Deploy secret key")):
+    """One deploy job with its output so far"""
+    verify_secret(secret)
+    job = get_job(job_id)
+    return {**job.summary(), "output": job.output}
+
+
+async def stream_job_log(job: DeployJob) -> AsyncIterator[str]:
+    """Job output as SSE: a `line` event per output line, then `done` with the job summary"""
+    async for line in job.follow():
+        yield f"event: line\ndata: {json.dumps({'text': line})}\n\n"
+    yield f"event: done\ndata: {json.dumps(job.summary())}\n\n"
+
+
+@router.get("/deploy/jobs/{job_id}/log")
+async def deploy_job_log(job_id: str, secret: str = Query(..., description="Deploy secret key")):
+    """
+    Stream a deploy job's output as server-sent events
+    Replays what was already written, then follows the job until it finishes
+    """
+    verify_secret(secret)
+    job = get_job(job_id)
+
+    return StreamingResponse(
+        lifecycle.track(stream_job_log(job)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.get("/deploy-status")
 async def deploy_status():
     """Check current deployment status"""
     try:
-        # Get current git commit
-        commit_result = subprocess.run(
-            ["git", "log", "-1", "--oneline"],
-            cwd="/app",
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-
-        # Get current branch
-        branch_result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            cwd="/app",
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-
-        return {
-            "current_commit": commit_result.stdout.strip(),
-            "current_branch": branch_result.stdout.strip(),
-            "deploy_url": f"/deploy?secret={DEPLOY_SECRET}",
-            "instructions": "GET or POST to /deploy?secret=YOUR_SECRET to deploy"
-        }
-
+        # Commit and branch are read once and again only after a deploy
+        git_info = await deploy_runner.git_info()
     except Exception as e:
         return {"error": str(e)}
+
+    latest = deploy_runner.latest()
+    return {
+        **git_info,
+        "last_job": latest.summary() if latest else None,
+        "deploy_url": f"/deploy?secret={DEPLOY_SECRET}",
+        "instructions": "GET or POST to /deploy?secret=YOUR_SECRET to deploy, then follow /deploy/jobs/{id}/log"
+    }
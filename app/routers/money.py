@@ -2,26 +2,42 @@
 Money/Treasury Dashboard Router
 Real-time financial tracking for Full Potential AI
 """
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
-from pathlib import Path
 from datetime import datetime
+from typing import Optional
 import json
+import os
+import time
 
-router = APIRouter()
+from app.models import LedgerEntryRequest
+from app.routers.admin import require_admin
+from app.services.projections import (
+    SCENARIOS,
+    PER_SESSION_MULTIPLIERS,
+    DEFAULT_MAX_CLIENTS,
+    project_scenarios,
+    sensitivity_grid
+)
+from app.services.session_index import session_index
+from app.services.treasury_ledger import TREASURY_FILE, LEDGER_KINDS, make_entry, treasury_ledger
+from app.templating import templates
 
-# Treasury data file (works in both local and production environments)
-import os
-TREASURY_FILE = Path(os.getenv("TREASURY_PATH", "/Users/jamessunheart/Development/docs/coordination/treasury.json"))
+router = APIRouter()
 
-# Templates
-templates_path = Path(__file__).parent.parent / "templates"
-templates = Jinja2Templates(directory=str(templates_path))
+# Profile sections whose per-category totals come from the ledger
+LEDGER_SECTIONS = {"cost": "costs", "revenue": "revenue"}
 
 
 class TreasuryTracker:
-    def __init__(self):
+    """
+    Treasury profile (rates, potentials, projections) plus the cost/revenue ledger
+    Both are reloaded when their files change, including edits made outside the process.
+    """
+
+    def __init__(self, ledger=treasury_ledger):
+        self.ledger = ledger
+        self.data_mtime = None
         self.load_data()
 
     def load_data(self):
@@ -29,6 +45,7 @@ class TreasuryTracker:
         if TREASURY_FILE.exists():
             with open(TREASURY_FILE) as f:
                 self.data = json.load(f)
+            self.data_mtime = os.stat(TREASURY_FILE).st_mtime_ns
         else:
             self.data = {
                 "initialized": datetime.now().isoformat(),
@@ -80,37 +97,65 @@ class TreasuryTracker:
             }
             self.save_data()
 
+        # Profile-derived figures don't change between reloads
+        self.potential_monthly = sum(rev.get('potential_monthly', 0) for rev in self.data['revenue'].values())
+        self.total_investment = sum(self.data['investments'].values())
+
+        # A new ledger opens with the totals recorded in the profile so far
+        self.ledger.initialize(self.opening_entries())
+        self.ledger.refresh()
+
+    def opening_entries(self):
+        """Ledger entries carrying over the profile's per-category totals"""
+        ts = self.data.get('initialized') or datetime.now().isoformat()
+        return [
+            make_entry(kind, category, info['total'], note="opening balance", ts=ts)
+            for kind, section in LEDGER_SECTIONS.items()
+            for category, info in self.data[section].items()
+            if info.get('total')
+        ]
+
     def save_data(self):
-        """Save treasury data"""
+        """Save treasury data atomically (write a temp file, then rename over the original)"""
         TREASURY_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(TREASURY_FILE, 'w') as f:
+        tmp_path = TREASURY_FILE.with_name(f".{TREASURY_FILE.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
             json.dump(self.data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, TREASURY_FILE)
+        self.data_mtime = os.stat(TREASURY_FILE).st_mtime_ns
+
+    def refresh(self):
+        """Reload the profile if its file changed and pick up new ledger entries"""
+        try:
+            mtime = os.stat(TREASURY_FILE).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self.data_mtime:
+            self.load_data()
+        self.ledger.refresh()
+
+    def section(self, kind: str):
+        """Profile categories for a ledger kind, with totals from the ledger"""
+        month = datetime.now().strftime('%Y-%m')
+        profile = self.data[LEDGER_SECTIONS[kind]]
+        categories = {}
+        for category in {**profile, **self.ledger.categories[kind]}:
+            categories[category] = {
+                **profile.get(category, {}),
+                'total': self.ledger.category_total(kind, category),
+                'this_month': self.ledger.category_total(kind, category, month)
+            }
+        return categories
 
     def scan_active_sessions(self):
-        """Scan coordination directory for active sessions"""
-        from pathlib import Path as P
-
-        # Use environment-specific path
-        coord_dir = P(os.getenv("COORD_DIR", "/Users/jamessunheart/Development/docs/coordination"))
-        sessions_dir = coord_dir / "sessions"
-
-        if not sessions_dir.exists():
-            return []
-
-        sessions = []
-        for session_file in sessions_dir.glob("*.json"):
-            try:
-                with open(session_file) as f:
-                    session = json.load(f)
-                    sessions.append({
-                        'id': session.get('session_id', session_file.stem),
-                        'work': session.get('current_work', 'unknown'),
-                        'status': session.get('status', 'active')
-                    })
-            except:
-                pass
-
-        return sessions
+        """Active sessions from the coordination directory (served from the session index)"""
+        return session_index.sessions()
+
+    def session_count(self, live_session_count: int) -> int:
+        """Live session count if available, otherwise the stored count"""
+        return live_session_count if live_session_count > 0 else self.data['costs']['claude_api']['sessions_run']
 
     def calculate_metrics(self):
         """Calculate financial metrics with real-time session tracking"""
@@ -118,27 +163,13 @@ class TreasuryTracker:
         active_sessions = self.scan_active_sessions()
         live_session_count = len(active_sessions)
 
-        # Use live session count if available, otherwise use stored count
-        claude_sessions = live_session_count if live_session_count > 0 else self.data['costs']['claude_api']['sessions_run']
+        claude_sessions = self.session_count(live_session_count)
         claude_cost = claude_sessions * self.data['costs']['claude_api']['per_session']
 
-        # Total costs
-        total_costs = sum(
-            cost.get('total', 0)
-            for cost in self.data['costs'].values()
-        )
-
-        # Total revenue
-        total_revenue = sum(
-            rev.get('total', 0)
-            for rev in self.data['revenue'].values()
-        )
-
-        # Potential monthly revenue
-        potential_monthly = sum(
-            rev.get('potential_monthly', 0)
-            for rev in self.data['revenue'].values()
-        )
+        # Running totals maintained by the ledger
+        total_costs = self.ledger.total('cost')
+        total_revenue = self.ledger.total('revenue')
+        potential_monthly = self.potential_monthly
 
         # Current burn rate
         monthly_burn = self.data['projections']['monthly_burn']
@@ -148,7 +179,7 @@ class TreasuryTracker:
         runway_months = treasury / monthly_burn if monthly_burn > 0 else float('inf')
 
         # ROI calculation
-        total_investment = sum(self.data['investments'].values())
+        total_investment = self.total_investment
         roi = ((total_revenue - total_costs) / total_investment * 100) if total_investment > 0 else 0
 
         return {
@@ -181,13 +212,80 @@ async def money_dashboard(request: Request):
 @router.get("/api/treasury")
 async def get_treasury():
     """Get treasury data API"""
+    tracker.refresh()
     metrics = tracker.calculate_metrics()
 
     return JSONResponse({
-        'costs': tracker.data['costs'],
-        'revenue': tracker.data['revenue'],
+        'costs': tracker.section('cost'),
+        'revenue': tracker.section('revenue'),
         'investments': tracker.data['investments'],
         'projections': tracker.data['projections'],
+        'monthly': tracker.ledger.months,
         'metrics': metrics,
         'timestamp': datetime.now().isoformat()
     })
+
+
+@router.post("/api/treasury/ledger", dependencies=[Depends(require_admin)])
+async def add_ledger_entry(entry: LedgerEntryRequest):
+    """Record a cost or revenue entry (append-only)"""
+    try:
+        recorded = tracker.ledger.append(entry.kind, entry.category, entry.amount, entry.note)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "status": "success",
+        "entry": recorded,
+        "totals": {kind: tracker.ledger.total(kind) for kind in LEDGER_KINDS}
+    }
+
+
+@router.get("/api/treasury/projections")
+async def get_projections(
+    horizon: int = Query(default=24, ge=1, le=120, description="Months to project"),
+    scenarios: str = Query(default=",".join(SCENARIOS), description="Comma-separated scenario names"),
+    sessions_per_month: Optional[float] = Query(default=None, ge=0),
+    start_balance: Optional[float] = Query(default=None),
+    per_session: Optional[list[float]] = Query(default=None, description="Per-session costs for the sensitivity grid"),
+    max_clients: int = Query(default=DEFAULT_MAX_CLIENTS, ge=1, le=1000)
+):
+    """Revenue, burn, balance and runway curves per scenario plus a cost x clients sensitivity grid"""
+    names = [name.strip() for name in scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown or not names:
+        raise HTTPException(status_code=400, detail=f"Unknown scenario(s): {', '.join(unknown) or '(none)'} - use {', '.join(SCENARIOS)}")
+    if per_session and (len(per_session) > 50 or min(per_session) < 0):
+        raise HTTPException(status_code=400, detail="per_session takes up to 50 non-negative costs")
+
+    started = time.perf_counter()
+    tracker.refresh()
+    claude = tracker.data['costs']['claude_api']
+    inputs = {
+        "potential_monthly": tracker.potential_monthly,
+        "monthly_burn": tracker.data['projections']['monthly_burn'],
+        "sessions_per_month": sessions_per_month if sessions_per_month is not None
+            else tracker.session_count(len(tracker.scan_active_sessions())),
+        "per_session": claude['per_session'],
+        "start_balance": start_balance if start_balance is not None else tracker.data.get('treasury_balance', 0)
+    }
+
+    projections = project_scenarios(names, horizon, **inputs)
+    grid = sensitivity_grid(
+        per_session or [claude['per_session'] * m for m in PER_SESSION_MULTIPLIERS],
+        range(0, max_clients + 1, max(1, max_clients // 10)),
+        # Same per-client assumption as breakeven_clients
+        revenue_per_client=tracker.potential_monthly / 10,
+        monthly_burn=inputs["monthly_burn"],
+        sessions_per_month=inputs["sessions_per_month"],
+        start_balance=inputs["start_balance"],
+        horizon=horizon
+    )
+
+    return {
+        "horizon": horizon,
+        "inputs": inputs,
+        "scenarios": projections,
+        "sensitivity": grid,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
@@ -0,0 +1,62 @@
+"""
+Member Progress API
+Incremental storage behind the goals, reflection and strengths tools
+"""
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional
+
+from app.database import record_activity
+from app.models import ProgressPatchOperation
+from app.routers.auth import get_current_user
+from app.services.progress_store import progress_store, PatchError
+
+router = APIRouter(prefix="/api/progress")
+
+
+def require_member(request: Request) -> dict:
+    """Get the logged-in member or fail with 401"""
+    user = get_current_user(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Login required")
+    return user
+
+
+@router.get("")
+async def read_progress(request: Request, since: Optional[int] = Query(default=None, ge=0)):
+    """
+    Get the member's tool progress
+    Pass the last seen `revision` as `since` to receive only sections changed after it.
+    """
+    user = require_member(request)
+    return progress_store.read(user["id"], since)
+
+
+@router.patch("")
+async def patch_progress(request: Request, operations: list[ProgressPatchOperation]):
+    """
+    Apply JSON-patch style operations to the member's progress
+    Paths start with the section: /goals, /reflection or /strengths.
+    Changes are buffered and written to the database in coalesced batches.
+    """
+    user = require_member(request)
+
+    ops = []
+    for operation in operations:
+        if operation.op != "remove" and "value" not in operation.model_fields_set:
+            raise HTTPException(status_code=400, detail=f"'{operation.op}' at '{operation.path}' requires a value")
+        ops.append(operation.model_dump())
+
+    try:
+        result = progress_store.apply(user["id"], ops)
+    except PatchError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    # Autosaves fire often; the activity log keeps one event per kind per day
+    # (SQLite write transactions, so off the event loop)
+    if "reflection" in result["changed"]:
+        await run_in_threadpool(record_activity, user["id"], "reflection", once_per_day=True)
+    if any(section != "reflection" for section in result["changed"]):
+        await run_in_threadpool(record_activity, user["id"], "tool_use", once_per_day=True)
+
+    return result
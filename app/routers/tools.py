@@ -3,23 +3,20 @@ AI Tools Router
 Member-only tools for personal growth
 """
 from fastapi import APIRouter, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
-from pathlib import Path
 
 from app.routers.auth import get_current_user
+from app.database import get_streak, count_activity
+from app.templating import templates
 
 router = APIRouter(prefix="/tools")
-templates_path = Path(__file__).parent.parent / "templates"
-templates = Jinja2Templates(directory=str(templates_path))
 
 
 def require_auth(request: Request):
     """Middleware to require authentication"""
-    user = get_current_user(request)
-    if not user:
-        return None
-    return user
+    # Viewing a tool is not activity; saving progress (PATCH /api/progress) is
+    return get_current_user(request)
 
 
 @router.get("/goals", response_class=HTMLResponse)
@@ -46,7 +43,9 @@ async def reflection_tool(request: Request):
     return templates.TemplateResponse("tool-reflection.html", {
         "request": request,
         "title": "Daily Reflection - Full Potential",
-        "user": user
+        "user": user,
+        "streak": await run_in_threadpool(get_streak, user['id']),
+        "reflection_count": await run_in_threadpool(count_activity, user['id'], 'reflection')
     })
 
 
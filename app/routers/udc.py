@@ -4,6 +4,7 @@ Implements Universal Droplet Contract
 Follows UDC_COMPLIANCE.md requirements
 """
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
 from datetime import datetime
 from app.models import (
     HealthResponse,
@@ -16,6 +17,7 @@ from app.models import (
 from app.config import settings
 from app.services.registry_client import registry_client
 from app.services.orchestrator_client import orchestrator_client
+from app.services.lifecycle import lifecycle
 import logging
 import time
 
@@ -39,6 +41,16 @@ async def health():
     )
 
 
+@router.get("/ready")
+async def ready():
+    """
+    Readiness for load balancers and graceful reloads
+    503 until caches are warm, and again once the worker starts draining
+    """
+    status_code = 200 if lifecycle.ready and not lifecycle.draining else 503
+    return JSONResponse(lifecycle.status(), status_code=status_code)
+
+
 @router.get("/capabilities", response_model=CapabilitiesResponse)
 async def capabilities():
     """
@@ -109,7 +121,7 @@ async def message(msg: MessageRequest):
     UDC-required message endpoint
     Receives inter-droplet messages
     """
-    logger.info(f"Received message from {msg.from_droplet}: {msg.message_type}")
+    logger.info("Received message from %s: %s", msg.from_droplet, msg.message_type)
 
     # Basic message handling (can be extended later)
     if msg.message_type == "ping":
@@ -120,7 +132,7 @@ async def message(msg: MessageRequest):
         )
 
     # Log other message types for now
-    logger.info(f"Message payload: {msg.payload}")
+    logger.debug("Message payload: %s", msg.payload)
 
     return MessageResponse(
         success=True,
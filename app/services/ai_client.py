@@ -0,0 +1,151 @@
+"""
+AI Client Service
+Async Anthropic client for the command center: streaming, per-request deadlines
+and a fair, bounded pool of concurrent model calls
+"""
+import asyncio
+import logging
+from typing import AsyncIterator, Optional
+
+import anthropic
+import httpx
+
+from app.config import settings
+from app.diagnostics.memory import caches
+from app.services.model_scheduler import ModelScheduler, SchedulerBusy
+
+logger = logging.getLogger(__name__)
+
+
+class AIError(Exception):
+    """The model call failed, timed out or could not get a slot in time"""
+
+
+class AIBusy(AIError):
+    """No model-call slot within the queue budget; nothing was sent to the model"""
+
+
+class AIClient:
+    """Anthropic messages API behind a concurrency limit and a per-request deadline"""
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: Optional[str] = None,
+        model: str = "claude-3-5-sonnet-20241022",
+        max_tokens: int = 1024,
+        timeout: float = 30.0,
+        max_concurrency: int = 4,
+        queue_timeout: float = 5.0,
+        http_client: Optional[httpx.AsyncClient] = None,
+        scheduler: Optional[ModelScheduler] = None
+    ):
+        self.model = model
+        self.max_tokens = max_tokens
+        self.timeout = timeout
+        self.scheduler = scheduler or ModelScheduler(max_concurrency, queue_timeout)
+        self.client = anthropic.AsyncAnthropic(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=timeout,
+            # The deadline covers the whole request; retries would only push past it
+            max_retries=0,
+            http_client=http_client
+        ) if api_key else None
+
+        self.in_flight = 0
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+
+    @property
+    def available(self) -> bool:
+        """True when an API key is configured"""
+        return self.client is not None
+
+    async def _acquire(self, client: str, deadline: float):
+        """Wait for a model-call slot within the queue budget and the request deadline"""
+        remaining = deadline - asyncio.get_running_loop().time()
+        try:
+            await self.scheduler.acquire(client, timeout=remaining)
+        except SchedulerBusy as e:
+            raise AIBusy(str(e))
+
+    async def complete(self, system: str, message: str, client: str = "anonymous") -> str:
+        """Full response text for one user message"""
+        text = []
+        async for chunk in self.stream(system, message, client):
+            text.append(chunk)
+        return "".join(text)
+
+    async def stream(self, system: str, message: str, client: str = "anonymous") -> AsyncIterator[str]:
+        """Yield response text as the model produces it; `client` gets a fair share of slots"""
+        if not self.client:
+            raise AIError("AI service is not configured")
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+
+        def remaining() -> float:
+            return max(deadline - loop.time(), 0)
+
+        await self._acquire(client, deadline)
+        self.in_flight += 1
+        self.calls += 1
+        try:
+            manager = self.client.messages.stream(
+                model=self.model,
+                max_tokens=self.max_tokens,
+                system=system,
+                messages=[{"role": "user", "content": message}]
+            )
+            # One deadline for the whole response, enforced on connect and while waiting for each chunk
+            stream = await asyncio.wait_for(manager.__aenter__(), remaining())
+            try:
+                chunks = stream.text_stream.__aiter__()
+                while True:
+                    try:
+                        text = await asyncio.wait_for(chunks.__anext__(), remaining())
+                    except StopAsyncIteration:
+                        break
+                    yield text
+            finally:
+                await manager.__aexit__(None, None, None)
+        except (asyncio.TimeoutError, anthropic.APITimeoutError):
+            self.timeouts += 1
+            logger.warning("AI request exceeded %ss", self.timeout)
+            raise AIError(f"AI response timed out after {self.timeout:g}s")
+        except anthropic.APIError as e:
+            self.errors += 1
+            logger.error("AI request failed: %s", e)
+            raise AIError(str(e))
+        finally:
+            self.in_flight -= 1
+            self.scheduler.release()
+
+    def stats(self) -> dict:
+        """Counters for metrics endpoints"""
+        return {
+            "available": self.available,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.scheduler.max_concurrency,
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts
+        }
+
+
+# Singleton instance
+ai_client = AIClient(
+    settings.anthropic_api_key,
+    base_url=settings.anthropic_base_url,
+    model=settings.ai_model,
+    max_tokens=settings.ai_max_tokens,
+    timeout=settings.ai_timeout,
+    max_concurrency=settings.ai_max_concurrency,
+    queue_timeout=settings.ai_queue_timeout
+)
+caches.register("ai_queue", lambda: {
+    "clients": len(ai_client.scheduler.queues),
+    "waiting": sum(len(queue) for queue in list(ai_client.scheduler.queues.values()))
+})
@@ -0,0 +1,86 @@
+"""
+Answer Cache Service
+Command center answers keyed by normalized question and a fingerprint of the context they used
+Bounded LRU with a TTL; changed stats change the fingerprint, so stale answers are never hit
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.diagnostics.memory import caches
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_question(message: str) -> str:
+    """Case, punctuation and spacing-insensitive form of a question"""
+    return _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", message.lower())).strip()
+
+
+class AnswerCache:
+    """LRU of answers with per-entry expiry and hit/miss counters"""
+
+    def __init__(self, max_entries: int = 512, ttl: float = 300.0):
+        # 0 disables caching
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: OrderedDict[tuple, tuple[float, Dict[str, Any]]] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """Cached answer for `key`, or None"""
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, answer = entry
+            if now >= expires:
+                del self.entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return answer
+
+    def put(self, key: tuple, answer: Dict[str, Any]):
+        """Store an answer, evicting the least recently used past the bound"""
+        if not self.max_entries:
+            return
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, answer)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached answer"""
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit rate for metrics"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+# Singleton instance
+answer_cache = AnswerCache(max_entries=settings.answer_cache_size, ttl=settings.answer_cache_ttl)
+caches.register("answer_cache", lambda: {"entries": len(answer_cache.entries), "max_entries": answer_cache.max_entries})
@@ -0,0 +1,248 @@
+"""
+Deploy Job Service
+Runs deploys as background jobs on asyncio subprocesses, one at a time
+Keeps a short history of jobs with their output and caches git metadata between deploys
+"""
+import asyncio
+import logging
+import os
+import signal
+import sys
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from app.config import settings
+from app.diagnostics.memory import caches
+from app.services.system_context import system_context
+
+logger = logging.getLogger(__name__)
+
+# Roll the workers onto the new code once it is pulled (see app/reload.py)
+RESTART_COMMAND = (sys.executable, "-m", "app.reload", "--delay", "2")
+
+# Seconds allowed for each git metadata read
+GIT_TIMEOUT = 5.0
+
+
+class DeployJob:
+    """One deploy: status, captured output and a wake-up for log followers"""
+
+    def __init__(self, max_lines: int = 1000):
+        self.id = uuid.uuid4().hex[:12]
+        self.status = "running"
+        self.started_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self.returncode: Optional[int] = None
+        self.updates: Optional[bool] = None
+        self.lines: List[str] = []
+        self.max_lines = max_lines
+        self.truncated = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def output(self) -> str:
+        return "\n".join(self.lines)
+
+    def append(self, line: str):
+        """Record one line of output and wake followers"""
+        if len(self.lines) < self.max_lines:
+            self.lines.append(line)
+        else:
+            self.truncated += 1
+        self._notify()
+
+    def finish(self, status: str, returncode: Optional[int] = None):
+        """Mark the job done and wake followers"""
+        self.status = status
+        self.returncode = returncode
+        self.finished_at = datetime.utcnow()
+        self._notify()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def follow(self) -> AsyncIterator[str]:
+        """Yield output lines from the start, then live until the job finishes"""
+        sent = 0
+        while True:
+            while sent < len(self.lines):
+                yield self.lines[sent]
+                sent += 1
+            if self.finished:
+                return
+            await self._changed.wait()
+
+    def summary(self) -> Dict[str, Any]:
+        """Job state without its output"""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "updates": self.updates,
+            "returncode": self.returncode,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "lines": len(self.lines) + self.truncated
+        }
+
+
+class DeployRunner:
+    """Starts deploy jobs, keeps the last few and serves cached git metadata"""
+
+    def __init__(
+        self,
+        repo_dir: str = "/app",
+        pull_command: Sequence[str] = ("git", "pull"),
+        restart_command: Optional[Sequence[str]] = RESTART_COMMAND,
+        timeout: float = 30.0,
+        history: int = 20
+    ):
+        self.repo_dir = repo_dir
+        self.pull_command = tuple(pull_command)
+        self.restart_command = tuple(restart_command) if restart_command else None
+        self.timeout = timeout
+        self.history = history
+        self.jobs: "OrderedDict[str, DeployJob]" = OrderedDict()
+        self.current: Optional[DeployJob] = None
+        self._git_info: Optional[Dict[str, str]] = None
+        self.git_reads = 0
+
+    def start(self) -> DeployJob:
+        """Start a deploy, or return the one already running"""
+        if self.current is not None and not self.current.finished:
+            return self.current
+
+        job = DeployJob()
+        self.jobs[job.id] = job
+        while len(self.jobs) > self.history:
+            self.jobs.popitem(last=False)
+        self.current = job
+        job.task = asyncio.create_task(self._run(job))
+        return job
+
+    def get(self, job_id: str) -> Optional[DeployJob]:
+        return self.jobs.get(job_id)
+
+    def latest(self) -> Optional[DeployJob]:
+        return next(reversed(self.jobs.values()), None)
+
+    async def _run(self, job: DeployJob):
+        """Pull, record the deploy and schedule the restart"""
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *self.pull_command,
+                cwd=self.repo_dir,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                # Own process group, so a timeout also kills helpers git spawned (ssh, credential helpers)
+                start_new_session=True
+            )
+        except OSError as e:
+            job.append(f"Deploy failed: {e}")
+            job.finish("failed")
+            return
+
+        try:
+            await asyncio.wait_for(self._read_output(proc, job), self.timeout)
+            returncode = await proc.wait()
+        except asyncio.TimeoutError:
+            self._kill(proc)
+            await proc.wait()
+            job.append(f"Deploy timeout - {' '.join(self.pull_command)} took longer than {self.timeout:g}s")
+            job.finish("failed", proc.returncode)
+            return
+        except asyncio.CancelledError:
+            self._kill(proc)
+            # Reap it even if cancelled again, so no zombie outlives the loop
+            await asyncio.shield(proc.wait())
+            job.finish("cancelled")
+            raise
+
+        # New code means new commit metadata, even if the restart is delayed
+        self._git_info = None
+        if returncode != 0:
+            job.finish("failed", returncode)
+            return
+
+        job.updates = "Already up to date" not in job.output
+        if job.updates:
+            system_context.record_deploy()
+            if self.restart_command:
+                job.append("Deployed! Reloading workers...")
+                # Own session: the reload outlives the worker it retires
+                await asyncio.create_subprocess_exec(*self.restart_command, cwd=self.repo_dir, start_new_session=True)
+        else:
+            job.append("Already up to date - no deployment needed")
+        logger.info("Deploy job %s finished (updates: %s)", job.id, job.updates)
+        job.finish("succeeded", returncode)
+
+    @staticmethod
+    def _kill(proc: asyncio.subprocess.Process):
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    async def _read_output(self, proc: asyncio.subprocess.Process, job: DeployJob):
+        """Copy process output into the job line by line"""
+        async for raw in proc.stdout:
+            job.append(raw.decode(errors="replace").rstrip())
+
+    async def _git(self, *args: str) -> str:
+        """Output of one git command; raises RuntimeError if it fails or times out"""
+        proc = await asyncio.create_subprocess_exec(
+            "git", *args,
+            cwd=self.repo_dir,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), GIT_TIMEOUT)
+        except asyncio.TimeoutError:
+            self._kill(proc)
+            await proc.wait()
+            raise RuntimeError(f"git {' '.join(args)} took longer than {GIT_TIMEOUT:g}s")
+        except asyncio.CancelledError:
+            self._kill(proc)
+            await asyncio.shield(proc.wait())
+            raise
+        if proc.returncode != 0:
+            raise RuntimeError(f"git {' '.join(args)} failed: {stderr.decode(errors='replace').strip()}")
+        return stdout.decode().strip()
+
+    async def git_info(self) -> Dict[str, str]:
+        """Current commit and branch, read once per deploy (failed reads aren't cached)"""
+        if self._git_info is None:
+            # Both reads run to completion, so neither git is left behind when the other fails
+            commit, branch = await asyncio.gather(
+                self._git("log", "-1", "--oneline"),
+                self._git("rev-parse", "--abbrev-ref", "HEAD"),
+                return_exceptions=True
+            )
+            self.git_reads += 1
+            for result in (commit, branch):
+                if isinstance(result, BaseException):
+                    raise result
+            self._git_info = {"current_commit": commit, "current_branch": branch}
+        return self._git_info
+
+
+# Singleton instance
+deploy_runner = DeployRunner(
+    repo_dir=settings.deploy_dir,
+    timeout=settings.deploy_timeout,
+    history=settings.deploy_history
+)
+caches.register("deploy_jobs", lambda: {
+    "jobs": len(deploy_runner.jobs),
+    "max_jobs": deploy_runner.history,
+    "log_lines": sum(len(job.lines) for job in list(deploy_runner.jobs.values()))
+})
@@ -0,0 +1,49 @@
+"""
+Intent Matching
+Declarative intent table for the command center assistant, compiled once into a single regex
+Keywords match at word starts ("member" matches "members", not "nonmember"); earlier intents win
+"""
+import re
+from typing import Iterable, Sequence, Tuple
+
+# (intent, keyword stems and phrases) in priority order
+COMMAND_INTENTS: Sequence[Tuple[str, Tuple[str, ...]]] = (
+    ("deploy", ("deploy", "pushed", "update")),
+    ("members", ("member", "user", "signup", "sign up", "customer")),
+    ("health", ("health", "status", "online", "working", "uptime")),
+    ("activity", ("happen", "activity", "recent", "latest")),
+    ("help", ("help", "what can", "how do")),
+)
+
+DEFAULT_INTENT = "general"
+
+
+class IntentEngine:
+    """All intents' keywords as one alternation with a named group per intent"""
+
+    def __init__(self, intents: Iterable[Tuple[str, Tuple[str, ...]]], default: str = DEFAULT_INTENT):
+        self.default = default
+        self.priority = {}
+        groups = []
+        for name, keywords in intents:
+            self.priority[name] = len(self.priority)
+            # Longest first so a phrase wins over its own prefix
+            alternatives = sorted((r"\s+".join(map(re.escape, k.lower().split())) for k in keywords), key=len, reverse=True)
+            groups.append(f"(?P<{name}>{'|'.join(alternatives)})")
+        # Messages are lowercased before matching; cheaper than a case-insensitive pattern
+        self.pattern = re.compile(rf"\b(?:{'|'.join(groups)})")
+
+    def match(self, message: str) -> str:
+        """Highest-priority intent mentioned in the message, or the default"""
+        best = None
+        for found in self.pattern.finditer(message.lower()):
+            rank = self.priority[found.lastgroup]
+            if rank == 0:
+                return found.lastgroup
+            if best is None or rank < self.priority[best]:
+                best = found.lastgroup
+        return best or self.default
+
+
+# Singleton instance
+intent_engine = IntentEngine(COMMAND_INTENTS)
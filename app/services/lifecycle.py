@@ -0,0 +1,91 @@
+"""
+Worker Lifecycle Service
+Readiness and draining for graceful reloads: a worker warms its caches before reporting ready,
+and stops reporting ready as soon as it starts draining
+"""
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Lifecycle:
+    """Warm-up, readiness and drain state of this worker process"""
+
+    def __init__(self, ready_dir: Optional[str] = None, warmup_timeout: float = 10.0):
+        self.ready_dir = Path(ready_dir) if ready_dir else None
+        self.warmup_timeout = warmup_timeout
+        self.ready = False
+        self.draining = False
+        self.warmup_seconds: Optional[float] = None
+        self.warm_errors: Dict[str, str] = {}
+        self.open_streams = 0
+
+    async def warm(self, steps: Dict[str, Callable[[], Awaitable]]):
+        """Run warm-up steps concurrently; failures and slow steps are logged, never fatal"""
+        started = time.perf_counter()
+
+        async def run(name: str, step: Callable[[], Awaitable]):
+            try:
+                await asyncio.wait_for(step(), self.warmup_timeout)
+            except asyncio.TimeoutError:
+                self.warm_errors[name] = f"timed out after {self.warmup_timeout:g}s"
+            except Exception as e:
+                self.warm_errors[name] = str(e)
+
+        await asyncio.gather(*(run(name, step) for name, step in steps.items()))
+        self.warmup_seconds = time.perf_counter() - started
+        for name, error in self.warm_errors.items():
+            logger.warning("Warm-up step %s failed: %s", name, error)
+        logger.info("Warmed %d/%d caches in %.0fms", len(steps) - len(self.warm_errors), len(steps), self.warmup_seconds * 1000)
+
+    def marker(self) -> Optional[Path]:
+        """Ready marker for this process (read by app.reload)"""
+        return self.ready_dir / str(os.getpid()) if self.ready_dir else None
+
+    def mark_ready(self):
+        """Report ready: serve /ready with 200 and drop a marker for the reloader"""
+        self.ready = True
+        marker = self.marker()
+        if marker:
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.touch()
+
+    def begin_drain(self):
+        """Stop reporting ready; in-flight requests and streams finish on their own"""
+        if self.draining:
+            return
+        self.draining = True
+        logger.info("Draining: %d open streams", self.open_streams)
+        marker = self.marker()
+        if marker:
+            marker.unlink(missing_ok=True)
+
+    async def track(self, stream: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Count a streaming response as open until it ends"""
+        self.open_streams += 1
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            self.open_streams -= 1
+
+    def status(self) -> dict:
+        """Readiness details for /ready"""
+        return {
+            "status": "draining" if self.draining else "ready" if self.ready else "starting",
+            "pid": os.getpid(),
+            "warmup_ms": round(self.warmup_seconds * 1000, 1) if self.warmup_seconds is not None else None,
+            "warm_errors": self.warm_errors,
+            "open_streams": self.open_streams
+        }
+
+
+# Singleton instance
+lifecycle = Lifecycle(ready_dir=settings.ready_dir, warmup_timeout=settings.warmup_timeout)
@@ -0,0 +1,119 @@
+"""
+Model Call Scheduler
+Global cap on concurrent model calls with per-client round-robin queuing
+Waiters that cannot get a slot within the queue budget are turned away so callers can fall back
+"""
+import asyncio
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional
+
+
+class SchedulerBusy(Exception):
+    """No model-call slot within the queue budget, or the client's queue is full"""
+
+
+class ModelScheduler:
+    """Grants slots in arrival order per client, rotating between clients"""
+
+    def __init__(self, max_concurrency: int = 4, queue_timeout: float = 5.0, max_queued_per_client: int = 8, window: int = 512):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.max_queued_per_client = max_queued_per_client
+        self.active = 0
+        # client -> its waiters; the client at the front is served next, then moved to the back
+        self.queues: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self.waits: Deque[float] = deque(maxlen=window)
+
+        self.granted = 0
+        self.timed_out = 0
+        self.rejected = 0
+        self.peak_queued = 0
+
+    @property
+    def queued(self) -> int:
+        """Waiters across all clients"""
+        return sum(len(waiters) for waiters in self.queues.values())
+
+    async def acquire(self, client: str, timeout: Optional[float] = None):
+        """Wait for a slot; raises SchedulerBusy past the queue budget (or `timeout`, if sooner)"""
+        if self.active < self.max_concurrency and not self.queues:
+            self.active += 1
+            self.granted += 1
+            self.waits.append(0.0)
+            return
+
+        waiters = self.queues.get(client)
+        if waiters is not None and len(waiters) >= self.max_queued_per_client:
+            self.rejected += 1
+            raise SchedulerBusy("Too many requests queued, please wait for earlier answers")
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self.queues.setdefault(client, deque()).append(waiter)
+        self.peak_queued = max(self.peak_queued, self.queued)
+        budget = self.queue_timeout if timeout is None else min(timeout, self.queue_timeout)
+        started = loop.time()
+
+        try:
+            await asyncio.wait_for(waiter, max(budget, 0))
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just as we gave up; hand the slot to the next waiter
+                self.release()
+            else:
+                self._discard(client, waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise SchedulerBusy("AI service is busy, please try again shortly") from None
+            raise
+        self.waits.append(loop.time() - started)
+
+    def release(self):
+        """Free a slot and grant it to the next client in turn"""
+        self.active -= 1
+        while self.active < self.max_concurrency and self.queues:
+            client, waiters = next(iter(self.queues.items()))
+            waiter = waiters.popleft()
+            if waiters:
+                self.queues.move_to_end(client)
+            else:
+                del self.queues[client]
+            if waiter.done():
+                continue
+            waiter.set_result(None)
+            self.active += 1
+            self.granted += 1
+
+    def _discard(self, client: str, waiter: asyncio.Future):
+        """Drop a waiter that gave up"""
+        waiters = self.queues.get(client)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(waiter)
+        except ValueError:
+            return
+        if not waiters:
+            del self.queues[client]
+
+    def stats(self) -> Dict[str, float]:
+        """Queue depth and recent wait times for metrics"""
+        waits = sorted(self.waits)
+
+        def percentile(p: float) -> float:
+            return round(waits[min(int(p * len(waits)), len(waits) - 1)] * 1000, 2) if waits else 0.0
+
+        return {
+            "active": self.active,
+            "max_concurrency": self.max_concurrency,
+            "queued": self.queued,
+            "queued_clients": len(self.queues),
+            "peak_queued": self.peak_queued,
+            "queue_timeout_seconds": self.queue_timeout,
+            "granted": self.granted,
+            "timed_out": self.timed_out,
+            "rejected": self.rejected,
+            "wait_ms_p50": percentile(0.5),
+            "wait_ms_p95": percentile(0.95),
+            "wait_ms_max": round(waits[-1] * 1000, 2) if waits else 0.0
+        }
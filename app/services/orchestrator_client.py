@@ -7,6 +7,7 @@ import httpx
 import logging
 from datetime import datetime
 from app.config import settings
+from app.diagnostics.tracing import TracingTransport
 from app.models import ServiceStatus
 
 logger = logging.getLogger(__name__)
@@ -22,7 +23,7 @@ class OrchestratorClient:
         """Check Orchestrator health status"""
         start_time = datetime.utcnow()
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with httpx.AsyncClient(timeout=5.0, transport=TracingTransport()) as client:
                 response = await client.get(f"{self.base_url}/orchestrator/health")
                 elapsed_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
 
@@ -44,7 +45,7 @@ class OrchestratorClient:
                         error=f"HTTP {response.status_code}"
                     )
         except Exception as e:
-            logger.error(f"Orchestrator health check failed: {e}")
+            logger.error("Orchestrator health check failed: %s", e)
             return ServiceStatus(
                 name="Orchestrator",
                 status="offline",
@@ -56,7 +57,7 @@ class OrchestratorClient:
     async def get_metrics(self) -> dict:
         """Get Orchestrator metrics (if available)"""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with httpx.AsyncClient(timeout=5.0, transport=TracingTransport()) as client:
                 response = await client.get(f"{self.base_url}/orchestrator/metrics")
 
                 if response.status_code == 200:
@@ -64,7 +65,7 @@ class OrchestratorClient:
                 else:
                     return {}
         except Exception as e:
-            logger.warning(f"Failed to fetch Orchestrator metrics: {e}")
+            logger.warning("Failed to fetch Orchestrator metrics: %s", e)
             return {}
 
 
@@ -0,0 +1,118 @@
+"""
+Page Cache Service
+Pre-renders static marketing pages to bytes with gzip/brotli variants and strong ETags
+Pages are rebuilt when a template file changes (if change checks are enabled)
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+from jinja2 import Environment
+
+from app.compression import compress_variants, negotiate
+
+logger = logging.getLogger(__name__)
+
+HTML_MEDIA_TYPE = "text/html; charset=utf-8"
+
+
+class RenderedPage:
+    """A page rendered once, with its encoded variants and ETags"""
+
+    def __init__(self, body: bytes):
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants: Dict[Optional[str], bytes] = {None: body, **compress_variants(body)}
+        # Each encoding is a distinct representation, so each gets its own strong ETag
+        self.etags: Dict[Optional[str], str] = {
+            encoding: f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+            for encoding in self.variants
+        }
+
+
+class PageCache:
+    """Pre-rendered pages whose only inputs are static context values"""
+
+    def __init__(self, env: Environment, templates_dir: Path, check_interval: Optional[float] = 2.0):
+        self.env = env
+        self.templates_dir = Path(templates_dir)
+        # None disables change checks (templates only change with a deploy)
+        self.check_interval = check_interval
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.rendered: Dict[str, RenderedPage] = {}
+        self.lock = threading.Lock()
+        self.templates_mtime = self._templates_mtime()
+        self.next_check = time.monotonic() + (check_interval or 0)
+        self.renders = 0
+
+    def register(self, template: str, **context: Any):
+        """Register a template and its (static) render context"""
+        self.pages[template] = context
+
+    def _templates_mtime(self) -> int:
+        """Newest modification time across the templates directory"""
+        with os.scandir(self.templates_dir) as entries:
+            return max((entry.stat().st_mtime_ns for entry in entries if entry.is_file()), default=0)
+
+    def _render(self, template: str) -> RenderedPage:
+        body = self.env.get_template(template).render(self.pages[template]).encode()
+        self.renders += 1
+        return RenderedPage(body)
+
+    def warm(self):
+        """Render every registered page (called at startup)"""
+        with self.lock:
+            self.rendered = {template: self._render(template) for template in self.pages}
+        logger.info("Pre-rendered %d pages", len(self.rendered))
+
+    def _check_for_changes(self):
+        """Drop rendered pages if any template changed (checked at most every check_interval)"""
+        if self.check_interval is None:
+            return
+        now = time.monotonic()
+        if now < self.next_check:
+            return
+        self.next_check = now + self.check_interval
+
+        mtime = self._templates_mtime()
+        if mtime != self.templates_mtime:
+            self.templates_mtime = mtime
+            with self.lock:
+                self.rendered = {}
+            logger.info("Templates changed - pre-rendered pages will be rebuilt")
+
+    def get(self, template: str) -> RenderedPage:
+        """Get a rendered page, rendering it if needed"""
+        self._check_for_changes()
+        page = self.rendered.get(template)
+        if page is None:
+            with self.lock:
+                page = self.rendered.get(template)
+                if page is None:
+                    page = self.rendered[template] = self._render(template)
+        return page
+
+    def response(self, request: Request, template: str) -> Response:
+        """Serve a pre-rendered page, honouring Accept-Encoding and If-None-Match"""
+        page = self.get(template)
+        encoding = negotiate(request.headers.get("accept-encoding"), page.variants)
+        etag = page.etags[encoding]
+
+        headers = {
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+            "Cache-Control": "public, max-age=0, must-revalidate"
+        }
+        if encoding:
+            headers["Content-Encoding"] = encoding
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+            return Response(status_code=304, headers=headers)
+
+        return Response(content=page.variants[encoding], media_type=HTML_MEDIA_TYPE, headers=headers)
@@ -0,0 +1,312 @@
+"""
+Progress Store Service
+Write-behind buffer for member tool progress (goals, reflection, strengths)
+Applies JSON-patch style updates in memory and coalesces them into periodic writes
+"""
+import asyncio
+import base64
+import copy
+import json
+import logging
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.diagnostics.memory import caches
+from app.database import get_progress, save_progress_columns
+
+logger = logging.getLogger(__name__)
+
+# API section name -> user_progress column
+SECTION_COLUMNS = {
+    "goals": "goal_data",
+    "reflection": "reflection_data",
+    "strengths": "strengths_data"
+}
+
+COMPRESSED_PREFIX = "zlib:"
+
+
+class PatchError(ValueError):
+    """Raised when a patch operation cannot be applied"""
+
+
+def encode_blob(value: Any) -> Optional[str]:
+    """Serialize a section for storage, compressing large blobs"""
+    if value is None:
+        return None
+    text = json.dumps(value, separators=(",", ":"))
+    if len(text) < settings.progress_compress_threshold:
+        return text
+    return COMPRESSED_PREFIX + base64.b64encode(zlib.compress(text.encode())).decode()
+
+
+def inflate_blob(blob: Optional[str]) -> Optional[str]:
+    """Return the plain JSON text of a stored blob"""
+    if blob and blob.startswith(COMPRESSED_PREFIX):
+        return zlib.decompress(base64.b64decode(blob[len(COMPRESSED_PREFIX):])).decode()
+    return blob
+
+
+def decode_blob(blob: Optional[str]) -> Any:
+    """Deserialize a stored section"""
+    text = inflate_blob(blob)
+    if not text:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        # Legacy free-text value
+        return text
+
+
+def parse_pointer(path: str) -> list[str]:
+    """Split a JSON pointer into unescaped tokens"""
+    if not path.startswith("/"):
+        raise PatchError(f"Invalid path '{path}'")
+    return [token.replace("~1", "/").replace("~0", "~") for token in path[1:].split("/")]
+
+
+def resolve_index(container: list, token: str, allow_end: bool) -> int:
+    """Resolve a list index token ('-' means append)"""
+    if allow_end and token == "-":
+        return len(container)
+    if not token.isdigit():
+        raise PatchError(f"Invalid array index '{token}'")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise PatchError(f"Array index {index} out of range")
+    return index
+
+
+def apply_operation(document: dict, operation: Dict[str, Any]):
+    """Apply one add/remove/replace/test operation to a document in place"""
+    op = operation["op"]
+    tokens = parse_pointer(operation["path"])
+    parent: Any = document
+    for token in tokens[:-1]:
+        if isinstance(parent, list):
+            parent = parent[resolve_index(parent, token, allow_end=False)]
+        elif isinstance(parent, dict) and token in parent:
+            parent = parent[token]
+        else:
+            raise PatchError(f"Path '{operation['path']}' does not exist")
+
+    key = tokens[-1]
+
+    if isinstance(parent, list):
+        index = resolve_index(parent, key, allow_end=(op == "add"))
+        if op == "add":
+            parent.insert(index, operation["value"])
+        elif op == "remove":
+            del parent[index]
+        elif op == "replace":
+            parent[index] = operation["value"]
+        elif parent[index] != operation["value"]:
+            raise PatchError(f"Test failed at '{operation['path']}'")
+        return
+
+    if not isinstance(parent, dict):
+        raise PatchError(f"Path '{operation['path']}' does not exist")
+
+    if op in ("remove", "replace", "test") and key not in parent:
+        raise PatchError(f"Path '{operation['path']}' does not exist")
+
+    if op in ("add", "replace"):
+        parent[key] = operation["value"]
+    elif op == "remove":
+        del parent[key]
+    elif parent[key] != operation["value"]:
+        raise PatchError(f"Test failed at '{operation['path']}'")
+
+
+class ProgressEntry:
+    """In-memory progress document for one user"""
+
+    def __init__(self, row: Optional[Dict[str, Any]]):
+        row = row or {}
+        self.revision: int = row.get("revision") or 0
+        # Revision of the stored row these edits build on; a write only lands over that revision
+        self.stored_revision = self.revision
+        self.sections: Dict[str, Any] = {
+            section: decode_blob(row.get(column))
+            for section, column in SECTION_COLUMNS.items()
+        }
+        # Revision at which each section last changed; loaded sections count
+        # as changed at the stored revision
+        self.section_revisions: Dict[str, int] = {section: self.revision for section in SECTION_COLUMNS}
+        self.dirty: set[str] = set()
+        self.last_access = time.monotonic()
+
+
+class ProgressStore:
+    """Per-user progress cache with coalesced write-behind persistence"""
+
+    def __init__(self):
+        self.entries: Dict[int, ProgressEntry] = {}
+        self.lock = threading.Lock()
+        # One flush at a time, so an older snapshot can never land after a newer one
+        self.flush_lock = threading.Lock()
+        self.writes = 0
+        self.patches = 0
+
+    def _entry(self, user_id: int) -> ProgressEntry:
+        """Get a user's entry, loading it from the database on first use"""
+        entry = self.entries.get(user_id)
+        if entry is None:
+            entry = ProgressEntry(get_progress(user_id))
+            self.entries[user_id] = entry
+        entry.last_access = time.monotonic()
+        return entry
+
+    def read(self, user_id: int, since: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Read a user's progress
+        With `since`, only sections changed after that revision are returned.
+        A `since` ahead of the server (e.g. after a lost write) returns everything.
+        """
+        with self.lock:
+            entry = self._entry(user_id)
+            full = since is None or since > entry.revision
+            sections = {
+                section: value
+                for section, value in entry.sections.items()
+                if full or entry.section_revisions[section] > since
+            }
+            return {"revision": entry.revision, "full": full, "sections": sections}
+
+    def apply(self, user_id: int, operations: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Apply patch operations atomically; returns the new revision and changed sections"""
+        operations = list(operations)
+        with self.lock:
+            entry = self._entry(user_id)
+
+            # Work on copies of the touched sections so a failing operation
+            # leaves the stored document untouched
+            working: Dict[str, Any] = {}
+            for operation in operations:
+                tokens = parse_pointer(operation["path"])
+                section = tokens[0]
+                if section not in SECTION_COLUMNS:
+                    raise PatchError(f"Unknown progress section '{section}'")
+                if section not in working:
+                    working[section] = copy.deepcopy(entry.sections[section])
+
+                if len(tokens) == 1:
+                    if operation["op"] in ("add", "replace"):
+                        working[section] = operation["value"]
+                    elif operation["op"] == "remove":
+                        working[section] = None
+                    elif working[section] != operation["value"]:
+                        raise PatchError(f"Test failed at '{operation['path']}'")
+                    continue
+
+                if working[section] is None and operation["op"] == "add":
+                    working[section] = {}
+                apply_operation(working, operation)
+
+            changed = [section for section, value in working.items() if value != entry.sections[section]]
+            if changed:
+                entry.revision += 1
+                for section in changed:
+                    entry.sections[section] = working[section]
+                    entry.section_revisions[section] = entry.revision
+                    entry.dirty.add(section)
+            self.patches += 1
+
+            return {"revision": entry.revision, "changed": changed}
+
+    def flush(self) -> int:
+        """
+        Persist all dirty sections; returns the number of users written
+        A user whose stored row changed underneath us (another worker during a reload, an admin
+        import) is not overwritten: the entry is dropped and reloaded on next use.
+        """
+        with self.flush_lock:
+            return self._flush()
+
+    def _flush(self) -> int:
+        now = datetime.utcnow().isoformat()
+        pending: list[tuple[int, ProgressEntry, int, Dict[str, Any]]] = []
+        flushed: list[tuple[ProgressEntry, str, int]] = []
+
+        with self.lock:
+            for user_id, entry in self.entries.items():
+                if entry.dirty:
+                    sections = {section: entry.sections[section] for section in entry.dirty}
+                    pending.append((user_id, entry, entry.revision, sections))
+                    flushed.extend((entry, section, entry.section_revisions[section]) for section in entry.dirty)
+
+        if not pending:
+            self._evict_idle()
+            return 0
+
+        # Encode and write outside the lock; sections are replaced, never
+        # mutated, so the captured values stay consistent
+        updates = [
+            (user_id, entry.stored_revision, revision, now,
+             {SECTION_COLUMNS[section]: encode_blob(value) for section, value in sections.items()})
+            for user_id, entry, revision, sections in pending
+        ]
+        conflicts = set(save_progress_columns(updates))
+
+        with self.lock:
+            for user_id, entry, revision, _ in pending:
+                if user_id in conflicts:
+                    if self.entries.get(user_id) is entry:
+                        del self.entries[user_id]
+                    logger.warning("Progress for user %d changed elsewhere; discarded %d unsaved sections",
+                                   user_id, len(entry.dirty))
+                else:
+                    entry.stored_revision = revision
+            for entry, section, revision in flushed:
+                # Keep sections that changed again while we were writing
+                if entry.section_revisions[section] == revision:
+                    entry.dirty.discard(section)
+
+        users = len(pending) - len(conflicts)
+        self.writes += users
+        self._evict_idle()
+        return users
+
+    def _evict_idle(self):
+        """Drop clean entries that have not been used recently"""
+        cutoff = time.monotonic() - settings.progress_idle_eviction
+        with self.lock:
+            for user_id in [
+                user_id for user_id, entry in self.entries.items()
+                if not entry.dirty and entry.last_access < cutoff
+            ]:
+                del self.entries[user_id]
+
+    def invalidate(self):
+        """Forget clean entries (after progress is written outside the store)"""
+        with self.lock:
+            for user_id in [user_id for user_id, entry in self.entries.items() if not entry.dirty]:
+                del self.entries[user_id]
+
+    async def run_flush_loop(self):
+        """Background task that flushes coalesced updates periodically"""
+        while True:
+            try:
+                await asyncio.sleep(settings.progress_flush_interval)
+                written = await run_in_threadpool(self.flush)
+                if written:
+                    logger.debug("Flushed progress for %d users", written)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Progress flush error: %s", e)
+
+
+# Singleton instance
+progress_store = ProgressStore()
+caches.register("progress_store", lambda: {
+    "entries": len(progress_store.entries),
+    "dirty": sum(1 for entry in list(progress_store.entries.values()) if entry.dirty)
+})
@@ -0,0 +1,99 @@
+"""
+Treasury Projections
+Month-by-month revenue, burn, balance and runway curves for several scenarios,
+plus a per-session cost x client count sensitivity grid, computed with NumPy arrays
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# capture: share of potential monthly revenue eventually reached
+# ramp_months: months to reach ~63% of that share
+# session_growth: monthly growth in AI sessions run
+SCENARIOS = {
+    "conservative": {"capture": 0.25, "ramp_months": 9.0, "session_growth": 0.05},
+    "expected": {"capture": 0.5, "ramp_months": 6.0, "session_growth": 0.03},
+    "aggressive": {"capture": 0.9, "ramp_months": 3.0, "session_growth": 0.02},
+}
+
+# Default sensitivity axes: multiples of the current per-session cost, and client counts
+PER_SESSION_MULTIPLIERS = (0.5, 0.75, 1.0, 1.5, 2.0)
+DEFAULT_MAX_CLIENTS = 20
+
+
+def series(values: np.ndarray) -> list:
+    """Compact JSON-ready values: rounded to cents, None where undefined (inf/nan)"""
+    rounded = np.round(values.astype(float), 2)
+    return np.where(np.isfinite(rounded), rounded, None).tolist()
+
+
+def first_month(mask: np.ndarray) -> List[Optional[int]]:
+    """Per row, the 1-based month where `mask` first holds, or None"""
+    hit = mask.any(axis=1)
+    months = mask.argmax(axis=1) + 1
+    return [int(month) if found else None for month, found in zip(months, hit)]
+
+
+def project_scenarios(
+    names: Sequence[str],
+    horizon: int,
+    potential_monthly: float,
+    monthly_burn: float,
+    sessions_per_month: float,
+    per_session: float,
+    start_balance: float
+) -> Dict[str, dict]:
+    """Curves for each named scenario over `horizon` months, all scenarios computed at once"""
+    params = np.array([[SCENARIOS[name][key] for key in ("capture", "ramp_months", "session_growth")] for name in names])
+    capture, ramp, growth = (params[:, i, None] for i in range(3))
+    months = np.arange(1, horizon + 1)[None, :]
+
+    revenue = potential_monthly * capture * (1 - np.exp(-months / ramp))
+    burn = monthly_burn + sessions_per_month * per_session * (1 + growth) ** (months - 1)
+    net = revenue - burn
+    balance = start_balance + np.cumsum(net, axis=1)
+    # Months of current burn the balance covers at each point
+    runway = np.maximum(balance, 0) / burn
+
+    runs_out = first_month(balance < 0)
+    breakeven = first_month(net >= 0)
+
+    return {
+        name: {
+            "revenue": series(revenue[i]),
+            "burn": series(burn[i]),
+            "balance": series(balance[i]),
+            "runway": series(runway[i]),
+            # Full months funded before the balance goes negative (None: not within the horizon)
+            "runway_months": runs_out[i] - 1 if runs_out[i] else None,
+            "breakeven_month": breakeven[i]
+        }
+        for i, name in enumerate(names)
+    }
+
+
+def sensitivity_grid(
+    per_session_costs: Sequence[float],
+    client_counts: Sequence[int],
+    revenue_per_client: float,
+    monthly_burn: float,
+    sessions_per_month: float,
+    start_balance: float,
+    horizon: int
+) -> dict:
+    """Monthly net, balance at the horizon and runway for every (per-session cost, clients) pair"""
+    costs = np.asarray(per_session_costs, dtype=float)[:, None]
+    clients = np.asarray(client_counts, dtype=float)[None, :]
+
+    net = clients * revenue_per_client - (monthly_burn + sessions_per_month * costs)
+    horizon_balance = start_balance + horizon * net
+    with np.errstate(divide="ignore"):
+        runway = np.where(net < 0, np.maximum(start_balance, 0) / -net, np.inf)
+
+    return {
+        "per_session": series(costs[:, 0]),
+        "clients": [int(c) for c in client_counts],
+        "monthly_net": [series(row) for row in net],
+        "horizon_balance": [series(row) for row in horizon_balance],
+        "runway_months": [series(row) for row in runway]
+    }
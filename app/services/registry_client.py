@@ -8,6 +8,8 @@ import logging
 from typing import Optional
 from datetime import datetime, timedelta
 from app.config import settings
+from app.diagnostics.memory import caches
+from app.diagnostics.tracing import TracingTransport
 from app.models import ServiceStatus, RegistrationPayload
 
 logger = logging.getLogger(__name__)
@@ -25,7 +27,7 @@ class RegistryClient:
         """Check Registry health status"""
         start_time = datetime.utcnow()
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with httpx.AsyncClient(timeout=5.0, transport=TracingTransport()) as client:
                 response = await client.get(f"{self.base_url}/health")
                 elapsed_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
 
@@ -47,7 +49,7 @@ class RegistryClient:
                         error=f"HTTP {response.status_code}"
                     )
         except Exception as e:
-            logger.error(f"Registry health check failed: {e}")
+            logger.error("Registry health check failed: %s", e)
             return ServiceStatus(
                 name="Registry",
                 status="offline",
@@ -67,34 +69,34 @@ class RegistryClient:
                 status="active"
             )
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with httpx.AsyncClient(timeout=10.0, transport=TracingTransport()) as client:
                 response = await client.post(
                     f"{self.base_url}/droplets/register",
                     json=payload.model_dump()
                 )
 
                 if response.status_code in [200, 201]:
-                    logger.info(f"Successfully registered with Registry")
+                    logger.info("Successfully registered with Registry")
                     return True
                 else:
-                    logger.error(f"Registration failed: HTTP {response.status_code}")
+                    logger.error("Registration failed: HTTP %s", response.status_code)
                     return False
 
         except Exception as e:
-            logger.error(f"Registration error: {e}")
+            logger.error("Registration error: %s", e)
             return False
 
     async def send_heartbeat(self) -> bool:
         """Send heartbeat to Registry"""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with httpx.AsyncClient(timeout=5.0, transport=TracingTransport()) as client:
                 response = await client.post(
                     f"{self.base_url}/droplets/heartbeat",
                     json={"droplet_id": settings.droplet_id, "status": "active"}
                 )
                 return response.status_code == 200
         except Exception as e:
-            logger.warning(f"Heartbeat failed: {e}")
+            logger.warning("Heartbeat failed: %s", e)
             return False
 
     async def get_droplets(self) -> list[dict]:
@@ -104,7 +106,7 @@ class RegistryClient:
             return self.cache.get("droplets", [])
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with httpx.AsyncClient(timeout=5.0, transport=TracingTransport()) as client:
                 response = await client.get(f"{self.base_url}/droplets")
 
                 if response.status_code == 200:
@@ -114,14 +116,15 @@ class RegistryClient:
                     self.cache_timestamp = datetime.utcnow()
                     return droplets
                 else:
-                    logger.warning(f"Failed to fetch droplets: HTTP {response.status_code}")
+                    logger.warning("Failed to fetch droplets: HTTP %s", response.status_code)
                     return self.cache.get("droplets", [])
 
         except Exception as e:
-            logger.error(f"Error fetching droplets: {e}")
+            logger.error("Error fetching droplets: %s", e)
             # Return cached data if available
             return self.cache.get("droplets", [])
 
 
 # Singleton instance
 registry_client = RegistryClient()
+caches.register("registry_client", lambda: {"keys": len(registry_client.cache), "droplets": len(registry_client.cache.get("droplets", []))})
@@ -0,0 +1,132 @@
+"""
+Session Index Service
+Parsed coordination session files, cached by (path, mtime, size)
+Kept current by a file watcher (or periodic stat sweeps) so reads never touch disk
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.config import settings
+from app.diagnostics.memory import caches
+
+try:
+    from watchfiles import awatch
+except ImportError:
+    awatch = None
+
+logger = logging.getLogger(__name__)
+
+COORD_DIR = Path(os.getenv("COORD_DIR", "/Users/jamessunheart/Development/docs/coordination"))
+
+
+def parse_session(path: str) -> Optional[Dict[str, Any]]:
+    """Summarize one session file, or None if it can't be read"""
+    try:
+        with open(path) as f:
+            session = json.load(f)
+        return {
+            'id': session.get('session_id', Path(path).stem),
+            'work': session.get('current_work', 'unknown'),
+            'status': session.get('status', 'active')
+        }
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class SessionIndex:
+    """Session summaries for every *.json file in a sessions directory"""
+
+    def __init__(self, sessions_dir: Path, sweep_interval: float = 5.0):
+        self.sessions_dir = Path(sessions_dir)
+        self.sweep_interval = sweep_interval
+        # path -> (mtime_ns, size, parsed session or None)
+        self.entries: Dict[str, tuple] = {}
+        self.lock = threading.Lock()
+        self.snapshot: List[Dict[str, Any]] = []
+        self.last_sweep = 0.0
+        self.watching = False
+        self.parses = 0
+
+    def _update(self, path: str) -> bool:
+        """Re-stat one file and re-parse it if it changed; returns True on change"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return self.entries.pop(path, None) is not None
+
+        cached = self.entries.get(path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return False
+
+        self.parses += 1
+        self.entries[path] = (stat.st_mtime_ns, stat.st_size, parse_session(path))
+        return True
+
+    def _rebuild_snapshot(self):
+        self.snapshot = [
+            session for _, (_, _, session) in sorted(self.entries.items()) if session is not None
+        ]
+
+    def sweep(self) -> int:
+        """Stat every session file, re-parsing only changed ones; returns the change count"""
+        with self.lock:
+            try:
+                with os.scandir(self.sessions_dir) as entries:
+                    paths = {entry.path for entry in entries if entry.name.endswith(".json") and entry.is_file()}
+            except OSError:
+                paths = set()
+
+            changes = sum(self._update(path) for path in paths)
+            for path in [path for path in self.entries if path not in paths]:
+                del self.entries[path]
+                changes += 1
+
+            if changes:
+                self._rebuild_snapshot()
+            self.last_sweep = time.monotonic()
+        return changes
+
+    def apply_changes(self, paths: Iterable[str]) -> int:
+        """Refresh just the given paths (from the file watcher)"""
+        with self.lock:
+            changes = sum(self._update(path) for path in paths if path.endswith(".json"))
+            if changes:
+                self._rebuild_snapshot()
+        return changes
+
+    def sessions(self) -> List[Dict[str, Any]]:
+        """Current session summaries"""
+        # Without a watcher, fall back to a sweep once the last one is stale
+        if not self.watching and time.monotonic() - self.last_sweep >= self.sweep_interval:
+            self.sweep()
+        return self.snapshot
+
+    async def run(self):
+        """Background task keeping the index current"""
+        while True:
+            await asyncio.to_thread(self.sweep)
+            if awatch is None or not self.sessions_dir.is_dir():
+                await asyncio.sleep(self.sweep_interval)
+                continue
+
+            try:
+                self.watching = True
+                logger.info("Watching %s for session changes", self.sessions_dir)
+                async for changes in awatch(self.sessions_dir, recursive=False):
+                    await asyncio.to_thread(self.apply_changes, [path for _, path in changes])
+            except Exception as e:
+                logger.warning("Session watcher stopped (%s) - falling back to stat sweeps", e)
+            finally:
+                self.watching = False
+            await asyncio.sleep(self.sweep_interval)
+
+
+# Singleton instance
+session_index = SessionIndex(COORD_DIR / "sessions", sweep_interval=settings.session_sweep_interval)
+caches.register("session_index", lambda: {"entries": len(session_index.entries), "snapshot": len(session_index.snapshot)})
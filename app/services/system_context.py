@@ -0,0 +1,135 @@
+"""
+System Context Service
+Membership and deployment facts for the command center assistant, cached with a short TTL
+Invalidated on signups, member imports and deploys
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from pydantic import BaseModel, PrivateAttr
+
+from app.config import settings
+from app.diagnostics.memory import caches
+from app.database import get_db
+
+
+class SystemContext(BaseModel):
+    """Snapshot of what the assistant knows about the system"""
+    member_count: int
+    signups_today: int
+    tier_counts: Dict[str, int]
+    deployment_status: str = "Active"
+    auto_deploy: bool = True
+    last_deploy: Optional[str] = None
+    built_at: datetime
+
+    _prompt: Optional[str] = PrivateAttr(default=None)
+    _fingerprints: Dict[Tuple[str, ...], str] = PrivateAttr(default_factory=dict)
+
+    def fingerprint(self, fields: Tuple[str, ...]) -> str:
+        """Short hash of the given fields' values (memoized per snapshot)"""
+        digest = self._fingerprints.get(fields)
+        if digest is None:
+            values = json.dumps([getattr(self, field) for field in fields], sort_keys=True, default=str)
+            digest = self._fingerprints[fields] = hashlib.sha256(values.encode()).hexdigest()[:16]
+        return digest
+
+    def prompt_text(self) -> str:
+        """Context as prompt text for the AI path (rendered once per snapshot)"""
+        if self._prompt is None:
+            self._prompt = f"""
+Total Members: {self.member_count}
+Signups Today: {self.signups_today}
+Membership Tiers: {self.tier_counts}
+Deployment Status: {self.deployment_status} (Auto-deploy enabled via GitHub Actions)
+System Status: Online
+Auto-Deploy: {"Enabled" if self.auto_deploy else "Disabled"}
+Last Deploy: {self.last_deploy or "Recently (via GitHub Actions)"}
+"""
+        return self._prompt
+
+
+class SystemContextCache:
+    """Builds SystemContext from the database at most once per TTL"""
+
+    def __init__(self, ttl: float = 10.0, deploy_file: Optional[Path] = None):
+        self.ttl = ttl
+        # The deploying worker is retired right after; workers replacing it read the time from here
+        self.deploy_file = Path(deploy_file) if deploy_file else None
+        self.lock = threading.Lock()
+        self.context: Optional[SystemContext] = None
+        self.expires = 0.0
+        self.last_deploy: Optional[str] = None
+        self.builds = 0
+
+    def _build(self) -> SystemContext:
+        conn = get_db()
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT COUNT(*) FROM users")
+        member_count = cursor.fetchone()[0]
+
+        cursor.execute("SELECT COUNT(*) FROM users WHERE DATE(created_at) = DATE('now')")
+        signups_today = cursor.fetchone()[0]
+
+        cursor.execute("SELECT membership_tier, COUNT(*) FROM users GROUP BY membership_tier")
+        tier_counts = dict(cursor.fetchall())
+
+        conn.close()
+        self.builds += 1
+
+        return SystemContext(
+            member_count=member_count,
+            signups_today=signups_today,
+            tier_counts=tier_counts,
+            last_deploy=self._read_last_deploy(),
+            built_at=datetime.utcnow()
+        )
+
+    def get(self) -> SystemContext:
+        """Current context, rebuilt when expired or invalidated"""
+        context = self.context
+        if context is not None and time.monotonic() < self.expires:
+            return context
+
+        with self.lock:
+            if self.context is None or time.monotonic() >= self.expires:
+                self.context = self._build()
+                self.expires = time.monotonic() + self.ttl
+            return self.context
+
+    def invalidate(self):
+        """Drop the cached context (members or deployment changed)"""
+        with self.lock:
+            self.context = None
+
+    def _read_last_deploy(self) -> Optional[str]:
+        if self.deploy_file is None:
+            return self.last_deploy
+        try:
+            return self.deploy_file.read_text().strip() or None
+        except OSError:
+            return self.last_deploy
+
+    def record_deploy(self):
+        """Note a deploy (for this and later workers) and drop the cached context"""
+        self.last_deploy = datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
+        if self.deploy_file is not None:
+            temp = self.deploy_file.with_name(f"{self.deploy_file.name}.{os.getpid()}.tmp")
+            try:
+                temp.write_text(self.last_deploy)
+                os.replace(temp, self.deploy_file)
+            except OSError:
+                pass
+        self.invalidate()
+
+
+# Singleton instance
+system_context = SystemContextCache(ttl=settings.system_context_ttl, deploy_file=settings.last_deploy_file)
+caches.register("system_context", lambda: {"cached": system_context.context is not None, "builds": system_context.builds})
@@ -0,0 +1,185 @@
+"""
+Treasury Ledger Service
+Append-only JSONL ledger of cost and revenue entries with running aggregates
+Appends are single O_APPEND writes; other writers' appends are picked up incrementally
+"""
+import json
+import logging
+import math
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from app.diagnostics.memory import caches
+
+logger = logging.getLogger(__name__)
+
+# Treasury profile (rates, potentials, projections) and the ledger beside it
+TREASURY_FILE = Path(os.getenv("TREASURY_PATH", "/Users/jamessunheart/Development/docs/coordination/treasury.json"))
+LEDGER_FILE = Path(os.getenv("TREASURY_LEDGER_PATH", str(TREASURY_FILE.with_suffix(".ledger.jsonl"))))
+
+LEDGER_KINDS = ("cost", "revenue")
+
+
+def make_entry(kind: str, category: str, amount: float, note: Optional[str] = None, ts: Optional[str] = None) -> Dict[str, Any]:
+    """Validate and build a ledger entry"""
+    if kind not in LEDGER_KINDS:
+        raise ValueError(f"Unknown ledger kind '{kind}'")
+    if not category:
+        raise ValueError("category is required")
+    amount = float(amount)
+    if not math.isfinite(amount):
+        raise ValueError("amount must be a finite number")
+
+    entry = {"ts": ts or datetime.now().isoformat(), "kind": kind, "category": category, "amount": amount}
+    if note:
+        entry["note"] = note
+    return entry
+
+
+class TreasuryLedger:
+    """Ledger file plus totals per kind, category and month, updated as entries are read"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        # (device, inode, size read up to, mtime) of the file as last read
+        self.file_id: Optional[tuple] = None
+        self.offset = 0
+        self.mtime_ns = 0
+        # Last line read (ending at offset); if it no longer sits there, the file was rewritten
+        self.last_line = b""
+        self.entries = 0
+        self.skipped = 0
+        self.totals: Dict[str, float] = {kind: 0.0 for kind in LEDGER_KINDS}
+        # kind -> category -> total
+        self.categories: Dict[str, Dict[str, float]] = {kind: {} for kind in LEDGER_KINDS}
+        # month (YYYY-MM) -> kind -> total
+        self.months: Dict[str, Dict[str, float]] = {}
+        # (kind, category, month) -> total
+        self.category_months: Dict[tuple, float] = {}
+
+    def _apply(self, entry: Dict[str, Any]):
+        kind, category, amount = entry["kind"], entry["category"], float(entry["amount"])
+        if kind not in LEDGER_KINDS:
+            raise ValueError(f"Unknown ledger kind '{kind}'")
+        month = entry["ts"][:7]
+
+        self.totals[kind] += amount
+        self.categories[kind][category] = self.categories[kind].get(category, 0.0) + amount
+        month_totals = self.months.setdefault(month, {k: 0.0 for k in LEDGER_KINDS})
+        month_totals[kind] += amount
+        key = (kind, category, month)
+        self.category_months[key] = self.category_months.get(key, 0.0) + amount
+        self.entries += 1
+
+    def _refresh_locked(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            if self.file_id:
+                self._reset()
+            return
+
+        file_id = (stat.st_dev, stat.st_ino)
+        if stat.st_size == self.offset and stat.st_mtime_ns == self.mtime_ns and file_id == self.file_id:
+            return
+        with open(self.path, "rb") as f:
+            # Anything but growth of the same file (replaced, truncated, edited in place) is a full reload
+            if file_id != self.file_id or stat.st_size <= self.offset or not self._read_up_to_intact(f):
+                if self.file_id:
+                    logger.info("Treasury ledger %s was rewritten - reloading", self.path)
+                self._reset()
+                self.file_id = file_id
+            f.seek(self.offset)
+            chunk = f.read(stat.st_size - self.offset)
+
+        # A trailing partial line is an append still in progress; read it next time
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                self._apply(json.loads(line))
+            except (ValueError, KeyError, TypeError) as e:
+                self.skipped += 1
+                logger.warning("Skipping bad treasury ledger line: %s", e)
+
+        if end:
+            self.last_line = chunk[chunk.rfind(b"\n", 0, end - 1) + 1:end]
+        self.offset += end
+        self.mtime_ns = stat.st_mtime_ns
+
+    def _read_up_to_intact(self, f) -> bool:
+        """Whether the line last read still ends at the read offset (a rewrite that grew the file moves it)"""
+        if not self.last_line:
+            return True
+        f.seek(self.offset - len(self.last_line))
+        return f.read(len(self.last_line)) == self.last_line
+
+    def refresh(self):
+        """Pick up entries appended (or a file replaced) since the last read"""
+        with self.lock:
+            self._refresh_locked()
+
+    def append(self, kind: str, category: str, amount: float, note: Optional[str] = None) -> Dict[str, Any]:
+        """Durably append one entry and fold it into the aggregates"""
+        entry = make_entry(kind, category, amount, note)
+        line = (json.dumps(entry, separators=(",", ":")) + "\n").encode()
+
+        with self.lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # One write on an O_APPEND descriptor: concurrent writers never interleave lines
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self._refresh_locked()
+        return entry
+
+    def initialize(self, entries: Iterable[Dict[str, Any]]):
+        """Create the ledger with opening entries if it doesn't exist yet"""
+        with self.lock:
+            if self.path.exists():
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            # Link rather than rename: another worker may have created it meanwhile
+            try:
+                os.link(tmp_path, self.path)
+            except FileExistsError:
+                pass
+            finally:
+                os.unlink(tmp_path)
+            self._refresh_locked()
+
+    def total(self, kind: str) -> float:
+        """Total of all entries of a kind"""
+        return self.totals[kind]
+
+    def category_total(self, kind: str, category: str, month: Optional[str] = None) -> float:
+        """Total for one category, optionally limited to a month (YYYY-MM)"""
+        if month:
+            return self.category_months.get((kind, category, month), 0.0)
+        return self.categories[kind].get(category, 0.0)
+
+
+# Singleton instance
+treasury_ledger = TreasuryLedger(LEDGER_FILE)
+caches.register("treasury_ledger", lambda: {
+    "entries": treasury_ledger.entries,
+    "months": len(treasury_ledger.months),
+    "category_months": len(treasury_ledger.category_months)
+})
@@ -0,0 +1,103 @@
+"""
+Static File Serving
+StaticFiles that serves pre-compressed .br/.gz siblings generated once at startup,
+and fingerprinted asset URLs with immutable caching
+"""
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+from pathlib import Path
+from typing import Optional
+import anyio
+import logging
+import mimetypes
+import os
+
+from app.assets import AssetManifest, IMMUTABLE_CACHE_CONTROL
+from app.compression import available_encodings, compress, negotiate
+
+logger = logging.getLogger(__name__)
+
+# Extensions worth compressing (images and fonts are already compressed)
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".svg", ".html", ".json", ".txt", ".map", ".xml"}
+
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """Static files with compressed variants built once instead of per request"""
+
+    def __init__(self, *, directory: str, manifest: Optional[AssetManifest] = None, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self.manifest = manifest
+        # relative path -> encodings with an up-to-date sibling file
+        self.variants: dict[str, tuple[str, ...]] = {}
+        self.precompress(Path(directory))
+
+    def precompress(self, root: Path):
+        """Write .br/.gz siblings for compressible files that lack a fresh one"""
+        for source in root.rglob("*"):
+            if not source.is_file() or source.suffix not in COMPRESSIBLE_EXTENSIONS:
+                continue
+
+            relative = os.path.normpath(source.relative_to(root))
+            source_stat = source.stat()
+            encodings = []
+            for encoding in available_encodings():
+                target = source.with_name(source.name + ENCODING_SUFFIXES[encoding])
+                try:
+                    if not target.exists() or target.stat().st_mtime < source_stat.st_mtime:
+                        body = source.read_bytes()
+                        encoded = compress(body, encoding)
+                        if len(encoded) >= len(body):
+                            continue
+                        target.write_bytes(encoded)
+                    encodings.append(encoding)
+                except OSError as e:
+                    # Read-only deployments still work, just uncompressed
+                    logger.warning("Could not precompress %s (%s): %s", relative, encoding, e)
+
+            if encodings:
+                self.variants[relative] = tuple(encodings)
+
+        logger.info("Precompressed variants ready for %d static files", len(self.variants))
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        # Fingerprinted URLs name one exact version of the file, so browsers
+        # may cache them forever without revalidating
+        logical = self.manifest.resolve(path) if self.manifest else None
+        if logical is None:
+            return await self.serve(path, scope)
+
+        response = await self.serve(logical, scope)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+    async def serve(self, path: str, scope: Scope) -> Response:
+        """Serve a file, preferring a pre-compressed sibling the client accepts"""
+        encodings = self.variants.get(path)
+        if not encodings or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate(request_headers.get("accept-encoding"), encodings)
+        if encoding:
+            full_path, stat_result = await anyio.to_thread.run_sync(
+                self.lookup_path, path + ENCODING_SUFFIXES[encoding]
+            )
+            if stat_result:
+                response = FileResponse(
+                    full_path,
+                    stat_result=stat_result,
+                    method=scope["method"],
+                    media_type=mimetypes.guess_type(path)[0] or "application/octet-stream",
+                    headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+                )
+                if self.is_not_modified(response.headers, request_headers):
+                    return NotModifiedResponse(response.headers)
+                return response
+
+        response = await super().get_response(path, scope)
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
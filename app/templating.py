@@ -0,0 +1,66 @@
+"""
+Shared Template Environment
+One Jinja2 environment for the whole app, so each template is parsed and compiled once
+Compiled bytecode persists on disk across workers and restarts
+"""
+from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache, Template
+from pathlib import Path
+import logging
+import time
+
+from app.assets import asset_manifest
+from app.config import settings
+from app.diagnostics.memory import caches
+from app.diagnostics.tracing import tracer
+from app.fragments import FragmentCacheExtension
+
+logger = logging.getLogger(__name__)
+
+
+class TracedTemplate(Template):
+    """Template recording a span per render while a request is traced"""
+
+    def render(self, *args, **kwargs) -> str:
+        with tracer.span(f"render {self.name}", "template"):
+            return super().render(*args, **kwargs)
+
+
+templates_path = Path(__file__).parent / "templates"
+if settings.template_cache_dir:
+    Path(settings.template_cache_dir).mkdir(mode=0o700, parents=True, exist_ok=True)
+    bytecode_cache = FileSystemBytecodeCache(settings.template_cache_dir)
+else:
+    # Jinja's own per-user temp directory: created 0700 and refused if another user owns it,
+    # so nobody else can plant compiled bytecode for us to load
+    bytecode_cache = FileSystemBytecodeCache()
+
+templates = Jinja2Templates(
+    directory=str(templates_path),
+    bytecode_cache=bytecode_cache,
+    # Re-checking template mtimes on every render is only worth it while editing
+    auto_reload=settings.debug,
+    cache_size=-1,
+    extensions=[FragmentCacheExtension]
+)
+
+templates.env.template_class = TracedTemplate
+
+# Per-tier markup rendered once by {% fragment %} blocks
+fragment_cache = templates.env.fragment_cache
+fragment_cache.max_entries = settings.fragment_cache_size
+caches.register("fragment_cache", lambda: {"entries": len(fragment_cache.entries), "max_entries": fragment_cache.max_entries})
+caches.register("jinja_templates", lambda: {"loaded": len(templates.env.cache or ())})
+
+# {{ asset_url('css/style.css') }} -> /static/css/style.<hash>.css
+templates.env.globals["asset_url"] = asset_manifest.url
+
+
+def precompile_templates() -> int:
+    """Compile every template into the shared environment (called at startup)"""
+    started = time.perf_counter()
+    names = templates.env.list_templates(extensions=["html"])
+    for name in names:
+        templates.env.get_template(name)
+    logger.info("Precompiled %d templates in %.0fms", len(names), (time.perf_counter() - started) * 1000)
+    return len(names)
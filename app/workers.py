@@ -0,0 +1,39 @@
+"""
+Gunicorn Worker
+Uvicorn worker that stops reporting ready as soon as it is told to exit,
+then gives in-flight requests and streams DRAIN_TIMEOUT seconds to finish
+"""
+import sys
+
+from gunicorn.arbiter import Arbiter
+from uvicorn.main import Server
+from uvicorn.workers import UvicornWorker
+
+# The gunicorn master imports this module and builds workers before forking them,
+# so app modules are imported lazily, inside the worker, after it has loaded the app.
+# Otherwise every reloaded worker would inherit the master's stale copies.
+
+
+class DrainingServer(Server):
+    """Uvicorn server that marks the worker as draining when asked to exit"""
+
+    def handle_exit(self, sig, frame):
+        from app.services.lifecycle import lifecycle
+
+        lifecycle.begin_drain()
+        super().handle_exit(sig, frame)
+
+
+class GracefulUvicornWorker(UvicornWorker):
+    """UvicornWorker with draining and a bounded graceful shutdown"""
+
+    async def _serve(self) -> None:
+        from app.config import settings
+
+        self.config.app = self.wsgi
+        self.config.timeout_graceful_shutdown = settings.drain_timeout
+        server = DrainingServer(config=self.config)
+        self._install_sigquit_handler()
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
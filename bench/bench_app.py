@@ -0,0 +1,130 @@
+"""
+Dashboard Load Benchmark
+Drives the status, droplet, state and auth routes in-process at fixed concurrency against
+local Registry/Orchestrator stubs and a throwaway database; reports req/s, p50 and p99
+Run from the repo root: python -m bench.bench_app [--requests 100] [--concurrency 10]
+    [--droplets 10] [--latency-ms 5] [--failure-rate 0] [--save-baseline FILE | --baseline FILE]
+"""
+import argparse
+import asyncio
+import logging
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import httpx
+
+from bench.harness import compare, print_table, run_load, save
+from bench.stubs import StubServer, create_orchestrator_stub, create_registry_stub
+
+SCENARIOS = ("system_status", "system_status_simple", "droplets", "state", "login_dashboard")
+
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "bench-password"
+
+
+def isolate(data_dir: Path, registry_url: str, orchestrator_url: str):
+    """Point the app at throwaway data and the stubs (before it is imported)"""
+    os.environ.update({
+        "MEMBERSHIP_DB_PATH": str(data_dir / "membership.db"),
+        "TREASURY_PATH": str(data_dir / "treasury.json"),
+        "TREASURY_LEDGER_PATH": str(data_dir / "treasury.ledger.jsonl"),
+        "COORD_DIR": str(data_dir / "coordination"),
+        "REGISTRY_URL": registry_url,
+        "ORCHESTRATOR_URL": orchestrator_url,
+        "RATE_LIMIT_ENABLED": "false",
+        "ANTHROPIC_API_KEY": "",
+    })
+
+
+def expect(response: httpx.Response, status: int = 200):
+    """Error label for an unexpected status, else None"""
+    return None if response.status_code == status else f"HTTP {response.status_code}"
+
+
+def operations(http: httpx.AsyncClient) -> dict:
+    async def get(path: str):
+        return expect(await http.get(path))
+
+    async def login_dashboard(n: int):
+        login = await http.post("/login", data={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+        token = login.cookies.get("session_token")
+        if not token:
+            return f"login HTTP {login.status_code}"
+        return expect(await http.get("/dashboard", headers={"Cookie": f"session_token={token}"}))
+
+    return {
+        "system_status": lambda n: get("/api/system/status"),
+        "system_status_simple": lambda n: get("/api/system-status"),
+        "droplets": lambda n: get("/api/droplets"),
+        "state": lambda n: get("/state"),
+        "login_dashboard": login_dashboard,
+    }
+
+
+async def run_scenarios(app, names, requests: int, concurrency: int) -> dict:
+    # Cookies are passed per request; a shared jar would mix the workers' sessions
+    jar = CookieJar(DefaultCookiePolicy(allowed_domains=[]))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", cookies=jar) as http:
+        ops = operations(http)
+        summaries = {}
+        for name in names:
+            # One untimed request first, so imports and first-use caches don't skew the numbers
+            await ops[name](0)
+            result = await run_load(name, ops[name], requests, concurrency)
+            summaries[name] = result.summary()
+        return summaries
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--droplets", type=int, default=10, help="Droplets listed by the Registry stub")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Stub response latency")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of stub responses that are 503s")
+    parser.add_argument("--baseline", type=Path, help="Fail on regression against this saved run")
+    parser.add_argument("--save-baseline", type=Path, help="Save this run as a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed throughput drop / p99 rise (fraction)")
+    args = parser.parse_args()
+    names = [name for name in args.scenarios.split(",") if name]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    latency = args.latency_ms / 1000
+    orchestrator = create_orchestrator_stub(latency=latency, failure_rate=args.failure_rate)
+    with tempfile.TemporaryDirectory(prefix="fpai-bench-") as data_dir, StubServer(orchestrator) as orchestrator_server:
+        registry = create_registry_stub(args.droplets, latency, args.failure_rate, droplet_endpoint=orchestrator_server.url)
+        with StubServer(registry) as registry_server:
+            isolate(Path(data_dir), registry_server.url, orchestrator_server.url)
+
+            from app.database import create_user
+            from app.main import app
+            create_user(BENCH_EMAIL, BENCH_PASSWORD, "Bench User")
+            # Injected upstream failures would otherwise flood the report with error logs
+            logging.getLogger().setLevel(logging.CRITICAL)
+
+            print(f"{args.requests} requests per scenario, concurrency {args.concurrency}, {args.droplets} droplets, "
+                  f"{args.latency_ms:g} ms stub latency, {args.failure_rate:.0%} stub failures")
+            summaries = asyncio.run(run_scenarios(app, names, args.requests, args.concurrency))
+
+    print_table(summaries)
+    if args.save_baseline:
+        save(summaries, args.save_baseline)
+    if args.baseline:
+        regressions = compare(summaries, args.baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Auth Write-Contention Benchmark
+Mixed signup, login, dashboard and logout traffic from several worker processes sharing one
+throwaway SQLite database, like gunicorn workers do; reports write transactions/sec,
+"database is locked" errors and per-operation latency
+Run from the repo root: python -m bench.bench_auth [--workers 4] [--requests 300] [--concurrency 4]
+    [--mix signup=1,login=3,dashboard=5,logout=1] [--save-baseline FILE | --baseline FILE]
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+from bench.harness import compare, percentile, print_table, save
+
+# Committed transactions per successful operation (see app/routers/auth.py)
+WRITE_TRANSACTIONS = {
+    "signup": 3,     # create_user, create_session, record_activity
+    "login": 2,      # create_session (insert + last_login update), record_activity
+    "dashboard": 0,  # verify_session only
+    "logout": 1,     # delete_session
+}
+
+SEED_USERS = 50
+PASSWORD = "bench-password"
+LOCKED = "database is locked"
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in WRITE_TRANSACTIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation: {name}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+async def drive(worker: int, requests: int, concurrency: int, mix: Dict[str, int], seed: int) -> dict:
+    """One worker's share of the traffic: latencies and errors per operation"""
+    from app.main import app
+    logging.getLogger().setLevel(logging.WARNING)
+
+    rng = random.Random(seed + worker)
+    names, weights = list(mix), list(mix.values())
+    tokens: List[str] = []
+    latencies: Dict[str, List[float]] = {name: [] for name in WRITE_TRANSACTIONS}
+    errors: Dict[str, Dict[str, int]] = {name: {} for name in WRITE_TRANSACTIONS}
+    counter = iter(range(requests))
+
+    jar = CookieJar(DefaultCookiePolicy(allowed_domains=[]))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", cookies=jar) as http:
+
+        async def login(n: int):
+            email = f"seed{rng.randrange(SEED_USERS)}@example.com"
+            response = await http.post("/login", data={"email": email, "password": PASSWORD})
+            return response, response.cookies.get("session_token")
+
+        async def signup(n: int):
+            data = {"email": f"w{worker}-{n}@example.com", "password": PASSWORD, "full_name": "Bench", "tier": "seeker"}
+            response = await http.post("/signup", data=data)
+            return response, response.cookies.get("session_token")
+
+        async def dashboard(n: int):
+            token = rng.choice(tokens) if tokens else ""
+            return await http.get("/dashboard", headers={"Cookie": f"session_token={token}"}), None
+
+        async def logout(n: int):
+            token = tokens.pop(rng.randrange(len(tokens))) if tokens else ""
+            return await http.get("/logout", headers={"Cookie": f"session_token={token}"}), None
+
+        operations = {"signup": signup, "login": login, "dashboard": dashboard, "logout": logout}
+        expected = {"signup": 303, "login": 303, "dashboard": 200, "logout": 303}
+
+        async def client():
+            for n in counter:
+                name = rng.choices(names, weights)[0]
+                if name in ("dashboard", "logout") and not tokens:
+                    name = "login"
+                started = time.perf_counter()
+                error = None
+                try:
+                    response, token = await operations[name](n)
+                    if token:
+                        tokens.append(token)
+                    if response.status_code != expected[name]:
+                        error = f"HTTP {response.status_code}"
+                except Exception as e:
+                    error = LOCKED if LOCKED in str(e) else type(e).__name__
+                latencies[name].append(time.perf_counter() - started)
+                if error:
+                    errors[name][error] = errors[name].get(error, 0) + 1
+
+        started = time.time()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+    return {"latencies": latencies, "errors": errors, "started": started, "finished": time.time()}
+
+
+def worker_main(args: tuple) -> dict:
+    worker, requests, concurrency, mix, seed, start_at = args
+    # Start together so the workers actually contend
+    time.sleep(max(start_at - time.time(), 0))
+    return asyncio.run(drive(worker, requests, concurrency, mix, seed))
+
+
+def summarize(results: List[dict], elapsed: float) -> Dict[str, dict]:
+    """Per-operation summaries plus a total row with write transactions/sec"""
+    summaries = {}
+    total_writes = 0
+    locked = 0
+    for name, writes in WRITE_TRANSACTIONS.items():
+        latencies = sorted(l for r in results for l in r["latencies"][name])
+        errors: Dict[str, int] = {}
+        for r in results:
+            for label, count in r["errors"][name].items():
+                errors[label] = errors.get(label, 0) + count
+        failed = sum(errors.values())
+        total_writes += (len(latencies) - failed) * writes
+        locked += errors.get(LOCKED, 0)
+        summaries[name] = {
+            "requests": len(latencies),
+            "errors": failed,
+            "locked": errors.get(LOCKED, 0),
+            "rps": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p90_ms": round(percentile(latencies, 0.90) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        }
+    summaries["writes"] = {
+        "requests": sum(s["requests"] for s in summaries.values()),
+        "errors": sum(s["errors"] for s in summaries.values()),
+        "locked": locked,
+        # Committed write transactions per second; compared like req/s
+        "rps": round(total_writes / elapsed, 1),
+        "p50_ms": 0.0,
+        "p99_ms": 0.0,
+    }
+    return summaries
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="Processes sharing the database")
+    parser.add_argument("--requests", type=int, default=300, help="Operations per worker")
+    parser.add_argument("--concurrency", type=int, default=4, help="Clients per worker")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("signup=1,login=3,dashboard=5,logout=1"))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", type=Path, help="Fail on regression against this saved run")
+    parser.add_argument("--save-baseline", type=Path, help="Save this run as a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed throughput drop / p99 rise (fraction)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="fpai-bench-auth-") as data_dir:
+        data_dir = Path(data_dir)
+        os.environ.update({
+            "MEMBERSHIP_DB_PATH": str(data_dir / "membership.db"),
+            "TREASURY_PATH": str(data_dir / "treasury.json"),
+            "TREASURY_LEDGER_PATH": str(data_dir / "treasury.ledger.jsonl"),
+            "COORD_DIR": str(data_dir / "coordination"),
+            "REGISTRY_URL": "http://127.0.0.1:9",
+            "ORCHESTRATOR_URL": "http://127.0.0.1:9",
+            "RATE_LIMIT_ENABLED": "false",
+            "ANTHROPIC_API_KEY": "",
+        })
+        from app.database import create_user
+        for n in range(SEED_USERS):
+            create_user(f"seed{n}@example.com", PASSWORD, f"Seed {n}")
+
+        print(f"{args.workers} workers x {args.concurrency} clients, {args.requests} operations per worker, "
+              f"mix {','.join(f'{k}={v}' for k, v in args.mix.items())}")
+        # Workers import the app themselves, after the environment points at the temp database
+        context = multiprocessing.get_context("spawn")
+        start_at = time.time() + 3
+        jobs = [(worker, args.requests, args.concurrency, args.mix, args.seed, start_at) for worker in range(args.workers)]
+        with context.Pool(args.workers) as pool:
+            pending = pool.map_async(worker_main, jobs)
+            results = pending.get()
+        elapsed = max(r["finished"] for r in results) - min(r["started"] for r in results)
+
+    summaries = summarize(results, elapsed)
+    print_table(summaries)
+    print(f"{summaries['writes']['rps']:,.1f} write transactions/s, "
+          f"{summaries['writes']['locked']} '{LOCKED}' errors, {elapsed:.1f}s")
+    for name, s in summaries.items():
+        if name != "writes" and s["requests"]:
+            print(f"  {name:<10} p50 {s['p50_ms']:.2f}  p90 {s['p90_ms']:.2f}  p99 {s['p99_ms']:.2f}  max {s['max_ms']:.2f} ms")
+
+    if args.save_baseline:
+        save(summaries, args.save_baseline)
+    if args.baseline:
+        regressions = compare(summaries, args.baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Intent Matching Benchmark
+Compares the compiled intent engine with the previous chains of substring scans
+Run from the repo root: python -m bench.bench_intents [--messages 20000] [--min-rate 5000]
+"""
+import argparse
+import random
+import sys
+import time
+
+from app.services.intents import intent_engine
+
+SAMPLE_MESSAGES = [
+    "what's the system status?",
+    "how many members signed up today",
+    "did the latest deploy go out?",
+    "what happened recently",
+    "help",
+    "what can you do",
+    "is everything working and online?",
+    "show me new customers this week",
+    "tell me something interesting about the roadmap for the quarter",
+    "any updates on the membership tiers and pricing for builder and master plans?",
+]
+
+
+def legacy_match(message: str) -> str:
+    """The substring chains the engine replaced (two passes: answer, then dashboard data)"""
+    intent = "general"
+    if any(word in message for word in ['deploy', 'deployment', 'pushed', 'update']):
+        intent = "deploy"
+    elif any(word in message for word in ['member', 'user', 'signup', 'customer']):
+        intent = "members"
+    elif any(word in message for word in ['health', 'status', 'online', 'working']):
+        intent = "health"
+    elif any(word in message for word in ['happen', 'activity', 'recent', 'latest']):
+        intent = "activity"
+    elif any(word in message for word in ['help', 'what can', 'how do']):
+        intent = "help"
+
+    if any(word in message for word in ['member', 'user', 'signup']):
+        pass
+    elif any(word in message for word in ['deploy']):
+        pass
+    return intent
+
+
+def run(label: str, match, messages: list) -> float:
+    started = time.perf_counter()
+    for message in messages:
+        match(message)
+    elapsed = time.perf_counter() - started
+    rate = len(messages) / elapsed
+    print(f"{label:<10} {len(messages):>8} messages  {elapsed * 1000:8.1f} ms  {rate:12,.0f} msg/s  "
+          f"{elapsed / len(messages) * 1e6:6.2f} us/msg")
+    return rate
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--min-rate", type=float, default=5000, help="Fail below this many messages/second")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    messages = [rng.choice(SAMPLE_MESSAGES) for _ in range(args.messages)]
+
+    run("legacy", legacy_match, messages)
+    rate = run("compiled", intent_engine.match, messages)
+
+    if rate < args.min_rate:
+        print(f"FAIL: {rate:,.0f} msg/s is below the {args.min_rate:,.0f} msg/s floor")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
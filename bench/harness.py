@@ -0,0 +1,91 @@
+"""
+Load Harness
+Fixed-concurrency load against the app in-process, latency percentiles and baseline comparison
+Shared by the bench_* scripts
+"""
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(p * len(sorted_values)), len(sorted_values) - 1)]
+
+
+class Result:
+    """Latencies and errors for one scenario"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: List[float] = []
+        self.errors: Dict[str, int] = {}
+        self.elapsed = 0.0
+
+    def record(self, seconds: float, error: Optional[str] = None):
+        self.latencies.append(seconds)
+        if error:
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": len(latencies),
+            "errors": sum(self.errors.values()),
+            "rps": round(len(latencies) / self.elapsed, 1) if self.elapsed else 0.0,
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2)
+        }
+
+
+async def run_load(name: str, operation: Callable[[int], Awaitable[Optional[str]]], requests: int, concurrency: int) -> Result:
+    """Run `requests` operations from `concurrency` workers; an operation returns an error label or None"""
+    result = Result(name)
+    counter = iter(range(requests))
+
+    async def worker():
+        for n in counter:
+            started = time.perf_counter()
+            try:
+                error = await operation(n)
+            except Exception as e:
+                error = type(e).__name__
+            result.record(time.perf_counter() - started, error)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def print_table(summaries: Dict[str, dict]):
+    print(f"{'scenario':<22} {'requests':>8} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, s in summaries.items():
+        print(f"{name:<22} {s['requests']:>8} {s['errors']:>7} {s['rps']:>9,.1f} {s['p50_ms']:>8.2f} {s['p99_ms']:>8.2f}")
+
+
+def compare(summaries: Dict[str, dict], baseline_path: Path, tolerance: float) -> List[str]:
+    """Regressions against a saved baseline: throughput down or p99 up by more than `tolerance`"""
+    baseline = json.loads(baseline_path.read_text())
+    regressions = []
+    for name, current in summaries.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        if current["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: {current['rps']:,.1f} req/s vs {before['rps']:,.1f} baseline")
+        if current["p99_ms"] > before["p99_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p99 {current['p99_ms']:.2f} ms vs {before['p99_ms']:.2f} baseline")
+        # Error rates may wobble with stub failure injection; flag a rise of over a point
+        if current["errors"] / max(current["requests"], 1) > before["errors"] / max(before["requests"], 1) + 0.01:
+            regressions.append(f"{name}: {current['errors']} errors vs {before['errors']} baseline")
+    return regressions
+
+
+def save(summaries: Dict[str, dict], path: Path):
+    path.write_text(json.dumps(summaries, indent=2) + "\n")
+    print(f"Saved baseline to {path}")
@@ -0,0 +1,100 @@
+"""
+Upstream Stubs
+Local Registry and Orchestrator apps with configurable latency, failure rate and droplet count,
+served on loopback sockets from a background thread so the dashboard's own HTTP clients reach them
+"""
+import asyncio
+import random
+import socket
+import threading
+import time
+from typing import Optional
+
+import uvicorn
+from fastapi import FastAPI, Response
+
+
+def _maybe_fail(rng: random.Random, failure_rate: float) -> Optional[Response]:
+    if failure_rate and rng.random() < failure_rate:
+        return Response(status_code=503)
+    return None
+
+
+def create_registry_stub(droplets: int = 10, latency: float = 0.0, failure_rate: float = 0.0,
+                         droplet_endpoint: str = "http://127.0.0.1:9", seed: int = 42) -> FastAPI:
+    """Registry stub listing `droplets` droplets whose health lives at `droplet_endpoint`"""
+    stub = FastAPI()
+    rng = random.Random(seed)
+    stub.state.droplets = [
+        {
+            "droplet_id": f"droplet-{n}",
+            "name": f"droplet-{n}",
+            "status": "active",
+            "port": 9000 + n,
+            "endpoint": droplet_endpoint,
+            "capabilities": ["bench"]
+        }
+        for n in range(droplets)
+    ]
+
+    @stub.get("/health")
+    async def health():
+        await asyncio.sleep(latency)
+        return _maybe_fail(rng, failure_rate) or {"status": "active"}
+
+    @stub.get("/droplets")
+    async def list_droplets():
+        await asyncio.sleep(latency)
+        return _maybe_fail(rng, failure_rate) or stub.state.droplets
+
+    @stub.post("/droplets/register")
+    @stub.post("/droplets/heartbeat")
+    async def accept():
+        await asyncio.sleep(latency)
+        return _maybe_fail(rng, failure_rate) or {"status": "ok"}
+
+    return stub
+
+
+def create_orchestrator_stub(latency: float = 0.0, failure_rate: float = 0.0, seed: int = 43) -> FastAPI:
+    """Orchestrator stub; also answers every droplet's health path"""
+    stub = FastAPI()
+    rng = random.Random(seed)
+
+    @stub.get("/health")
+    @stub.get("/{name}/health")
+    async def health(name: str = ""):
+        await asyncio.sleep(latency)
+        return _maybe_fail(rng, failure_rate) or {"status": "active"}
+
+    return stub
+
+
+def free_port() -> int:
+    """An unused loopback port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class StubServer:
+    """Serves an ASGI app on a loopback port from a daemon thread (context manager)"""
+
+    def __init__(self, app: FastAPI, port: Optional[int] = None):
+        self.port = port or free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, ws="none", log_level="warning", access_log=False))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self) -> "StubServer":
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline or not self.thread.is_alive():
+                raise RuntimeError(f"Stub server on port {self.port} did not start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
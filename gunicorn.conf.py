@@ -0,0 +1,26 @@
+"""
+Gunicorn configuration for graceful reloads
+Workers warm their caches before serving; `python -m app.reload` replaces them one at a time
+Read from the environment (not app.config) so the master never imports app code
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8002')}"
+# One worker: progress write-behind, deploy jobs, rate-limit buckets and the model-call cap
+# live in process memory, so more workers would each hold a diverging copy
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "app.workers.GracefulUvicornWorker"
+
+# Each worker imports the app itself, so workers started after a pull run the new code
+preload_app = False
+
+# Startup covers Registry registration and cache warm-up
+timeout = 120
+# A bit longer than the app's own drain deadline, so workers exit on their own terms
+graceful_timeout = int(float(os.getenv("DRAIN_TIMEOUT", "30"))) + 5
+
+pidfile = os.getenv("PID_FILE", "/tmp/fpai-dashboard.pid")
+# Workers drop a marker here once warm; inherited by workers and by app.reload
+os.environ.setdefault("READY_DIR", "/tmp/fpai-dashboard-ready")
+
+accesslog = "-"
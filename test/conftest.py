@@ -0,0 +1,24 @@
+"""
+Shared test configuration
+Points the app at throwaway data files before it is imported
+"""
+import os
+import tempfile
+from pathlib import Path
+
+_data_dir = Path(tempfile.mkdtemp(prefix="fpai-dashboard-test-"))
+
+os.environ.setdefault("MEMBERSHIP_DB_PATH", str(_data_dir / "membership.db"))
+os.environ.setdefault("TREASURY_PATH", str(_data_dir / "treasury.json"))
+os.environ.setdefault("COORD_DIR", str(_data_dir / "coordination"))
+os.environ.setdefault("LAST_DEPLOY_FILE", str(_data_dir / "last-deploy"))
+
+# Never reach the real Registry/Orchestrator; a closed loopback port fails fast
+os.environ.setdefault("REGISTRY_URL", "http://127.0.0.1:9")
+os.environ.setdefault("ORCHESTRATOR_URL", "http://127.0.0.1:9")
+
+# Most tests issue many requests from one client; rate limit tests re-enable it
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+# Chat tests run against a stub API; never call the real one from the suite
+os.environ["ANTHROPIC_API_KEY"] = ""
@@ -0,0 +1,60 @@
+"""
+Stub Anthropic Messages API
+Echoes the user message back (streamed word by word when asked) so the AI client
+can be exercised without network access; run standalone with
+`uvicorn stub_anthropic:app --app-dir test --port 8100` and set ANTHROPIC_BASE_URL
+"""
+import asyncio
+import json
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+def create_stub_app(delay: float = 0.0, status_code: int = 200) -> FastAPI:
+    """Stub app; `delay` seconds pass before each streamed chunk"""
+    stub = FastAPI()
+    stub.state.requests = []
+
+    @stub.post("/v1/messages")
+    async def messages(request: Request):
+        body = await request.json()
+        stub.state.requests.append(body)
+        if status_code != 200:
+            return JSONResponse(
+                {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}},
+                status_code=status_code
+            )
+
+        reply = f"Echo: {body['messages'][-1]['content']}"
+        message = {
+            "id": "msg_stub", "type": "message", "role": "assistant", "model": body["model"],
+            "content": [], "stop_reason": None, "stop_sequence": None,
+            "usage": {"input_tokens": 1, "output_tokens": 0}
+        }
+        if not body.get("stream"):
+            message.update(content=[{"type": "text", "text": reply}], stop_reason="end_turn")
+            return message
+
+        async def events():
+            def event(name, data):
+                return f"event: {name}\ndata: {json.dumps({'type': name, **data})}\n\n"
+
+            yield event("message_start", {"message": message})
+            yield event("content_block_start", {"index": 0, "content_block": {"type": "text", "text": ""}})
+            words = reply.split(" ")
+            for i, word in enumerate(words):
+                await asyncio.sleep(delay)
+                text = word if i == len(words) - 1 else word + " "
+                yield event("content_block_delta", {"index": 0, "delta": {"type": "text_delta", "text": text}})
+            yield event("content_block_stop", {"index": 0})
+            yield event("message_delta", {"delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                          "usage": {"output_tokens": len(words)}})
+            yield event("message_stop", {})
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return stub
+
+
+app = create_stub_app()
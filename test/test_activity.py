@@ -0,0 +1,134 @@
+"""
+Tests for the activity log and streak tracking
+"""
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.database import (
+    get_db,
+    create_user,
+    record_activity,
+    get_streak,
+    count_activity,
+    count_active_streaks,
+    active_user_rollup
+)
+from app.main import app
+
+client = TestClient(app)
+
+_counter = 0
+
+
+def new_user() -> int:
+    global _counter
+    _counter += 1
+    return create_user(f"activity-{_counter}@example.com", "password123", "Activity Tester")
+
+
+def set_streak(user_id: int, current: int, longest: int, days_ago: int):
+    day = (datetime.utcnow().date() - timedelta(days=days_ago)).isoformat()
+    conn = get_db()
+    conn.execute(
+        'INSERT OR REPLACE INTO user_streaks VALUES (?, ?, ?, ?)',
+        (user_id, current, longest, day)
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_first_event_starts_streak():
+    user_id = new_user()
+    assert record_activity(user_id, 'login')
+    streak = get_streak(user_id)
+    assert streak['current_streak'] == 1
+    assert streak['longest_streak'] == 1
+
+
+def test_same_day_events_do_not_extend_streak():
+    user_id = new_user()
+    set_streak(user_id, current=3, longest=5, days_ago=0)
+    record_activity(user_id, 'login')
+    assert get_streak(user_id)['current_streak'] == 3
+
+
+def test_consecutive_day_extends_streak():
+    user_id = new_user()
+    set_streak(user_id, current=5, longest=5, days_ago=1)
+    record_activity(user_id, 'reflection')
+    streak = get_streak(user_id)
+    assert streak['current_streak'] == 6
+    assert streak['longest_streak'] == 6
+
+
+def test_gap_restarts_streak_and_keeps_longest():
+    user_id = new_user()
+    set_streak(user_id, current=4, longest=9, days_ago=3)
+    assert get_streak(user_id)['current_streak'] == 0
+
+    record_activity(user_id, 'login')
+    streak = get_streak(user_id)
+    assert streak['current_streak'] == 1
+    assert streak['longest_streak'] == 9
+
+
+def test_once_per_day_deduplicates():
+    user_id = new_user()
+    assert record_activity(user_id, 'tool_use', once_per_day=True)
+    assert not record_activity(user_id, 'tool_use', once_per_day=True)
+    assert record_activity(user_id, 'reflection', once_per_day=True)
+    assert count_activity(user_id, 'tool_use') == 1
+
+
+def test_unknown_kind_rejected():
+    try:
+        record_activity(new_user(), 'teleport')
+    except ValueError:
+        return
+    assert False, "expected ValueError"
+
+
+def test_rollups_by_day_and_week():
+    users = [new_user() for _ in range(3)]
+    rows = [
+        (users[0], 'login', '2024-03-04'),  # Monday
+        (users[0], 'login', '2024-03-04'),
+        (users[1], 'login', '2024-03-04'),
+        (users[1], 'tool_use', '2024-03-06'),
+        (users[2], 'login', '2024-03-11'),  # next Monday
+    ]
+    conn = get_db()
+    conn.executemany(
+        'INSERT INTO user_activity (user_id, kind, day, created_at) VALUES (?, ?, ?, ?)',
+        [(user_id, kind, day, day + 'T12:00:00') for user_id, kind, day in rows]
+    )
+    conn.commit()
+    conn.close()
+
+    start, end = datetime(2024, 3, 4).date(), datetime(2024, 3, 17).date()
+    assert active_user_rollup(start, end, 'day') == [
+        {'period': '2024-03-04', 'active_users': 2},
+        {'period': '2024-03-06', 'active_users': 1},
+        {'period': '2024-03-11', 'active_users': 1},
+    ]
+    assert active_user_rollup(start, end, 'week') == [
+        {'period': '2024-03-04', 'active_users': 2},
+        {'period': '2024-03-11', 'active_users': 1},
+    ]
+
+
+def test_stats_report_active_streaks():
+    record_activity(new_user(), 'login')
+    data = client.get("/api/command-center/stats").json()
+    assert data["activeStreaks"] == count_active_streaks()
+    assert data["activeStreaks"] >= 1
+
+
+def test_activity_endpoint():
+    response = client.get("/api/command-center/activity?period=week&days=14")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["period"] == "week"
+    assert isinstance(data["series"], list)
+    assert client.get("/api/command-center/activity?period=month").status_code == 422
@@ -0,0 +1,153 @@
+"""
+Tests for admin bulk export/import endpoints
+"""
+import csv
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.database import create_user, get_user_by_email, verify_password
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def admin_secret(monkeypatch):
+    monkeypatch.setattr(settings, "admin_secret", "test-admin-secret")
+
+
+def admin_url(path: str, **params) -> str:
+    query = "&".join(f"{k}={v}" for k, v in {"secret": "test-admin-secret", **params}.items())
+    return f"{path}?{query}"
+
+
+def test_admin_requires_secret():
+    """Admin endpoints reject missing or wrong secrets"""
+    assert client.get("/admin/export/users").status_code == 403
+    assert client.get("/admin/export/users?secret=wrong").status_code == 403
+
+
+def test_admin_disabled_without_configured_secret(monkeypatch):
+    """Admin endpoints stay closed when no secret is configured"""
+    monkeypatch.setattr(settings, "admin_secret", None)
+    response = client.get("/admin/export/users?secret=")
+    assert response.status_code == 403
+
+
+def test_export_users_ndjson():
+    """Users stream out as one JSON object per line"""
+    create_user("export-ndjson@example.com", "password123", "Export Tester")
+
+    response = client.get(admin_url("/admin/export/users"))
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    emails = {row["email"] for row in rows}
+    assert "export-ndjson@example.com" in emails
+    assert "password_hash" in rows[0]
+
+
+def test_export_users_csv():
+    """Users stream out as CSV with a header row"""
+    create_user("export-csv@example.com", "password123", "Csv Tester")
+
+    response = client.get(admin_url("/admin/export/users", format="csv"))
+    assert response.status_code == 200
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert any(row["email"] == "export-csv@example.com" for row in rows)
+
+
+def test_export_rejects_unknown_format():
+    response = client.get(admin_url("/admin/export/users", format="xml"))
+    assert response.status_code == 400
+
+
+def test_import_users_ndjson():
+    """Import validates rows, hashes plaintext passwords and skips duplicates"""
+    create_user("import-existing@example.com", "password123", "Existing")
+    lines = [
+        {"email": "Import-One@example.com", "password": "password123", "full_name": "One"},
+        {"email": "import-two@example.com", "password": "password123", "membership_tier": "master"},
+        {"email": "import-existing@example.com", "password": "password123"},
+        {"email": "not-an-email", "password": "password123"},
+        {"email": "import-three@example.com", "password": "short"},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines) + "\n{broken json\n"
+
+    response = client.post(admin_url("/admin/import/users"), content=body)
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["received"] == 6
+    assert data["written"] == 2
+    assert data["skipped"] == 1
+    assert data["invalid"] == 3
+    assert [e["line"] for e in data["errors"]] == [4, 5, 6]
+
+    user = get_user_by_email("import-one@example.com")
+    assert user is not None
+    assert verify_password("password123", user["password_hash"])
+    assert get_user_by_email("import-two@example.com")["membership_tier"] == "master"
+
+
+def test_import_rejects_non_string_fields_per_row():
+    """Wrongly typed JSON values are counted as invalid rows, not a failed import"""
+    lines = [
+        {"email": "typed-hash@example.com", "password_hash": 123},
+        {"email": "typed-name@example.com", "password": "password123", "full_name": 5},
+        {"email": "typed-password@example.com", "password": 12345678},
+        {"email": ["typed-email@example.com"], "password": "password123"},
+        {"email": "typed-ok@example.com", "password": "password123"},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines)
+
+    response = client.post(admin_url("/admin/import/users"), content=body)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["invalid"] == 4 and data["written"] == 1
+    assert [e["error"] for e in data["errors"]] == [
+        "password_hash must be a string", "full_name must be a string", "password must be a string",
+        "email must be a string"
+    ]
+
+    response = client.post(admin_url("/admin/import/progress"), content=json.dumps({"email": 42}))
+    assert response.json()["invalid"] == 1
+
+
+def test_export_import_round_trip_csv():
+    """A CSV export can be re-imported, carrying password hashes across"""
+    create_user("roundtrip@example.com", "password123", "Round Trip")
+    exported = client.get(admin_url("/admin/export/users", format="csv")).text
+
+    rewritten = exported.replace("roundtrip@example.com", "roundtrip-copy@example.com")
+    response = client.post(admin_url("/admin/import/users", format="csv"), content=rewritten)
+    assert response.status_code == 200
+    assert response.json()["invalid"] == 0
+
+    copy = get_user_by_email("roundtrip-copy@example.com")
+    assert copy is not None
+    assert verify_password("password123", copy["password_hash"])
+
+
+def test_import_progress_by_email():
+    """Progress rows are matched to users by email"""
+    create_user("progress-import@example.com", "password123", "Progress")
+    body = "\n".join([
+        json.dumps({"email": "progress-import@example.com", "goal_data": {"goals": ["ship it"]}}),
+        json.dumps({"email": "nobody@example.com", "goal_data": "{}"}),
+    ])
+
+    response = client.post(admin_url("/admin/import/progress"), content=body)
+    data = response.json()
+    assert data["written"] == 1
+    assert data["skipped"] == 1
+
+    exported = client.get(admin_url("/admin/export/progress")).text
+    rows = {json.loads(line)["email"]: json.loads(line) for line in exported.splitlines()}
+    assert json.loads(rows["progress-import@example.com"]["goal_data"]) == {"goals": ["ship it"]}
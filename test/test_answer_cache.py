@@ -0,0 +1,81 @@
+"""
+Tests for the command center answer cache
+"""
+import httpx
+from fastapi.testclient import TestClient
+
+from app.database import create_user
+from app.main import app
+from app.routers import command_center
+from app.services.ai_client import AIClient
+from app.services.answer_cache import AnswerCache, answer_cache, normalize_question
+from app.services.system_context import system_context
+from stub_anthropic import create_stub_app
+
+client = TestClient(app)
+
+
+def test_normalize_question():
+    assert normalize_question("  System   STATUS?! ") == "system status"
+    assert normalize_question("how many members?") == normalize_question("How many members")
+
+
+def test_lru_bound_and_ttl():
+    cache = AnswerCache(max_entries=2, ttl=60)
+    cache.put(("a",), {"response": "A"})
+    cache.put(("b",), {"response": "B"})
+    assert cache.get(("a",)) == {"response": "A"}
+    cache.put(("c",), {"response": "C"})
+    # "b" was least recently used
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) is not None
+
+    expiring = AnswerCache(ttl=0)
+    expiring.put(("a",), {"response": "A"})
+    assert expiring.get(("a",)) is None
+    assert expiring.stats()["expired"] == 1
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 2)
+    assert stats["hit_rate"] == round(2 / 3, 4)
+
+
+def test_repeat_questions_skip_the_model(monkeypatch):
+    answer_cache.clear()
+    stub = create_stub_app()
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=stub), base_url="http://stub")
+    monkeypatch.setattr(command_center, "ai_client", AIClient("test-key", base_url="http://stub", http_client=http_client))
+
+    first = client.post("/api/command-center/chat", json={"message": "System status?"}).json()
+    again = client.post("/api/command-center/chat", json={"message": "system   status"}).json()
+    streamed = client.post("/api/command-center/chat/stream", json={"message": "SYSTEM STATUS"}).text
+
+    assert again == first
+    assert first["response"] in streamed
+    assert len(stub.state.requests) == 1
+
+
+def test_changed_stats_miss_the_cache():
+    answer_cache.clear()
+    system_context.invalidate()
+    hits = answer_cache.hits
+    first = client.post("/api/command-center/chat", json={"message": "how many members?"}).json()
+
+    create_user("answer-cache@example.com", "password123", "Answer Cache")
+    system_context.invalidate()
+    second = client.post("/api/command-center/chat", json={"message": "how many members?"}).json()
+
+    assert second["data"]["members"] == first["data"]["members"] + 1
+    assert answer_cache.hits == hits
+
+
+def test_metrics_report_hit_rate():
+    answer_cache.clear()
+    client.post("/api/command-center/chat", json={"message": "help"})
+    client.post("/api/command-center/chat", json={"message": "help"})
+
+    metrics = client.get("/api/command-center/metrics").json()
+    assert metrics["answer_cache"]["entries"] == 1
+    assert metrics["answer_cache"]["hits"] >= 1
+    assert "in_flight" in metrics["ai"]
+    assert metrics["system_context"]["builds"] >= 1
@@ -0,0 +1,44 @@
+"""
+Tests for fingerprinted static assets
+"""
+import re
+
+from fastapi.testclient import TestClient
+
+from app.assets import asset_manifest, IMMUTABLE_CACHE_CONTROL
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_manifest_fingerprints_assets():
+    url = asset_manifest.url("css/style.css")
+    assert re.fullmatch(r"/static/css/style\.[0-9a-f]{10}\.css", url)
+    assert asset_manifest.resolve(url[len("/static/"):]) == "css/style.css"
+    assert not any(name.endswith((".gz", ".br")) for name in asset_manifest.hashed)
+
+
+def test_pages_reference_fingerprinted_urls():
+    html = client.get("/").text
+    assert asset_manifest.url("css/style.css") in html
+    assert asset_manifest.url("js/main.js") in html
+    assert 'href="/static/css/style.css"' not in html
+
+
+def test_fingerprinted_asset_is_immutable():
+    url = asset_manifest.url("js/main.js")
+    for encoding in ("identity", "br"):
+        response = client.get(url, headers={"Accept-Encoding": encoding})
+        assert response.status_code == 200
+        assert response.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.content == client.get("/static/js/main.js").content
+
+
+def test_plain_asset_path_still_revalidates():
+    response = client.get("/static/css/style.css")
+    assert response.status_code == 200
+    assert "immutable" not in response.headers.get("Cache-Control", "")
+
+
+def test_unknown_fingerprint_is_404():
+    assert client.get("/static/css/style.0000000000.css").status_code == 404
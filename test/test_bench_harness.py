@@ -0,0 +1,63 @@
+"""
+Tests for the benchmark harness and upstream stubs
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from bench.bench_auth import LOCKED, parse_mix, summarize
+from bench.harness import compare, run_load
+from bench.stubs import StubServer, create_orchestrator_stub, create_registry_stub
+
+
+def test_run_load_counts_requests_and_errors():
+    async def operation(n):
+        await asyncio.sleep(0)
+        return "boom" if n % 4 == 0 else None
+
+    result = asyncio.run(run_load("op", operation, requests=20, concurrency=3))
+    summary = result.summary()
+    assert summary["requests"] == 20
+    assert summary["errors"] == 5
+    assert result.errors == {"boom": 5}
+    assert summary["p99_ms"] >= summary["p50_ms"]
+
+
+def test_compare_flags_regressions(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"a": {"requests": 100, "errors": 0, "rps": 100.0, "p50_ms": 5, "p99_ms": 10}}))
+
+    assert compare({"a": {"requests": 100, "errors": 0, "rps": 90.0, "p50_ms": 5, "p99_ms": 11}}, baseline, 0.25) == []
+    regressions = compare({"a": {"requests": 100, "errors": 5, "rps": 50.0, "p50_ms": 5, "p99_ms": 20}}, baseline, 0.25)
+    assert len(regressions) == 3
+
+
+def test_stubs_serve_droplets_and_health():
+    with StubServer(create_orchestrator_stub()) as orchestrator:
+        with StubServer(create_registry_stub(droplets=3, droplet_endpoint=orchestrator.url)) as registry:
+            droplets = httpx.get(f"{registry.url}/droplets").json()
+            assert len(droplets) == 3
+            assert httpx.get(f"{droplets[0]['endpoint']}/droplet-0/health").status_code == 200
+
+    failing = create_orchestrator_stub(failure_rate=1.0)
+    with StubServer(failing) as server:
+        assert httpx.get(f"{server.url}/health").status_code == 503
+
+
+def test_auth_summary_counts_writes_and_locks():
+    assert parse_mix("signup=2,dashboard") == {"signup": 2, "dashboard": 1}
+    with pytest.raises(Exception):
+        parse_mix("delete_everything=1")
+
+    worker = {
+        "latencies": {"signup": [0.01, 0.02], "login": [0.01], "dashboard": [0.005], "logout": []},
+        "errors": {"signup": {LOCKED: 1}, "login": {}, "dashboard": {}, "logout": {}},
+    }
+    summaries = summarize([worker, worker], elapsed=2.0)
+    assert summaries["signup"]["requests"] == 4
+    assert summaries["signup"]["locked"] == 2
+    # Two successful signups (3 writes each) and two logins (2 each) over two seconds
+    assert summaries["writes"]["rps"] == 5.0
+    assert summaries["writes"]["locked"] == 2
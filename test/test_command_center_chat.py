@@ -0,0 +1,119 @@
+"""
+Tests for command center chat against a stub Anthropic API
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routers import command_center
+from app.services.ai_client import AIClient, AIError
+from app.services.answer_cache import answer_cache
+from stub_anthropic import create_stub_app
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def fresh_answers():
+    answer_cache.clear()
+
+
+def stub_client(stub, **kwargs) -> AIClient:
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=stub), base_url="http://stub")
+    return AIClient("test-key", base_url="http://stub", http_client=http_client, **kwargs)
+
+
+def collect(ai: AIClient, message: str) -> list:
+    async def run():
+        return [chunk async for chunk in ai.stream("system prompt", message)]
+    return asyncio.run(run())
+
+
+def parse_sse(body: str) -> list:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_yields_chunks():
+    stub = create_stub_app()
+    ai = stub_client(stub)
+
+    assert collect(ai, "hello there") == ["Echo: ", "hello ", "there"]
+    assert stub.state.requests[0]["stream"] is True
+    assert stub.state.requests[0]["system"] == "system prompt"
+    assert ai.stats()["calls"] == 1
+    assert ai.stats()["in_flight"] == 0
+
+
+def test_timeout_raises_and_frees_slot():
+    ai = stub_client(create_stub_app(delay=0.2), timeout=0.05, max_concurrency=1)
+
+    with pytest.raises(AIError, match="timed out"):
+        collect(ai, "slow answer please")
+    assert ai.timeouts == 1
+    assert ai.in_flight == 0
+    assert ai.scheduler.active == 0
+
+
+def test_api_errors_become_ai_errors():
+    ai = stub_client(create_stub_app(status_code=529))
+    with pytest.raises(AIError):
+        collect(ai, "hi")
+    assert ai.errors == 1
+
+
+def test_concurrency_is_bounded():
+    ai = stub_client(create_stub_app(delay=0.01), max_concurrency=2)
+    peak = 0
+
+    async def one(i):
+        nonlocal peak
+        async for _ in ai.stream("system", f"question {i}"):
+            peak = max(peak, ai.in_flight)
+
+    async def run():
+        await asyncio.gather(*(one(i) for i in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+    assert ai.calls == 6
+
+
+def test_chat_endpoints_use_ai_client(monkeypatch):
+    monkeypatch.setattr(command_center, "ai_client", stub_client(create_stub_app()))
+
+    response = client.post("/api/command-center/chat", json={"message": "How many MEMBERS?"})
+    assert response.status_code == 200
+    assert response.json()["response"] == "Echo: how many members?"
+    assert "members" in response.json()["data"]
+
+    response = client.post("/api/command-center/chat/stream", json={"message": "deploy status"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(response.text)
+    assert [e for e, _ in events] == ["token", "token", "token", "done"]
+    assert "".join(data["text"] for e, data in events if e == "token") == "Echo: deploy status"
+    assert events[-1][1] == {"data": {"deploymentStatus": "Active"}}
+
+
+def test_stream_reports_ai_errors(monkeypatch):
+    monkeypatch.setattr(command_center, "ai_client", stub_client(create_stub_app(status_code=529)))
+
+    events = parse_sse(client.post("/api/command-center/chat/stream", json={"message": "hi"}).text)
+    assert [e for e, _ in events] == ["error", "done"]
+    assert "temporarily unavailable" in events[0][1]["detail"]
+
+
+def test_stream_falls_back_to_rules_without_api_key(monkeypatch):
+    monkeypatch.setattr(command_center, "ai_client", AIClient(None))
+
+    events = parse_sse(client.post("/api/command-center/chat/stream", json={"message": "help"}).text)
+    assert events[0][0] == "token"
+    assert "I can help you with" in events[0][1]["text"]
+    assert events[-1][0] == "done"
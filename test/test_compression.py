@@ -0,0 +1,79 @@
+"""
+Tests for response compression and pre-compressed static assets
+"""
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.compression import negotiate
+from app.main import app
+from app.middleware.compression import CompressionMiddleware
+
+client = TestClient(app)
+
+
+def test_negotiate_prefers_brotli_and_honours_q_values():
+    assert negotiate("gzip, deflate, br", ("br", "gzip")) == "br"
+    assert negotiate("gzip, br;q=0.5", ("br", "gzip")) == "gzip"
+    assert negotiate("br;q=0, gzip;q=0", ("br", "gzip")) is None
+    assert negotiate("*", ("gzip",)) == "gzip"
+    assert negotiate(None, ("br", "gzip")) is None
+    assert negotiate("identity", ("br", "gzip")) is None
+
+
+def test_large_json_is_compressed():
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert int(response.headers["Content-Length"]) < len(response.content)
+    assert response.json()["info"]["title"]
+
+
+def test_small_response_is_not_compressed():
+    response = client.get("/health", headers={"Accept-Encoding": "gzip, br"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_no_compression_without_accept_encoding():
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_static_assets_served_from_precompressed_siblings():
+    plain = client.get("/static/css/style.css", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+
+    for encoding in ("br", "gzip"):
+        response = client.get("/static/css/style.css", headers={"Accept-Encoding": encoding})
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == encoding
+        assert response.headers["Content-Type"].startswith("text/css")
+        assert response.content == plain.content
+
+        cached = client.get("/static/css/style.css", headers={
+            "Accept-Encoding": encoding,
+            "If-None-Match": response.headers["ETag"]
+        })
+        assert cached.status_code == 304
+
+
+def test_streaming_and_event_stream_pass_through():
+    stub = FastAPI()
+
+    @stub.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(3):
+                yield "x" * 1000
+                await asyncio.sleep(0)
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @stub.get("/events")
+    async def events():
+        return PlainTextResponse("data: x\n\n" * 200, media_type="text/event-stream")
+
+    wrapped = TestClient(CompressionMiddleware(stub, minimum_size=100))
+    assert "Content-Encoding" not in wrapped.get("/stream", headers={"Accept-Encoding": "gzip"}).headers
+    assert "Content-Encoding" not in wrapped.get("/events", headers={"Accept-Encoding": "gzip"}).headers
@@ -0,0 +1,171 @@
+"""
+Tests for deploy jobs and their streamed logs
+"""
+import asyncio
+import json
+import os
+import subprocess
+
+import httpx
+import pytest
+
+from app.main import app
+from app.routers import deploy
+from app.services import deploy_jobs
+from app.services.deploy_jobs import DeployRunner
+
+SECRET = deploy.DEPLOY_SECRET
+
+
+def make_runner(tmp_path, script: str, **kwargs) -> DeployRunner:
+    return DeployRunner(repo_dir=str(tmp_path), pull_command=("sh", "-c", script), restart_command=None, **kwargs)
+
+
+def parse_sse(body: str) -> list:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_job_captures_output_and_detects_updates(tmp_path):
+    runner = make_runner(tmp_path, "echo 'Updating abc..def'; echo ' 1 file changed' >&2")
+
+    async def run():
+        job = runner.start()
+        assert runner.start() is job  # one deploy at a time
+        await job.task
+        return job
+
+    job = asyncio.run(run())
+    assert job.status == "succeeded"
+    assert job.updates is True
+    assert job.lines[:2] == ["Updating abc..def", " 1 file changed"]
+
+
+def test_up_to_date_and_failed_jobs(tmp_path):
+    runner = make_runner(tmp_path, "echo 'Already up to date.'")
+    failing = make_runner(tmp_path, "echo 'fatal: not a git repository'; exit 128")
+
+    async def run():
+        first = runner.start()
+        await first.task
+        second = failing.start()
+        await second.task
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.updates is False
+    assert second.status == "failed"
+    assert second.returncode == 128
+
+
+def test_timeout_kills_pull(tmp_path):
+    runner = make_runner(tmp_path, "sleep 5", timeout=0.1)
+
+    async def run():
+        job = runner.start()
+        await job.task
+        return job
+
+    job = asyncio.run(run())
+    assert job.status == "failed"
+    assert "timeout" in job.lines[-1]
+
+
+def test_cancelled_pull_is_killed_and_reaped(tmp_path):
+    pid_file = tmp_path / "pull.pid"
+    runner = make_runner(tmp_path, f"echo $$ > {pid_file}; exec sleep 30")
+
+    async def run():
+        job = runner.start()
+        while not pid_file.exists() or not pid_file.read_text().strip():
+            await asyncio.sleep(0.01)
+        job.task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await job.task
+        return job
+
+    job = asyncio.run(run())
+    assert job.status == "cancelled"
+    # A zombie would still answer signal 0
+    with pytest.raises(ProcessLookupError):
+        os.kill(int(pid_file.read_text()), 0)
+
+
+def test_history_is_bounded(tmp_path):
+    runner = make_runner(tmp_path, "true", history=3)
+
+    async def run():
+        for _ in range(5):
+            await runner.start().task
+
+    asyncio.run(run())
+    assert len(runner.jobs) == 3
+    assert runner.latest() is runner.current
+
+
+def test_git_info_is_cached_until_next_deploy(tmp_path):
+    subprocess.run(["git", "init", "-q", "-b", "main"], cwd=tmp_path, check=True)
+    subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "first"],
+                   cwd=tmp_path, check=True)
+    runner = make_runner(tmp_path, "echo 'Already up to date.'")
+
+    async def run():
+        info = await runner.git_info()
+        await runner.git_info()
+        await runner.start().task
+        await runner.git_info()
+        return info
+
+    info = asyncio.run(run())
+    assert info["current_branch"] == "main"
+    assert info["current_commit"].endswith("first")
+    assert runner.git_reads == 2
+
+
+def test_deploy_endpoints_stream_log(tmp_path, monkeypatch):
+    runner = make_runner(tmp_path, "echo one; sleep 0.05; echo two")
+    monkeypatch.setattr(deploy, "deploy_runner", runner)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            assert (await http.get("/deploy", params={"secret": "wrong"})).status_code == 403
+
+            started = await http.post("/deploy", params={"secret": SECRET})
+            assert started.status_code == 202
+            job_id = started.json()["job_id"]
+
+            log = await http.get(f"/deploy/jobs/{job_id}/log", params={"secret": SECRET})
+            job = await http.get(f"/deploy/jobs/{job_id}", params={"secret": SECRET})
+            missing = await http.get("/deploy/jobs/nope", params={"secret": SECRET})
+            return log, job, missing
+
+    log, job, missing = asyncio.run(run())
+    events = parse_sse(log.text)
+    assert [data["text"] for event, data in events if event == "line"][:2] == ["one", "two"]
+    assert events[-1][0] == "done"
+    assert events[-1][1]["status"] == "succeeded"
+    assert job.json()["output"].startswith("one\ntwo")
+    assert missing.status_code == 404
+
+
+def test_failed_or_slow_git_reads_are_not_cached(tmp_path, monkeypatch):
+    runner = make_runner(tmp_path, "true")
+    with pytest.raises(RuntimeError, match="not a git repository"):
+        asyncio.run(runner.git_info())
+    assert runner._git_info is None
+
+    fake_git = tmp_path / "bin" / "git"
+    fake_git.parent.mkdir()
+    fake_git.write_text(f"#!/bin/sh\necho $$ > {tmp_path}/git.pid\nexec sleep 30\n")
+    fake_git.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{fake_git.parent}:{os.environ['PATH']}")
+    monkeypatch.setattr(deploy_jobs, "GIT_TIMEOUT", 0.5)
+    with pytest.raises(RuntimeError, match="took longer than 0.5s"):
+        asyncio.run(runner.git_info())
+    assert runner._git_info is None
+    pid = int((tmp_path / "git.pid").read_text())
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
@@ -0,0 +1,74 @@
+"""
+Tests for per-tier template fragment caching
+"""
+from fastapi.testclient import TestClient
+from jinja2 import DictLoader, Environment
+
+from app.database import create_user, create_session
+from app.fragments import FragmentCache, FragmentCacheExtension
+from app.main import app
+from app.templating import fragment_cache
+
+
+def make_env(source: str) -> Environment:
+    return Environment(loader=DictLoader({"page.html": source}), extensions=[FragmentCacheExtension], autoescape=True)
+
+
+def login(email: str, name: str, tier: str) -> TestClient:
+    client = TestClient(app)
+    client.cookies.set("session_token", create_session(create_user(email, "password123", name, tier)))
+    return client
+
+
+def test_fragment_rendered_once_per_key():
+    env = make_env('{{ name }}|{% fragment "tier", tier %}{{ tier }}-{{ name }}{% endfragment %}')
+    template = env.get_template("page.html")
+
+    assert template.render(name="Ann", tier="seeker") == "Ann|seeker-Ann"
+    # Per-user values outside the fragment still render; the fragment is reused
+    assert template.render(name="Bob", tier="seeker") == "Bob|seeker-Ann"
+    assert template.render(name="Cat", tier="master") == "Cat|master-Cat"
+    assert (env.fragment_cache.hits, env.fragment_cache.misses) == (1, 2)
+
+
+def test_fragment_output_stays_escaped():
+    env = make_env('{% fragment "x" %}{{ value }}{% endfragment %}')
+    assert env.get_template("page.html").render(value="<b>") == "&lt;b&gt;"
+    assert env.get_template("page.html").render(value="<i>") == "&lt;b&gt;"
+
+
+def test_changed_template_gets_new_key():
+    env = make_env('{% fragment "x" %}old{% endfragment %}')
+    assert env.get_template("page.html").render() == "old"
+
+    env.loader.mapping["page.html"] = '{% fragment "x" %}new{% endfragment %}'
+    env.cache.clear()
+    assert env.get_template("page.html").render() == "new"
+
+
+def test_cache_is_bounded_and_can_be_disabled():
+    cache = FragmentCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.get_or_render((key,), lambda: key)
+    assert cache.size() == 2
+    assert ("a",) not in cache.entries
+
+    disabled = FragmentCache(max_entries=0)
+    assert disabled.get_or_render(("a",), lambda: "x") == "x"
+    assert disabled.size() == 0
+
+
+def test_dashboard_personalizes_around_cached_tier_markup():
+    fragment_cache.clear()
+    seeker = login("fragment-ann@example.com", "Ann Seeker", "seeker").get("/dashboard")
+    other_seeker = login("fragment-bob@example.com", "Bob Seeker", "seeker").get("/dashboard")
+    master = login("fragment-cat@example.com", "Cat Master", "master").get("/dashboard")
+
+    assert "Welcome back, Ann!" in seeker.text
+    assert "Welcome back, Bob!" in other_seeker.text
+    assert "Seeker Member" in other_seeker.text
+    assert "1-on-1 Coaching" not in other_seeker.text
+    assert "Master Member" in master.text
+    assert "1-on-1 Coaching" in master.text
+    # Two tiers seen -> two entries per dashboard fragment
+    assert fragment_cache.size() == 4
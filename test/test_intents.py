@@ -0,0 +1,48 @@
+"""
+Tests for the compiled command center intent matcher
+"""
+from datetime import datetime
+
+from app.routers.command_center import answer_with_rules
+from app.services.intents import DEFAULT_INTENT, IntentEngine, intent_engine
+from app.services.system_context import SystemContext
+
+
+def make_context() -> SystemContext:
+    return SystemContext(member_count=7, signups_today=2, tier_counts={"free": 7}, built_at=datetime.utcnow())
+
+
+def test_keywords_match_at_word_starts():
+    assert intent_engine.match("How many MEMBERS joined?") == "members"
+    assert intent_engine.match("anything updated?") == "deploy"
+    assert intent_engine.match("ask the superuser") == DEFAULT_INTENT
+    assert intent_engine.match("tell me a joke") == DEFAULT_INTENT
+
+
+def test_earlier_intents_win():
+    assert intent_engine.match("members since the deploy") == "deploy"
+    assert intent_engine.match("recent signups and uptime") == "members"
+
+
+def test_phrases_allow_any_spacing():
+    assert intent_engine.match("what   can you do") == "help"
+    assert intent_engine.match("did anyone Sign\tUp") == "members"
+
+
+def test_custom_table_and_default():
+    engine = IntentEngine([("a", ("alpha",)), ("b", ("beta", "alpha beta"))], default="none")
+    assert engine.match("beta then alpha") == "a"
+    assert engine.match("only beta") == "b"
+    assert engine.match("gamma") == "none"
+
+
+def test_answer_with_rules_returns_text_and_data():
+    response, data = answer_with_rules("how many members?", make_context())
+    assert "7" in response
+    assert data == {"members": 7, "signupsToday": 2}
+
+    response, data = answer_with_rules("deploy please", make_context())
+    assert data == {"deploymentStatus": "Active"}
+
+    response, data = answer_with_rules("good morning", make_context())
+    assert data is None
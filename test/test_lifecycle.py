@@ -0,0 +1,92 @@
+"""
+Tests for readiness, warm-up, draining and the rolling reload
+"""
+import asyncio
+import os
+import signal
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.reload import ready_pids, rolling_reload
+from app.routers import udc
+from app.services.lifecycle import Lifecycle
+
+client = TestClient(app)
+
+
+def test_ready_follows_lifecycle(tmp_path, monkeypatch):
+    state = Lifecycle(ready_dir=str(tmp_path))
+    monkeypatch.setattr(udc, "lifecycle", state)
+
+    assert client.get("/ready").status_code == 503
+    assert client.get("/ready").json()["status"] == "starting"
+
+    state.mark_ready()
+    assert client.get("/ready").status_code == 200
+    assert (tmp_path / str(os.getpid())).exists()
+
+    state.begin_drain()
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "draining"
+    assert not (tmp_path / str(os.getpid())).exists()
+
+
+def test_warm_runs_steps_and_survives_failures():
+    state = Lifecycle(warmup_timeout=0.05)
+    calls = []
+
+    async def ok():
+        calls.append("ok")
+
+    async def broken():
+        raise RuntimeError("registry down")
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    asyncio.run(state.warm({"ok": ok, "broken": broken, "slow": slow}))
+    assert calls == ["ok"]
+    assert state.warm_errors["broken"] == "registry down"
+    assert "timed out" in state.warm_errors["slow"]
+    assert state.warmup_seconds < 0.5
+
+
+def test_track_counts_open_streams():
+    state = Lifecycle()
+
+    async def stream():
+        yield "a"
+        yield "b"
+
+    async def run():
+        seen = []
+        async for chunk in state.track(stream()):
+            seen.append((chunk, state.open_streams))
+        return seen
+
+    assert asyncio.run(run()) == [("a", 1), ("b", 1)]
+    assert state.open_streams == 0
+
+
+def test_rolling_reload_waits_for_each_new_worker(tmp_path):
+    (tmp_path / "999999999").touch()  # stale marker from a dead worker
+    sent = []
+
+    def fake_master(pid, sig):
+        sent.append(sig)
+        if sig == signal.SIGTTIN:
+            # The new worker warms up and reports ready (our own, live pid)
+            (tmp_path / str(os.getpid() if len(sent) == 1 else os.getppid())).touch()
+
+    assert rolling_reload(1, 2, tmp_path, timeout=1, send=fake_master, poll_interval=0.01)
+    assert sent == [signal.SIGTTIN, signal.SIGTTOU] * 2
+    assert ready_pids(tmp_path) == {os.getpid(), os.getppid()}
+
+
+def test_rolling_reload_keeps_old_workers_when_new_one_never_ready(tmp_path):
+    sent = []
+    ok = rolling_reload(1, 2, tmp_path, timeout=0.05, send=lambda pid, sig: sent.append(sig), poll_interval=0.01)
+    assert not ok
+    assert sent == [signal.SIGTTIN]
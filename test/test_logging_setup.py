@@ -0,0 +1,95 @@
+"""
+Tests for the queued logging pipeline, JSON formatting, rate limiting and request IDs
+"""
+import io
+import json
+import logging
+import queue
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.logging_setup import (
+    JsonFormatter, NonBlockingQueueHandler, RateLimitFilter, configure_logging, logging_pipeline, request_id_var
+)
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def captured():
+    stream = io.StringIO()
+    logging_pipeline.configure(level="INFO", fmt="json", queue_size=100, rate_limit=3, stream=stream)
+    yield stream
+    configure_logging()
+
+
+def flush_lines(stream: io.StringIO) -> list:
+    logging_pipeline.shutdown()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_lines_carry_request_id_and_exceptions(captured):
+    log = logging.getLogger("app.test")
+    token = request_id_var.set("req-123")
+    try:
+        log.info("Hello %s", "world")
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            log.exception("Failed")
+    finally:
+        request_id_var.reset(token)
+    log.debug("Suppressed by level %s", "never formatted")
+
+    lines = flush_lines(captured)
+    assert [line["message"] for line in lines] == ["Hello world", "Failed"]
+    assert lines[0]["request_id"] == "req-123" and lines[0]["logger"] == "app.test"
+    assert "ZeroDivisionError" in lines[1]["exc"]
+
+
+def test_rate_limit_per_call_site(captured):
+    log = logging.getLogger("app.test")
+    for n in range(10):
+        log.warning("Noisy %d", n)
+    log.warning("Different call site")
+
+    lines = flush_lines(captured)
+    assert [line["message"] for line in lines] == ["Noisy 0", "Noisy 1", "Noisy 2", "Different call site"]
+    assert logging_pipeline.rate_limit.suppressed == 7
+
+
+def test_rate_limit_reports_suppressed_count_next_window():
+    now = [0.0]
+    limiter = RateLimitFilter(limit=1, window=60.0, clock=lambda: now[0])
+
+    def record():
+        return logging.LogRecord("app.test", logging.INFO, "x.py", 7, "msg", None, None)
+
+    assert limiter.filter(record())
+    assert not limiter.filter(record())
+    assert not limiter.filter(record())
+    now[0] = 61.0
+    passed = record()
+    assert limiter.filter(passed)
+    assert passed.suppressed == 2
+    assert json.loads(JsonFormatter().format(passed))["suppressed"] == 2
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+    for n in range(5):
+        handler.handle(logging.LogRecord("app.test", logging.INFO, "x.py", n, "line %d", (n,), None))
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+    assert handler.queue.get_nowait().msg == "line 0"
+
+
+def test_request_id_header_generated_or_propagated():
+    generated = client.get("/health").headers["X-Request-Id"]
+    assert len(generated) == 16
+
+    assert client.get("/health", headers={"X-Request-Id": "edge-abc.1"}).headers["X-Request-Id"] == "edge-abc.1"
+    rejected = client.get("/health", headers={"X-Request-Id": "bad id\n"}).headers["X-Request-Id"]
+    assert rejected != "bad id\n" and len(rejected) == 16
@@ -0,0 +1,116 @@
+"""
+Tests for tracemalloc snapshots, diffs and the cache size registry
+"""
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.diagnostics.memory import CacheRegistry, MemoryTracker, NotTracing
+from app.main import app
+
+client = TestClient(app)
+ADMIN = {"X-Admin-Secret": "test-admin-secret"}
+
+
+@pytest.fixture
+def admin(monkeypatch):
+    monkeypatch.setattr(settings, "admin_secret", "test-admin-secret")
+    yield
+    client.post("/debug/memory/stop", headers=ADMIN)
+
+
+def test_diff_points_at_growing_line():
+    tracker = MemoryTracker(max_snapshots=2)
+    with pytest.raises(NotTracing):
+        tracker.snapshot()
+
+    tracker.start()
+    try:
+        first = tracker.snapshot()
+        leak = [bytes(1000) for _ in range(500)]  # growing line
+        second = tracker.snapshot()
+        stats = tracker.diff(first["id"], second["id"], limit=5)
+        assert stats[0]["location"].endswith(f"test_memory.py:{leak_line()}")
+        assert stats[0]["size_diff"] >= 500 * 1000
+        assert stats[0]["count_diff"] >= 500
+
+        tracker.snapshot()
+        with pytest.raises(KeyError):
+            tracker.get(first["id"])
+        assert tracker.latest_id() == 3
+    finally:
+        tracker.stop()
+    assert not tracemalloc.is_tracing()
+    assert tracker.snapshots == {}
+    del leak
+
+
+def leak_line() -> int:
+    with open(__file__) as f:
+        return next(n for n, line in enumerate(f, 1) if line.rstrip().endswith("# growing line"))
+
+
+def test_cache_registry_isolates_failures():
+    registry = CacheRegistry()
+    registry.register("ok", lambda: {"entries": 3})
+    registry.register("broken", lambda: 1 / 0)
+    sizes = registry.sizes()
+    assert sizes["ok"] == {"entries": 3}
+    assert sizes["broken"]["error"].startswith("ZeroDivisionError")
+
+
+def test_memory_status_reports_registered_caches(admin):
+    response = client.get("/debug/memory", headers=ADMIN)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["tracing"] is False
+    expected = {
+        "ai_queue", "answer_cache", "deploy_jobs", "fragment_cache", "jinja_templates", "log_queue", "page_cache",
+        "progress_store", "rate_limiter", "registry_client", "session_index", "sessions", "system_context",
+        "traces", "treasury_ledger"
+    }
+    assert set(data["caches"]) == expected
+    for name, size in data["caches"].items():
+        assert "error" not in size, (name, size)
+    assert set(data["caches"]["sessions"]) == {"rows", "expired"}
+
+
+def test_memory_endpoints_round_trip(admin):
+    assert client.post("/debug/memory/snapshots", headers=ADMIN).status_code == 409
+
+    started = client.post("/debug/memory/start?frames=2", headers=ADMIN).json()
+    assert started["tracing"] is True and started["frames"] == 2
+
+    first = client.post("/debug/memory/snapshots", headers=ADMIN).json()
+    second = client.post("/debug/memory/snapshots", headers=ADMIN).json()
+    top = client.get(f"/debug/memory/snapshots/{second['id']}?limit=3", headers=ADMIN).json()
+    assert len(top) <= 3 and all("location" in row for row in top)
+
+    diff = client.get(f"/debug/memory/diff?from={first['id']}&group_by=filename", headers=ADMIN).json()
+    assert diff["to"] == second["id"]
+    assert isinstance(diff["stats"], list)
+    assert client.get("/debug/memory/diff?from=9999", headers=ADMIN).status_code == 404
+
+    stopped = client.post("/debug/memory/stop", headers=ADMIN).json()
+    assert stopped["tracing"] is False and stopped["snapshots"] == []
+
+
+def test_memory_endpoints_require_admin(admin):
+    assert client.post("/debug/memory/start").status_code == 403
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracing_stops_itself_but_keeps_snapshots():
+    tracker = MemoryTracker()
+    status = tracker.start(seconds=0.2)
+    try:
+        assert status["tracing"] is True and status["stops_at"] is not None
+        snapshot = tracker.snapshot()
+        tracker.timer.join(timeout=2)
+        status = tracker.status()
+        assert status["tracing"] is False and status["stops_at"] is None
+        assert [s["id"] for s in status["snapshots"]] == [snapshot["id"]]
+    finally:
+        tracker.stop()
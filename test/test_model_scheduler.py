@@ -0,0 +1,103 @@
+"""
+Tests for the fair, bounded model-call scheduler
+"""
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routers import command_center
+from app.services.ai_client import AIClient
+from app.services.answer_cache import answer_cache
+from app.services.model_scheduler import ModelScheduler, SchedulerBusy
+from stub_anthropic import create_stub_app
+
+client = TestClient(app)
+
+
+def test_slots_rotate_between_clients():
+    scheduler = ModelScheduler(max_concurrency=1, queue_timeout=1.0)
+    order = []
+
+    async def call(name: str):
+        await scheduler.acquire(name)
+        order.append(name)
+        await asyncio.sleep(0)
+        scheduler.release()
+
+    async def run():
+        await scheduler.acquire("hog")
+        # The heavy client queues many calls before the light one asks
+        tasks = [asyncio.create_task(call("hog")) for _ in range(4)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call("light")))
+        await asyncio.sleep(0)
+        scheduler.release()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert order[:2] == ["hog", "light"]
+    assert scheduler.active == 0
+    assert scheduler.queued == 0
+
+
+def test_queue_budget_and_per_client_cap():
+    scheduler = ModelScheduler(max_concurrency=1, queue_timeout=0.02, max_queued_per_client=1)
+
+    async def run():
+        await scheduler.acquire("a")
+        waiting = asyncio.create_task(scheduler.acquire("b"))
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerBusy):
+            await scheduler.acquire("b")
+        with pytest.raises(SchedulerBusy):
+            await waiting
+
+    asyncio.run(run())
+    stats = scheduler.stats()
+    assert stats["rejected"] == 1
+    assert stats["timed_out"] == 1
+    assert stats["queued"] == 0
+    assert stats["active"] == 1
+    assert stats["peak_queued"] == 1
+
+
+def test_cancelled_waiter_does_not_leak_slot():
+    scheduler = ModelScheduler(max_concurrency=1, queue_timeout=1.0)
+
+    async def run():
+        await scheduler.acquire("a")
+        waiting = asyncio.create_task(scheduler.acquire("b"))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        scheduler.release()
+        await scheduler.acquire("c")
+
+    asyncio.run(run())
+    assert scheduler.active == 1
+    assert scheduler.queued == 0
+
+
+def test_busy_chat_falls_back_to_rules(monkeypatch):
+    answer_cache.clear()
+    stub = create_stub_app()
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=stub), base_url="http://stub")
+    # Every slot taken: requests wait out the queue budget
+    scheduler = ModelScheduler(max_concurrency=0, queue_timeout=0.01)
+    ai = AIClient("test-key", base_url="http://stub", http_client=http_client, scheduler=scheduler)
+    monkeypatch.setattr(command_center, "ai_client", ai)
+
+    response = client.post("/api/command-center/chat", json={"message": "help"})
+    assert "I can help you with" in response.json()["response"]
+
+    body = client.post("/api/command-center/chat/stream", json={"message": "help"}).text
+    assert "event: error" not in body
+    assert "I can help you with" in body
+
+    assert stub.state.requests == []
+    assert len(answer_cache.entries) == 0
+    metrics = client.get("/api/command-center/metrics").json()
+    assert metrics["ai_queue"]["timed_out"] == 2
@@ -0,0 +1,67 @@
+"""
+Tests for pre-rendered marketing pages
+"""
+import gzip
+import os
+import time
+
+import brotli
+from fastapi.testclient import TestClient
+from jinja2 import Environment, FileSystemLoader
+
+from app.main import app, page_cache
+from app.services.page_cache import PageCache
+
+client = TestClient(app)
+
+
+def test_page_served_without_rendering_per_request():
+    client.get("/how-it-works")
+    renders = page_cache.renders
+    for _ in range(5):
+        assert client.get("/how-it-works").status_code == 200
+    assert page_cache.renders == renders
+
+
+def test_gzip_and_brotli_variants():
+    raw = client.get("/", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in raw.headers
+
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.content == raw.content
+    assert gzip.decompress(page_cache.get("home.html").variants["gzip"]) == raw.content
+
+    response = client.get("/", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert response.content == raw.content
+    assert brotli.decompress(page_cache.get("home.html").variants["br"]) == raw.content
+
+
+def test_strong_etag_and_304():
+    response = client.get("/sacred-loop", headers={"Accept-Encoding": "gzip"})
+    etag = response.headers["ETag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+
+    cached = client.get("/sacred-loop", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    # A different encoding is a different representation
+    other = client.get("/sacred-loop", headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    assert other.status_code == 200
+
+
+def test_pages_rebuilt_when_template_changes(tmp_path):
+    template = tmp_path / "page.html"
+    template.write_text("<h1>{{ title }} v1</h1>")
+    cache = PageCache(Environment(loader=FileSystemLoader(str(tmp_path))), tmp_path, check_interval=0)
+    cache.register("page.html", title="Hello")
+
+    assert cache.get("page.html").variants[None] == b"<h1>Hello v1</h1>"
+
+    template.write_text("<h1>{{ title }} v2</h1>")
+    future = time.time() + 5
+    os.utime(template, (future, future))
+    assert cache.get("page.html").variants[None] == b"<h1>Hello v2</h1>"
@@ -0,0 +1,98 @@
+"""
+Tests for the sampling profiler and /debug/profile
+"""
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.diagnostics.profiler import Profile, ProfilerBusy, SamplingProfiler, profiler
+from app.main import app
+
+client = TestClient(app)
+ADMIN = {"X-Admin-Secret": "test-admin-secret"}
+
+
+def spin_until(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=spin_until, args=(stop,), name="busy")
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+def test_samples_busy_thread_and_drops_idle_ones(busy_thread):
+    idle = threading.Event()
+    waiter = threading.Thread(target=idle.wait, name="waiter")
+    waiter.start()
+    try:
+        result = SamplingProfiler().run(0.3, hz=200)
+    finally:
+        idle.set()
+        waiter.join()
+
+    assert result.ticks > 10
+    assert result.threads["busy"] > 0
+    assert "waiter" not in result.threads
+    assert result.idle > 0
+    lines = result.collapsed().splitlines()
+    assert any(line.startswith("busy;") and "test_profiler.py:spin_until" in line for line in lines)
+    total = {row["function"] for row in result.top()["total"]}
+    assert any(name.endswith("test_profiler.py:spin_until") for name in total)
+
+
+def test_top_counts_recursion_once_per_sample():
+    result = Profile(1.0, 100)
+    result.stacks[("main", "a", "b", "a")] = 3
+    result.stacks[("main", "a", "c")] = 1
+    top = result.top()
+    assert top["self"][0] == {"function": "a", "samples": 3, "percent": 75.0}
+    assert {row["function"]: row["samples"] for row in top["total"]} == {"a": 4, "b": 3, "c": 1}
+    assert "main;a;b;a 3" in result.collapsed()
+
+
+def test_one_profile_at_a_time():
+    local = SamplingProfiler()
+    local.lock.acquire()
+    with pytest.raises(ProfilerBusy):
+        local.run(0.1)
+    local.lock.release()
+    assert local.run(0.05).ticks > 0
+
+
+def test_profile_endpoint_requires_admin(monkeypatch):
+    monkeypatch.setattr(settings, "admin_secret", "test-admin-secret")
+    assert client.get("/debug/profile?seconds=0.1").status_code == 403
+
+
+def test_profile_endpoint_formats(monkeypatch, busy_thread):
+    monkeypatch.setattr(settings, "admin_secret", "test-admin-secret")
+
+    text = client.get("/debug/profile?seconds=0.2&hz=200&top=5", headers=ADMIN)
+    assert text.status_code == 200
+    assert "SELF" in text.text and "TOTAL" in text.text
+
+    collapsed = client.get("/debug/profile?seconds=0.2&format=collapsed", headers=ADMIN)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed.text.splitlines())
+
+    data = client.get("/debug/profile?seconds=0.2&format=json&top=3", headers=ADMIN).json()
+    assert data["samples"] > 0 and len(data["top"]["self"]) <= 3
+    assert data["threads"]["busy"] > 0
+
+
+def test_profile_endpoint_busy(monkeypatch):
+    monkeypatch.setattr(settings, "admin_secret", "test-admin-secret")
+    profiler.lock.acquire()
+    try:
+        response = client.get("/debug/profile?seconds=0.1", headers=ADMIN)
+    finally:
+        profiler.lock.release()
+    assert response.status_code == 409
@@ -0,0 +1,172 @@
+"""
+Tests for the member progress API
+Covers incremental patches, delta reads and the write-behind buffer
+"""
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.database import create_user, create_session, get_progress, count_activity
+from app.main import app
+from app.services import progress_store as progress_store_module
+from app.services.progress_store import ProgressStore, progress_store, encode_blob, decode_blob, COMPRESSED_PREFIX
+
+_counter = 0
+
+
+@pytest.fixture
+def member():
+    """A TestClient logged in as a fresh member"""
+    global _counter
+    _counter += 1
+    user_id = create_user(f"progress-{_counter}@example.com", "password123", "Progress Member")
+    client = TestClient(app)
+    client.cookies.set("session_token", create_session(user_id))
+    return client, user_id
+
+
+def test_progress_requires_login():
+    client = TestClient(app)
+    assert client.get("/api/progress").status_code == 401
+    assert client.patch("/api/progress", json=[]).status_code == 401
+
+
+def test_patch_and_read(member):
+    client, _ = member
+    response = client.patch("/api/progress", json=[
+        {"op": "add", "path": "/goals/current", "value": {"goal": "Run a marathon"}},
+        {"op": "add", "path": "/reflection/2025-01-01", "value": {"q1": "Shipped"}}
+    ])
+    assert response.status_code == 200
+    assert response.json() == {"revision": 1, "changed": ["goals", "reflection"]}
+
+    data = client.get("/api/progress").json()
+    assert data["full"] is True
+    assert data["sections"]["goals"] == {"current": {"goal": "Run a marathon"}}
+    assert data["sections"]["strengths"] is None
+
+
+def test_saving_progress_not_viewing_tools_counts_as_activity(member):
+    client, user_id = member
+    for page in ("/tools/goals", "/tools/reflection", "/tools/strengths"):
+        assert client.get(page).status_code == 200
+    assert count_activity(user_id, "tool_use") == 0
+
+    client.patch("/api/progress", json=[{"op": "add", "path": "/goals/current", "value": "a"}])
+    client.patch("/api/progress", json=[{"op": "add", "path": "/reflection/today", "value": "b"}])
+    assert count_activity(user_id, "tool_use") == 1
+    assert count_activity(user_id, "reflection") == 1
+
+
+def test_read_returns_only_changed_sections(member):
+    client, _ = member
+    client.patch("/api/progress", json=[{"op": "add", "path": "/goals/current", "value": "a"}])
+    revision = client.patch("/api/progress", json=[
+        {"op": "add", "path": "/strengths/top", "value": ["focus"]}
+    ]).json()["revision"]
+
+    delta = client.get(f"/api/progress?since={revision - 1}").json()
+    assert delta["full"] is False
+    assert list(delta["sections"]) == ["strengths"]
+
+    assert client.get(f"/api/progress?since={revision}").json()["sections"] == {}
+
+
+def test_failed_patch_is_atomic(member):
+    client, _ = member
+    client.patch("/api/progress", json=[{"op": "add", "path": "/goals/items", "value": [1, 2]}])
+
+    response = client.patch("/api/progress", json=[
+        {"op": "add", "path": "/goals/items/-", "value": 3},
+        {"op": "test", "path": "/goals/items/0", "value": 99}
+    ])
+    assert response.status_code == 422
+    assert client.get("/api/progress").json()["sections"]["goals"] == {"items": [1, 2]}
+
+
+def test_patch_validation(member):
+    client, _ = member
+    assert client.patch("/api/progress", json=[{"op": "add", "path": "/unknown/x", "value": 1}]).status_code == 422
+    assert client.patch("/api/progress", json=[{"op": "add", "path": "/goals/x"}]).status_code == 400
+    assert client.patch("/api/progress", json=[{"op": "move", "path": "/goals/x"}]).status_code == 422
+
+
+def test_autosaves_are_coalesced_into_one_write(member):
+    client, user_id = member
+    progress_store.flush()
+    for i in range(20):
+        client.patch("/api/progress", json=[{"op": "replace", "path": "/goals", "value": {"draft": i}}])
+
+    assert get_progress(user_id)["goal_data"] is None
+
+    writes_before = progress_store.writes
+    progress_store.flush()
+    assert progress_store.writes - writes_before == 1
+
+    row = get_progress(user_id)
+    assert row["revision"] == 20
+    assert decode_blob(row["goal_data"]) == {"draft": 19}
+
+
+def test_flush_does_not_overwrite_another_workers_write(member):
+    """During a reload two workers can hold the same user; the later flush must not clobber the first"""
+    _, user_id = member
+    progress_store.flush()
+    old_worker, new_worker = ProgressStore(), ProgressStore()
+    old_worker.apply(user_id, [{"op": "replace", "path": "/goals", "value": {"from": "old"}}])
+    new_worker.apply(user_id, [{"op": "replace", "path": "/reflection", "value": {"from": "new"}}])
+
+    assert old_worker.flush() == 1
+    assert new_worker.flush() == 0
+    assert user_id not in new_worker.entries
+
+    row = get_progress(user_id)
+    assert decode_blob(row["goal_data"]) == {"from": "old"}
+    assert row["reflection_data"] is None
+    assert new_worker.read(user_id)["sections"]["goals"] == {"from": "old"}
+
+    new_worker.apply(user_id, [{"op": "replace", "path": "/reflection", "value": {"from": "new"}}])
+    assert new_worker.flush() == 1
+    assert decode_blob(get_progress(user_id)["reflection_data"]) == {"from": "new"}
+
+
+def test_concurrent_flushes_are_serialized(member, monkeypatch):
+    """The flush loop, an export and shutdown may flush at once; writes must not interleave"""
+    _, user_id = member
+    store = ProgressStore()
+    active, overlapped = [], []
+    save = progress_store_module.save_progress_columns
+
+    def slow_save(updates):
+        overlapped.append(bool(active))
+        active.append(1)
+        time.sleep(0.05)
+        try:
+            return save(updates)
+        finally:
+            active.pop()
+
+    monkeypatch.setattr(progress_store_module, "save_progress_columns", slow_save)
+    store.apply(user_id, [{"op": "replace", "path": "/goals", "value": {"n": 1}}])
+    first = threading.Thread(target=store.flush)
+    first.start()
+    time.sleep(0.01)
+    store.apply(user_id, [{"op": "replace", "path": "/goals", "value": {"n": 2}}])
+    store.flush()
+    first.join()
+
+    assert overlapped == [False, False]
+    assert decode_blob(get_progress(user_id)["goal_data"]) == {"n": 2}
+
+
+def test_large_blobs_are_compressed():
+    value = {"entries": ["reflection text " * 20] * 50}
+    blob = encode_blob(value)
+    assert blob.startswith(COMPRESSED_PREFIX)
+    assert len(blob) < settings.progress_compress_threshold
+    assert decode_blob(blob) == value
+
+    assert encode_blob({"small": True}) == '{"small":true}'
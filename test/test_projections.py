@@ -0,0 +1,67 @@
+"""
+Tests for vectorized treasury projections
+"""
+import math
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.projections import SCENARIOS, project_scenarios, sensitivity_grid
+
+client = TestClient(app)
+
+INPUTS = {"potential_monthly": 1000, "monthly_burn": 50, "sessions_per_month": 100, "per_session": 0.5, "start_balance": 200}
+
+
+def test_curves_match_month_by_month_model():
+    result = project_scenarios(["conservative", "aggressive"], 12, **INPUTS)
+
+    for name in ("conservative", "aggressive"):
+        s = SCENARIOS[name]
+        balance = INPUTS["start_balance"]
+        for month in range(1, 13):
+            revenue = 1000 * s["capture"] * (1 - math.exp(-month / s["ramp_months"]))
+            burn = 50 + 100 * 0.5 * (1 + s["session_growth"]) ** (month - 1)
+            balance += revenue - burn
+            assert result[name]["revenue"][month - 1] == round(revenue, 2)
+            assert result[name]["burn"][month - 1] == round(burn, 2)
+            assert result[name]["balance"][month - 1] == round(balance, 2)
+
+
+def test_runway_and_breakeven():
+    # No revenue: 200 covers two months of a flat 100/month burn, never breaks even
+    flat = project_scenarios(["expected"], 6, **{**INPUTS, "potential_monthly": 0, "monthly_burn": 100, "sessions_per_month": 0})["expected"]
+    assert flat["balance"][:3] == [100, 0, -100]
+    assert flat["runway_months"] == 2
+    assert flat["breakeven_month"] is None
+    assert flat["runway"][:2] == [1.0, 0.0]
+
+    # Aggressive revenue outgrows the burn within the first month
+    aggressive = project_scenarios(["aggressive"], 6, **INPUTS)["aggressive"]
+    assert aggressive["breakeven_month"] == 1
+    assert aggressive["runway_months"] is None
+
+
+def test_sensitivity_grid():
+    grid = sensitivity_grid([0.1, 1.0], [0, 5], revenue_per_client=20, monthly_burn=10,
+                            sessions_per_month=100, start_balance=300, horizon=12)
+    # net = clients * 20 - (10 + 100 * cost)
+    assert grid["monthly_net"] == [[-20, 80], [-110, -10]]
+    assert grid["horizon_balance"] == [[60, 1260], [-1020, 180]]
+    assert grid["runway_months"] == [[15, None], [2.73, 30]]
+
+
+def test_projections_endpoint():
+    response = client.get("/api/treasury/projections?horizon=6&scenarios=expected&per_session=0.01&per_session=0.05")
+    assert response.status_code == 200
+    data = response.json()
+    assert list(data["scenarios"]) == ["expected"]
+    assert len(data["scenarios"]["expected"]["balance"]) == 6
+    assert data["sensitivity"]["per_session"] == [0.01, 0.05]
+    assert len(data["sensitivity"]["monthly_net"][0]) == len(data["sensitivity"]["clients"])
+
+
+def test_projections_rejects_bad_input():
+    assert client.get("/api/treasury/projections?scenarios=moonshot").status_code == 400
+    assert client.get("/api/treasury/projections?horizon=0").status_code == 422
+    assert client.get("/api/treasury/projections?per_session=-1").status_code == 400
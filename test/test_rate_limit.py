@@ -0,0 +1,110 @@
+"""
+Tests for rate limiting and load shedding
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.middleware.rate_limit import TokenBucketLimiter, classify, rate_limiter, load_monitor
+
+client = TestClient(app)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def limits_on(monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    rate_limiter.reset()
+    yield
+    rate_limiter.reset()
+
+
+def test_token_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(shards=4, clock=clock)
+    key = ("1.2.3.4", "auth")
+
+    results = [limiter.acquire(key, 6)[0] for _ in range(7)]
+    assert results == [True] * 6 + [False]
+
+    allowed, remaining, retry_after, _ = limiter.acquire(key, 6)
+    assert not allowed
+    assert retry_after == pytest.approx(10.0)
+
+    clock.now += 10.0
+    assert limiter.acquire(key, 6)[0]
+
+
+def test_buckets_are_independent_per_key():
+    limiter = TokenBucketLimiter(clock=FakeClock())
+    for _ in range(2):
+        limiter.acquire(("1.1.1.1", "chat"), 2)
+    assert not limiter.acquire(("1.1.1.1", "chat"), 2)[0]
+    assert limiter.acquire(("2.2.2.2", "chat"), 2)[0]
+    assert limiter.acquire(("1.1.1.1", "default"), 2)[0]
+
+
+def test_route_classification():
+    assert classify("POST", "/login") == "auth"
+    assert classify("GET", "/login") == "default"
+    assert classify("POST", "/api/command-center/chat") == "chat"
+    assert classify("POST", "/deploy") == "deploy"
+    assert classify("GET", "/deploy-status") == "default"
+    assert classify("GET", "/deploy/jobs/abc/log") == "default"
+    assert classify("GET", "/admin/export/users") == "admin"
+    assert classify("GET", "/") == "default"
+
+
+def test_rate_limit_headers_and_429(limits_on, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_auth_per_minute", 2)
+
+    for _ in range(2):
+        response = client.post("/login", data={"email": "nobody@example.com", "password": "x"})
+        assert response.status_code == 200
+        assert response.headers["X-RateLimit-Limit"] == "2"
+
+    response = client.post("/login", data={"email": "nobody@example.com", "password": "x"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+    assert response.headers["X-RateLimit-Remaining"] == "0"
+
+    # Other route classes keep their own budget
+    assert client.get("/login").status_code == 200
+
+
+def test_zero_limit_disables_the_route_class(limits_on, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_per_minute", 0)
+    for _ in range(3):
+        response = client.get("/login")
+        assert response.status_code == 200
+        assert "X-RateLimit-Limit" not in response.headers
+
+    with pytest.raises(ValueError):
+        TokenBucketLimiter().acquire(("1.2.3.4", "default"), 0)
+
+
+def test_exempt_paths_have_no_limit(limits_on, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_per_minute", 1)
+    for _ in range(3):
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert "X-RateLimit-Limit" not in response.headers
+
+
+def test_load_shedding_rejects_expensive_routes_only(monkeypatch):
+    monkeypatch.setattr(load_monitor, "lag_ms", settings.shed_max_loop_lag_ms + 100)
+
+    response = client.post("/deploy")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(settings.shed_retry_after)
+
+    assert client.get("/health").status_code == 200
+    assert client.get("/api/command-center/stats").status_code == 200
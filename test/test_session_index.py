@@ -0,0 +1,95 @@
+"""
+Tests for the coordination session index
+"""
+import asyncio
+import json
+import os
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import session_index as session_index_module
+from app.services.session_index import SessionIndex, session_index
+
+
+def write_session(directory, name, **data):
+    path = directory / f"{name}.json"
+    path.write_text(json.dumps(data))
+    return path
+
+
+def test_sweep_reparses_only_changed_files(tmp_path):
+    write_session(tmp_path, "a", session_id="a", current_work="ledger")
+    b = write_session(tmp_path, "b", session_id="b", status="idle")
+    index = SessionIndex(tmp_path)
+
+    assert index.sweep() == 2
+    assert [s["id"] for s in index.sessions()] == ["a", "b"]
+    assert index.parses == 2
+
+    # Nothing changed: no parses
+    assert index.sweep() == 0
+    assert index.parses == 2
+
+    b.write_text(json.dumps({"session_id": "b", "status": "done", "current_work": "tests"}))
+    os.utime(b, ns=(0, 1))
+    assert index.sweep() == 1
+    assert index.parses == 3
+    assert index.sessions()[1] == {"id": "b", "work": "tests", "status": "done"}
+
+    b.unlink()
+    assert index.sweep() == 1
+    assert [s["id"] for s in index.sessions()] == ["a"]
+
+
+def test_unreadable_files_are_skipped_until_changed(tmp_path):
+    (tmp_path / "broken.json").write_text("{not json")
+    (tmp_path / "notes.txt").write_text("ignored")
+    index = SessionIndex(tmp_path)
+
+    assert index.sweep() == 1
+    assert index.sessions() == []
+    index.sweep()
+    assert index.parses == 1
+
+
+def test_missing_directory_is_empty(tmp_path):
+    assert SessionIndex(tmp_path / "missing").sessions() == []
+
+
+def test_watcher_applies_only_changed_paths(tmp_path, monkeypatch):
+    a = write_session(tmp_path, "a", session_id="a")
+    index = SessionIndex(tmp_path)
+
+    async def fake_awatch(path, recursive):
+        b = write_session(tmp_path, "b", session_id="b")
+        yield {(1, str(b))}
+        assert index.watching
+        # Reads while watching never sweep the directory
+        write_session(tmp_path, "c", session_id="c")
+        assert [s["id"] for s in index.sessions()] == ["a", "b"]
+        a.unlink()
+        yield {(3, str(a))}
+        raise RuntimeError("watcher gone")
+
+    monkeypatch.setattr(session_index_module, "awatch", fake_awatch)
+
+    async def run_until_fallback():
+        task = asyncio.create_task(index.run())
+        while index.parses < 2 or index.watching or index.entries.get(str(a)):
+            await asyncio.sleep(0.01)
+        task.cancel()
+
+    asyncio.run(run_until_fallback())
+    assert [s["id"] for s in index.sessions()] == ["b"]
+
+
+def test_treasury_reports_indexed_sessions():
+    sessions_dir = session_index.sessions_dir
+    sessions_dir.mkdir(parents=True, exist_ok=True)
+    write_session(sessions_dir, "treasury-test", session_id="treasury-test", current_work="ledger")
+    session_index.sweep()
+
+    metrics = TestClient(app).get("/api/treasury").json()["metrics"]
+    assert metrics["active_sessions"] == 1
+    assert metrics["session_breakdown"] == [{"id": "treasury-test", "work": "ledger", "status": "active"}]
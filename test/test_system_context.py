@@ -0,0 +1,76 @@
+"""
+Tests for the cached command center system context
+"""
+from fastapi.testclient import TestClient
+
+from app.database import create_user
+from app.main import app
+from app.routers.command_center import get_rule_based_response, extract_response_data
+from app.services.system_context import SystemContextCache, system_context
+
+client = TestClient(app)
+
+
+def test_context_is_cached_until_ttl_or_invalidation():
+    cache = SystemContextCache(ttl=60)
+    first = cache.get()
+    assert cache.get() is first
+    assert cache.builds == 1
+
+    create_user("context-cache@example.com", "password123", "Context Cache", "builder")
+    assert cache.get().member_count == first.member_count
+
+    cache.invalidate()
+    rebuilt = cache.get()
+    assert cache.builds == 2
+    assert rebuilt.member_count == first.member_count + 1
+    assert rebuilt.tier_counts["builder"] == first.tier_counts.get("builder", 0) + 1
+
+    cache.expires = 0
+    cache.get()
+    assert cache.builds == 3
+
+
+def test_prompt_text_rendered_once_per_snapshot():
+    context = SystemContextCache(ttl=60).get()
+    text = context.prompt_text()
+    assert f"Total Members: {context.member_count}" in text
+    assert "Last Deploy: Recently" in text
+    assert context.prompt_text() is text
+
+
+def test_deploy_is_recorded_in_context():
+    cache = SystemContextCache(ttl=60)
+    cache.get()
+    cache.record_deploy()
+    assert "UTC" in cache.get().last_deploy
+    assert cache.get().last_deploy in cache.get().prompt_text()
+
+
+def test_deploy_time_reaches_workers_started_later(tmp_path):
+    deploying = SystemContextCache(ttl=60, deploy_file=tmp_path / "last-deploy")
+    deploying.record_deploy()
+    # A fresh worker process has its own (empty) cache but reads the shared file
+    replacement = SystemContextCache(ttl=60, deploy_file=tmp_path / "last-deploy")
+    assert replacement.get().last_deploy == deploying.last_deploy
+
+
+def test_rule_based_answers_read_fields():
+    context = SystemContextCache(ttl=60).get()
+    answer = get_rule_based_response("how many members?", context)
+    assert f"{context.member_count} total members" in answer
+    assert extract_response_data("members", context) == {
+        "members": context.member_count,
+        "signupsToday": context.signups_today
+    }
+
+
+def test_signup_invalidates_shared_context():
+    system_context.invalidate()
+    before = system_context.get().member_count
+    client.post("/signup", data={
+        "email": "context-signup@example.com",
+        "password": "password123",
+        "full_name": "Context Signup"
+    }, follow_redirects=False)
+    assert system_context.get().member_count == before + 1
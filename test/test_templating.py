@@ -0,0 +1,24 @@
+"""
+Tests for the shared template environment
+"""
+from app.routers import auth, money, tools
+from app.templating import templates, precompile_templates, templates_path
+
+
+def test_routers_share_one_environment():
+    assert auth.templates is templates
+    assert tools.templates is templates
+    assert money.templates is templates
+
+
+def test_precompile_loads_every_template():
+    count = precompile_templates()
+    assert count == len(list(templates_path.glob("*.html")))
+
+    # Compiled templates are served from the environment cache afterwards
+    first = templates.env.get_template("home.html")
+    assert templates.env.get_template("home.html") is first
+
+
+def test_bytecode_cache_enabled():
+    assert templates.env.bytecode_cache is not None
@@ -0,0 +1,102 @@
+"""
+Tests for request tracing and the /debug/traces viewer
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.database import get_db
+from app.diagnostics.tracing import Tracer, tracer
+from app.main import app
+
+client = TestClient(app)
+ADMIN = {"X-Admin-Secret": "test-admin-secret"}
+
+
+@pytest.fixture
+def keep_all(monkeypatch):
+    monkeypatch.setattr(tracer, "slow_ms", 0.0)
+    monkeypatch.setattr(settings, "admin_secret", "test-admin-secret")
+    tracer.clear()
+
+
+def test_spans_nest_and_are_noops_outside_traces():
+    local = Tracer(slow_ms=0.0)
+    with local.span("orphan") as span:
+        assert span is None
+
+    with local.trace("root") as root:
+        with local.span("child", "db") as child:
+            with local.span("grandchild"):
+                pass
+        with pytest.raises(ValueError):
+            with local.span("failing"):
+                raise ValueError("boom")
+
+    trace = local.recent()[0]
+    names = [span.name for span in trace.spans]
+    assert names == ["root", "child", "grandchild", "failing"]
+    assert trace.spans[1].parent_id == root.span_id
+    assert trace.spans[2].parent_id == child.span_id
+    assert trace.spans[3].error == "ValueError: boom"
+
+
+def test_fast_unsampled_traces_are_not_kept():
+    local = Tracer(sample_rate=0.0, slow_ms=1000.0)
+    with local.trace("quick"):
+        pass
+    assert local.recent() == []
+    assert local.stats()["traces_started"] == 1
+
+
+def test_request_records_upstream_sql_and_template_spans(keep_all):
+    response = client.get("/api/system/status")
+    trace = tracer.get(response.headers["X-Trace-Id"])
+    assert trace.root.name == "GET /api/system/status"
+    assert trace.root.attributes["status"] == 200
+    upstream = [span for span in trace.spans if span.kind == "client"]
+    # Registry and Orchestrator health checks plus the droplet list
+    assert len(upstream) == 3
+    assert all(span.error for span in upstream)  # nothing listens on the test port
+
+    response = client.post("/login", data={"email": "nobody@example.com", "password": "wrong-password"})
+    kinds = {span.kind for span in tracer.get(response.headers["X-Trace-Id"]).spans}
+    assert {"server", "db", "template"} <= kinds
+
+
+def test_connection_shortcuts_are_traced(keep_all):
+    conn = get_db()
+    try:
+        with tracer.trace("sql shortcuts"):
+            conn.execute("CREATE TEMP TABLE numbers (n INTEGER)")
+            conn.executemany("INSERT INTO numbers VALUES (?)", [(1,), (2,)])
+            conn.cursor().execute("SELECT COUNT(*) FROM numbers")
+    finally:
+        conn.close()
+
+    spans = [span for span in tracer.recent()[0].spans if span.kind == "db"]
+    assert [span.attributes["statement"] for span in spans] == [
+        "CREATE TEMP TABLE numbers (n INTEGER)", "INSERT INTO numbers VALUES (?)", "SELECT COUNT(*) FROM numbers"
+    ]
+    assert spans[1].attributes["many"] is True
+
+
+def test_debug_traces_formats(keep_all):
+    client.get("/api/droplets")
+
+    data = client.get("/debug/traces?format=json", headers=ADMIN).json()
+    assert data["traces"][0]["name"] == "GET /api/droplets"
+
+    assert "Recent traces" in client.get("/debug/traces", headers=ADMIN).text
+
+    otlp = client.get("/debug/traces?format=otlp", headers=ADMIN).json()
+    spans = otlp["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert spans[0]["name"] == "GET /api/droplets"
+    assert int(spans[0]["endTimeUnixNano"]) >= int(spans[0]["startTimeUnixNano"])
+
+    assert client.get("/debug/traces/unknown", headers=ADMIN).status_code == 404
+
+
+def test_debug_requires_admin(monkeypatch):
+    monkeypatch.setattr(settings, "admin_secret", "test-admin-secret")
+    assert client.get("/debug/traces").status_code == 403
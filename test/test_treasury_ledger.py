@@ -0,0 +1,146 @@
+"""
+Tests for the append-only treasury ledger
+"""
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.routers.money import tracker
+from app.services.treasury_ledger import TREASURY_FILE, TreasuryLedger, make_entry
+
+client = TestClient(app)
+
+
+def line(kind, category, amount, ts="2025-03-05T10:00:00"):
+    return json.dumps({"ts": ts, "kind": kind, "category": category, "amount": amount}) + "\n"
+
+
+def test_append_updates_aggregates(tmp_path):
+    ledger = TreasuryLedger(tmp_path / "ledger.jsonl")
+    ledger.append("cost", "server", 5)
+    ledger.append("cost", "server", 5)
+    ledger.append("revenue", "i_match", 120.5, note="first sale")
+
+    assert ledger.total("cost") == 10
+    assert ledger.total("revenue") == 120.5
+    assert ledger.categories["cost"] == {"server": 10}
+    month = next(iter(ledger.months))
+    assert ledger.months[month] == {"cost": 10, "revenue": 120.5}
+    assert ledger.category_total("cost", "server", month) == 10
+    assert ledger.category_total("cost", "server", "1999-01") == 0
+
+    # Entries are durable: a fresh reader rebuilds the same totals
+    reread = TreasuryLedger(tmp_path / "ledger.jsonl")
+    reread.refresh()
+    assert reread.totals == ledger.totals
+
+
+def test_external_appends_are_read_incrementally(tmp_path):
+    path = tmp_path / "ledger.jsonl"
+    path.write_text(line("cost", "server", 5))
+    ledger = TreasuryLedger(path)
+    ledger.refresh()
+    assert ledger.entries == 1
+
+    with open(path, "a") as f:
+        f.write(line("cost", "domains", 12, ts="2025-04-01T00:00:00"))
+        # An append still being written is left for the next refresh
+        f.write('{"ts": "2025-04-02", "kind": "co')
+    ledger.refresh()
+    assert ledger.entries == 2
+    assert ledger.total("cost") == 17
+    assert ledger.months["2025-04"]["cost"] == 12
+
+    with open(path, "a") as f:
+        f.write('st", "category": "server", "amount": 5}\n')
+    ledger.refresh()
+    assert ledger.entries == 3
+    assert ledger.total("cost") == 22
+
+
+def test_rewritten_ledger_is_reloaded(tmp_path):
+    path = tmp_path / "ledger.jsonl"
+    path.write_text(line("cost", "server", 5) + line("cost", "server", 5))
+    ledger = TreasuryLedger(path)
+    ledger.refresh()
+    assert ledger.total("cost") == 10
+
+    replacement = tmp_path / "replacement.jsonl"
+    replacement.write_text(line("revenue", "white_rock", 300) + "not json\n")
+    os.replace(replacement, path)
+    ledger.refresh()
+    assert ledger.totals == {"cost": 0, "revenue": 300}
+    assert ledger.skipped == 1
+
+
+def test_in_place_rewrite_that_grows_is_reloaded(tmp_path):
+    path = tmp_path / "ledger.jsonl"
+    path.write_text(line("cost", "server", 5) + line("cost", "server", 5))
+    inode = os.stat(path).st_ino
+    ledger = TreasuryLedger(path)
+    ledger.refresh()
+
+    # Same file, corrected and extended: not an append, though it only got bigger
+    path.write_text(line("cost", "server", 7) + line("cost", "domains", 12) + line("cost", "server", 5))
+    assert os.stat(path).st_ino == inode
+    ledger.refresh()
+    assert ledger.entries == 3
+    assert ledger.total("cost") == 24
+    assert ledger.categories["cost"] == {"server": 12, "domains": 12}
+
+    with open(path, "a") as f:
+        f.write(line("revenue", "i_match", 40))
+    ledger.refresh()
+    assert ledger.entries == 4 and ledger.total("revenue") == 40
+
+
+def test_initialize_only_creates_missing_ledger(tmp_path):
+    ledger = TreasuryLedger(tmp_path / "ledger.jsonl")
+    ledger.initialize([make_entry("cost", "server", 60, ts="2025-01-01T00:00:00")])
+    ledger.initialize([make_entry("cost", "server", 999)])
+    assert ledger.total("cost") == 60
+
+
+def test_invalid_entries_rejected(tmp_path):
+    ledger = TreasuryLedger(tmp_path / "ledger.jsonl")
+    with pytest.raises(ValueError):
+        ledger.append("gift", "misc", 1)
+    with pytest.raises(ValueError):
+        ledger.append("cost", "misc", float("nan"))
+    assert not (tmp_path / "ledger.jsonl").exists()
+
+
+def test_treasury_api_reports_ledger_totals(monkeypatch):
+    before = client.get("/api/treasury").json()
+    # The ledger opens with the profile's totals (server + domains)
+    assert before["costs"]["server"]["total"] >= 60
+    assert before["costs"]["server"]["monthly"] == 5
+
+    assert client.post("/api/treasury/ledger", json={"kind": "revenue", "category": "i_match", "amount": 50}).status_code == 403
+
+    monkeypatch.setattr(settings, "admin_secret", "test-admin-secret")
+    response = client.post(
+        "/api/treasury/ledger",
+        json={"kind": "revenue", "category": "i_match", "amount": 50, "note": "test sale"},
+        headers={"X-Admin-Secret": "test-admin-secret"}
+    )
+    assert response.status_code == 200
+    assert response.json()["entry"]["category"] == "i_match"
+
+    after = client.get("/api/treasury").json()
+    assert after["metrics"]["total_revenue"] == before["metrics"]["total_revenue"] + 50
+    assert after["revenue"]["i_match"]["total"] == before["revenue"]["i_match"]["total"] + 50
+    assert after["revenue"]["i_match"]["this_month"] >= 50
+
+
+def test_profile_edits_are_hot_reloaded():
+    data = json.loads(TREASURY_FILE.read_text())
+    data["projections"]["monthly_burn"] = 7
+    TREASURY_FILE.write_text(json.dumps(data))
+    os.utime(TREASURY_FILE, ns=(0, tracker.data_mtime + 1))
+
+    assert client.get("/api/treasury").json()["metrics"]["monthly_burn"] == 7